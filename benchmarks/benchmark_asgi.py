@@ -0,0 +1,150 @@
+# benchmarks/benchmark_asgi.py
+#
+# Teste de carga de /praias/<id>/data comparando a API síncrona (WSGI, Flask) com o modo
+# assíncrono (ASGI, asgi.py), ambos em um único processo e consultando uma Open-Meteo falsa
+# local (tests/servidor_stub.py) com latência fixa. Cada requisição usa uma data diferente,
+# então todas precisam ir à Open-Meteo (nada sai do cache).
+#   - WSGI: servidor do Werkzeug com um pool fixo de --threads threads, como um worker do
+#     gunicorn com --threads N: no máximo N requisições aguardam a Open-Meteo ao mesmo tempo;
+#   - ASGI: uvicorn com o asgi.py: as requisições aguardam a Open-Meteo no loop de eventos.
+#
+# Uso (na raiz do projeto):
+#   python benchmarks/benchmark_asgi.py [--requisicoes 400] [--concorrencia 8,64,256] [--threads 8] [--latencia 0.2]
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import httpx
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [RAIZ, os.path.join(RAIZ, "src")]
+from tests import servidor_stub
+from snapshot_boletim import carregar_csv
+
+CSV_AMOSTRA = os.path.join(RAIZ, "tests", "fixtures", "boletim_fortaleza.csv")
+
+#servidor WSGI com um número fixo de threads (processo filho, executado em src/)
+FILHO_WSGI = """
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+import app
+
+class Handler(WSGIRequestHandler):
+    def log_request(self, *args):
+        pass
+
+class Servidor(BaseWSGIServer):
+    request_queue_size = 2048
+    pool = ThreadPoolExecutor(int(sys.argv[2]))
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._atender, request, client_address)
+
+    def _atender(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+Servidor("127.0.0.1", int(sys.argv[1]), app.app, handler=Handler).serve_forever()
+"""
+
+FILHO_ASGI = """
+import sys
+import uvicorn
+uvicorn.run("asgi:app", host="127.0.0.1", port=int(sys.argv[1]), log_level="warning", backlog=2048)
+"""
+
+def porta_livre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def subir(codigo, porta, threads, stub):
+    pasta = tempfile.mkdtemp()
+    env = dict(
+        os.environ, BOLETIM_CSV=CSV_AMOSTRA, HISTORICO_DB=os.path.join(pasta, "historico.sqlite3"), PREVISAO_CACHE_DB=os.path.join(pasta, "previsoes_cache.sqlite3"),
+        ATUALIZACAO_BOLETIM_S="0", PREVISAO_PREFETCH_S="0",
+        OPEN_METEO_WEATHER_URL=stub.url + "/v1/forecast", OPEN_METEO_MARINE_URL=stub.url + "/v1/marine",
+    )
+    processo = subprocess.Popen([sys.executable, "-c", codigo, str(porta), str(threads)], cwd=os.path.join(RAIZ, "src"), env=env)
+    #espera o servidor responder
+    for _ in range(200):
+        try:
+            if httpx.get(f"http://127.0.0.1:{porta}/praias?compacto=1").status_code == 200:
+                return processo
+        except httpx.HTTPError:
+            time.sleep(0.05)
+    processo.kill()
+    raise RuntimeError("servidor não subiu")
+
+async def carga(url, caminhos, concorrencia):
+    limite = asyncio.Semaphore(concorrencia)
+    latencias = []
+    erros = 0
+
+    async def uma(cliente, caminho):
+        nonlocal erros
+        async with limite:
+            inicio = time.perf_counter()
+            try:
+                resposta = await cliente.get(caminho)
+                ok = resposta.status_code == 200 and "temperatura_c" in resposta.json()["previsao"]
+            except httpx.HTTPError:
+                ok = False
+            latencias.append(time.perf_counter() - inicio)
+            erros += not ok
+
+    limites = httpx.Limits(max_connections=concorrencia, max_keepalive_connections=concorrencia)
+    async with httpx.AsyncClient(base_url=url, limits=limites, timeout=60) as cliente:
+        inicio = time.perf_counter()
+        await asyncio.gather(*(uma(cliente, caminho) for caminho in caminhos))
+        duracao = time.perf_counter() - inicio
+    latencias.sort()
+    quantil = lambda q: latencias[min(len(latencias) - 1, int(q * len(latencias)))]
+    return {"rps": len(caminhos) / duracao, "p50": statistics.median(latencias), "p95": quantil(0.95), "p99": quantil(0.99), "erros": erros}
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga: WSGI x ASGI em /praias/<id>/data")
+    parser.add_argument("--requisicoes", type=int, default=400)
+    parser.add_argument("--concorrencia", default="8,64,256")
+    parser.add_argument("--threads", type=int, default=8, help="threads do servidor WSGI")
+    parser.add_argument("--latencia", type=float, default=0.2, help="latência da Open-Meteo falsa (s)")
+    args = parser.parse_args()
+
+    servidor_stub._ServidorHTTP.request_queue_size = 2048
+    ids = [praia["id"] for praia in carregar_csv(CSV_AMOSTRA)]
+    rodada = 0
+
+    print(f"Open-Meteo falsa com {args.latencia:g}s de latência; {args.requisicoes} requisições por rodada; WSGI com {args.threads} threads")
+    print(f"{'modo':<6}{'concorrência':>14}{'req/s':>9}{'p50 (s)':>10}{'p95 (s)':>10}{'p99 (s)':>10}{'erros':>7}")
+    with servidor_stub.ServidorStub(latencia=args.latencia) as stub:
+        for modo, codigo in (("WSGI", FILHO_WSGI), ("ASGI", FILHO_ASGI)):
+            porta = porta_livre()
+            processo = subir(codigo, porta, args.threads, stub)
+            try:
+                for concorrencia in (int(c) for c in args.concorrencia.split(",")):
+                    #datas nunca repetidas entre as rodadas: toda requisição vai à Open-Meteo
+                    inicio = date(2030, 1, 1) + timedelta(days=rodada * args.requisicoes)
+                    rodada += 1
+                    caminhos = [f"/praias/{random.choice(ids)}/data?data={inicio + timedelta(days=i)}&compacto=1" for i in range(args.requisicoes)]
+                    r = asyncio.run(carga(f"http://127.0.0.1:{porta}", caminhos, concorrencia))
+                    print(f"{modo:<6}{concorrencia:>14}{r['rps']:>9.1f}{r['p50']:>10.3f}{r['p95']:>10.3f}{r['p99']:>10.3f}{r['erros']:>7}")
+            finally:
+                processo.terminate()
+                processo.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/benchmark_extracao.py
+#
+# Compara o tempo de extração das tabelas do boletim:
+#   - caminho serial original: Camelot no PDF inteiro + normalização linha a linha (iterrows);
+#   - caminho paralelo: uma página por processo + normalização vetorizada;
+#   - motor pdfplumber: metadados e tabelas em uma única passada, sem Camelot.
+# Mede também só a normalização, sobre as tabelas já extraídas.
+#
+# Uso (na raiz do projeto):
+#   python benchmarks/benchmark_extracao.py [caminho.pdf] [--processos N] [--repeticoes R]
+# Sem caminho, usa o PDF de amostra salvo em tests/fixtures/boletim_amostra.pdf. Para números
+# representativos, use um boletim real (ex.: o boletim_fortaleza.pdf baixado pelo scraper).
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+
+import camelot
+import pandas as pd
+
+from extracao_pdfplumber import extrair_boletim
+from extracao_tabelas import contar_paginas, extrair_tabelas, normalizar_tabelas, normalizar_tabelas_linha_a_linha, processos_padrao
+
+PDF_AMOSTRA = os.path.join(RAIZ, "tests", "fixtures", "boletim_amostra.pdf")
+
+def cronometrar(funcao, repeticoes):
+    tempos = []
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos), resultado
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da extração de tabelas do boletim")
+    parser.add_argument("pdf", nargs="?", default=PDF_AMOSTRA)
+    parser.add_argument("--processos", type=int, default=processos_padrao())
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"PDF: {args.pdf} ({contar_paginas(args.pdf)} páginas), processos: {args.processos}, repetições: {args.repeticoes}")
+
+    t_serial, df_serial = cronometrar(lambda: extrair_tabelas(args.pdf, processos=1, normalizar=normalizar_tabelas_linha_a_linha), args.repeticoes)
+    t_paralelo, df_paralelo = cronometrar(lambda: extrair_tabelas(args.pdf, processos=args.processos), args.repeticoes)
+    t_pdfplumber, (df_pdfplumber, _) = cronometrar(lambda: extrair_boletim(args.pdf), args.repeticoes)
+    #todos os caminhos precisam dar o mesmo resultado
+    pd.testing.assert_frame_equal(df_paralelo, df_serial)
+    pd.testing.assert_frame_equal(df_pdfplumber, df_serial)
+
+    #só a normalização, repetida várias vezes sobre as mesmas tabelas
+    tabelas = [t.df for t in camelot.read_pdf(args.pdf, pages="1-end", flavor="stream")]
+    vezes = 50
+    t_loop, _ = cronometrar(lambda: normalizar_tabelas_linha_a_linha([t.copy() for t in tabelas * vezes]), args.repeticoes)
+    t_vetor, _ = cronometrar(lambda: normalizar_tabelas([t.copy() for t in tabelas * vezes]), args.repeticoes)
+
+    print(f"{'etapa':<40}{'mediana (s)':>14}")
+    print(f"{'extração serial (linha a linha)':<40}{t_serial:>14.3f}")
+    print(f"{'extração paralela (vetorizada)':<40}{t_paralelo:>14.3f}   {t_serial / t_paralelo:.2f}x")
+    print(f"{'motor pdfplumber (com metadados)':<40}{t_pdfplumber:>14.3f}   {t_serial / t_pdfplumber:.2f}x")
+    print(f"{f'normalização linha a linha ({vezes}x)':<40}{t_loop:>14.3f}")
+    print(f"{f'normalização vetorizada ({vezes}x)':<40}{t_vetor:>14.3f}   {t_loop / t_vetor:.2f}x")
+    print(f"linhas extraídas: {len(df_paralelo)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/benchmark_inicializacao.py
+#
+# Mede o custo de subir um worker da API: tempo de importação do app.py, tempo até a
+# primeira resposta (GET /praias) e memória residente máxima (RSS) do processo.
+# Cada medição roda em um processo Python novo, comparando:
+#   - sem pandas: a API como está (dados lidos do snapshot ou com o módulo csv);
+#   - com pandas: a mesma API carregando o pandas e lendo o CSV com pd.read_csv, como antes.
+#
+# Uso (na raiz do projeto):
+#   python benchmarks/benchmark_inicializacao.py [--repeticoes R] [--csv caminho.csv]
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSV_AMOSTRA = os.path.join(RAIZ, "tests", "fixtures", "boletim_fortaleza.csv")
+
+#código executado em cada processo filho; COM_PANDAS=1 reproduz a carga antiga com pd.read_csv
+FILHO = """
+import json, os, resource, sys, time
+inicio = time.perf_counter()
+if os.environ.get("COM_PANDAS") == "1":
+    import pandas as pd
+    import snapshot_boletim
+    snapshot_boletim.carregar_csv = lambda caminho: pd.read_csv(caminho).to_dict(orient="records")
+import app
+importado = time.perf_counter()
+resposta = app.app.test_client().get("/praias")
+assert resposta.status_code == 200
+primeira = time.perf_counter()
+print(json.dumps({
+    "importacao": importado - inicio,
+    "primeira_resposta": primeira - inicio,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "pandas_carregado": "pandas" in sys.modules,
+}))
+"""
+
+def medir(com_pandas, csv, historico):
+    env = dict(os.environ, BOLETIM_CSV=csv, HISTORICO_DB=historico, ATUALIZACAO_BOLETIM_S="0", COM_PANDAS="1" if com_pandas else "0")
+    saida = subprocess.run([sys.executable, "-c", FILHO], cwd=os.path.join(RAIZ, "src"), env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização e memória da API")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--csv", default=CSV_AMOSTRA)
+    args = parser.parse_args()
+
+    historico = os.path.join(tempfile.mkdtemp(), "historico.sqlite3")
+    resultados = {}
+    for nome, com_pandas in (("sem pandas", False), ("com pandas", True)):
+        medidas = [medir(com_pandas, args.csv, historico) for _ in range(args.repeticoes)]
+        resultados[nome] = {chave: statistics.median(m[chave] for m in medidas) for chave in ("importacao", "primeira_resposta", "rss_mb")}
+        resultados[nome]["pandas_carregado"] = medidas[0]["pandas_carregado"]
+
+    print(f"{'modo':<14}{'importação (s)':>16}{'1ª resposta (s)':>18}{'RSS (MB)':>11}{'pandas':>8}")
+    for nome, r in resultados.items():
+        print(f"{nome:<14}{r['importacao']:>16.3f}{r['primeira_resposta']:>18.3f}{r['rss_mb']:>11.1f}{'sim' if r['pandas_carregado'] else 'não':>8}")
+
+if __name__ == "__main__":
+    main()
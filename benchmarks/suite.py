@@ -0,0 +1,271 @@
+# benchmarks/suite.py
+#
+# Suíte de benchmarks com serviços externos falsos (tests/servidor_stub.py: Open-Meteo e SEMACE
+# locais, com latência e taxa de erro configuráveis), para detectar regressões de desempenho:
+#   - micro: carga do boletim (snapshot e CSV), extrair_codigo e buscas por código/id/filtros,
+#     serialização do json_response, normalização das tabelas do Camelot, montagem do dataset
+#     e uma coleta completa do scraper contra a SEMACE falsa;
+#   - carga: cada endpoint da API (servidor WSGI ou ASGI em um processo filho) recebe
+#     --requisicoes requisições com --concorrencia simultâneas; reporta req/s, p50, p95, p99 e erros.
+# Os resultados podem ser salvos como linha de base (JSON) e comparados com ela depois: a
+# execução termina com código 1 se alguma medida piorar além da tolerância.
+#
+# Uso (na raiz do projeto):
+#   python benchmarks/suite.py [--so micro|carga] [--modo wsgi|asgi] [--latencia 0.05] [--taxa-erro 0.0]
+#                              [--requisicoes 200] [--concorrencia 16] [--salvar benchmarks/baseline.json]
+#                              [--comparar benchmarks/baseline.json] [--tolerancia 0.5]
+# A linha de base só é comparável com execuções na mesma máquina e com os mesmos parâmetros.
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import httpx
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [RAIZ, os.path.join(RAIZ, "src"), os.path.dirname(os.path.abspath(__file__))]
+from tests import servidor_stub
+from benchmark_asgi import CSV_AMOSTRA, FILHO_ASGI, FILHO_WSGI, porta_livre, subir
+
+PDF_AMOSTRA = servidor_stub.PDF_AMOSTRA
+#datas do período do boletim de exemplo (08/09/2025 a 14/09/2025)
+DATAS_BOLETIM = [str(date(2025, 9, 8) + timedelta(days=i)) for i in range(7)]
+
+# --- Medição dos micro-benchmarks ---
+def cronometrar(funcao, vezes, rodadas):
+    #tempo por chamada (microssegundos) na rodada mais rápida, como o timeit: a interferência de
+    #outros processos só soma tempo, então o mínimo varia menos entre execuções que a média
+    tempos = []
+    for _ in range(rodadas):
+        inicio = time.perf_counter()
+        for _ in range(vezes):
+            funcao()
+        tempos.append((time.perf_counter() - inicio) / vezes)
+    return {"us": round(min(tempos) * 1e6, 2), "vezes": vezes, "rodadas": rodadas}
+
+def micro_benchmarks(rodadas):
+    """
+    Mede as funções internas no próprio processo. O app.py é importado aqui (e não no topo)
+    porque a importação já carrega o boletim: o ambiente (CSV, histórico e caches temporários,
+    sem atualização nem pré-busca) precisa estar pronto antes.
+    """
+    pasta = tempfile.mkdtemp()
+    csv = os.path.join(pasta, "boletim_fortaleza.csv")
+    shutil.copy(CSV_AMOSTRA, csv)
+    os.environ.update(
+        BOLETIM_CSV=csv, HISTORICO_DB=os.path.join(pasta, "historico.sqlite3"), PREVISAO_CACHE_DB="",
+        ATUALIZACAO_BOLETIM_S="0", PREVISAO_PREFETCH_S="0",
+    )
+    import app
+    import scraper
+    from extracao_tabelas import extrair_tabelas_brutas, normalizar_tabelas_contando_ruido
+    from respostas import serializar
+    from snapshot_boletim import caminho_snapshot, carregar_csv, salvar_snapshot
+
+    #o mesmo boletim lido do CSV e de um snapshot gravado ao lado dele (em outra pasta, só com o CSV)
+    pasta_csv = tempfile.mkdtemp()
+    so_csv = os.path.join(pasta_csv, "boletim_fortaleza.csv")
+    shutil.copy(CSV_AMOSTRA, so_csv)
+    salvar_snapshot(caminho_snapshot(csv), carregar_csv(csv), csv)
+
+    dados = app.DADOS
+    praias = dados.praias
+    codigos = [app.extrair_codigo(p) for p in praias]
+    corpo = {"praias": praias}
+    tabelas = extrair_tabelas_brutas(PDF_AMOSTRA, processos=1)
+    boletim = scraper.parse_bulletin(PDF_AMOSTRA, motor="pdfplumber")
+
+    def json_response(compacto):
+        with app.app.test_request_context(f"/praias?compacto={int(compacto)}"):
+            return app.json_response(corpo)
+
+    def montar_dataset():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return scraper.build_dataset(boletim, mostrar=False)
+
+    resultados = {
+        "carga_snapshot": cronometrar(lambda: app._ler_dados(csv), 20, rodadas),
+        "carga_csv": cronometrar(lambda: app._ler_dados(so_csv), 20, rodadas),
+        "extrair_codigo": cronometrar(lambda: [app.extrair_codigo(p) for p in praias], 2000, rodadas),
+        "busca_por_codigo": cronometrar(lambda: [dados.repositorio.buscar(dados.id_por_codigo[c]) for c in codigos], 2000, rodadas),
+        "consulta_filtros": cronometrar(lambda: dados.repositorio.consultar(status="Própria para banho", zona="Leste", data=DATAS_BOLETIM[2]), 2000, rodadas),
+        "serializar_compacto": cronometrar(lambda: serializar(corpo, True), 500, rodadas),
+        "json_response_compacto": cronometrar(lambda: json_response(True), 500, rodadas),
+        "json_response_indentado": cronometrar(lambda: json_response(False), 500, rodadas),
+        "normalizar_tabelas": cronometrar(lambda: normalizar_tabelas_contando_ruido([t.copy() for t in tabelas]), 50, rodadas),
+        "montar_dataset": cronometrar(montar_dataset, 10, rodadas),
+    }
+
+    #coleta completa (listagem, download, extração, gravação e histórico) contra a SEMACE falsa,
+    #sem latência nem erros: mede o scraper, não a rede
+    with servidor_stub.ServidorStub() as semace:
+        scraper.URL_LISTAGEM = semace.url + servidor_stub.CAMINHO_LISTAGEM
+        saida = os.path.join(tempfile.mkdtemp(), "boletim_fortaleza.csv")
+        coleta = lambda: scraper.run(caminho_csv=saida, caminho_historico=os.path.join(pasta, "historico_scraper.sqlite3"), motor="pdfplumber", forcar=True, mostrar=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultados["scraper_coleta"] = cronometrar(coleta, 1, rodadas)
+    return resultados
+
+# --- Gerador de carga ---
+def endpoints(ids, sorteio):
+    #nome -> função que sorteia uma requisição (método, caminho, corpo JSON)
+    data = lambda: sorteio.choice(DATAS_BOLETIM)
+    praia = lambda: sorteio.choice(ids)
+    return {
+        "GET /praias": lambda: ("GET", "/praias", None),
+        "GET /praias/<id>": lambda: ("GET", f"/praias/{praia()}", None),
+        "GET /praias/<id>/data": lambda: ("GET", f"/praias/{praia()}/data?data={data()}&hora=09:00", None),
+        "GET /praias/<id>/previsao": lambda: ("GET", f"/praias/{praia()}/previsao?data={data()}", None),
+        "GET /praias/<id>/historico": lambda: ("GET", f"/praias/{praia()}/historico?inicio=2025-01-01&fim=2025-12-31", None),
+        "GET /historico/zonas": lambda: ("GET", "/historico/zonas?inicio=2025-01-01&fim=2025-12-31", None),
+        "GET /praias/status/<status>": lambda: ("GET", f"/praias/status/{sorteio.choice(['propria', 'impropria'])}?data={data()}", None),
+        "GET /praias/zona/<zona>": lambda: ("GET", f"/praias/zona/{sorteio.choice(['Leste', 'Centro', 'Oeste'])}", None),
+        "GET /praias/filtro": lambda: ("GET", f"/praias/filtro?status=propria&data={data()}", None),
+        "GET /praias/proximas": lambda: ("GET", f"/praias/proximas?lat={-3.72 + sorteio.uniform(-0.03, 0.03):.4f}&lon={-38.50 + sorteio.uniform(-0.06, 0.06):.4f}&k=5", None),
+        "GET /praias/ranking": lambda: ("GET", f"/praias/ranking?data={data()}&k=5", None),
+        "POST /praias/lote": lambda: ("POST", "/praias/lote", {"praias": sorteio.sample(ids, 5), "inicio": DATAS_BOLETIM[0], "fim": DATAS_BOLETIM[2], "horas": ["09:00", "15:00"]}),
+        "GET /metrics": lambda: ("GET", "/metrics", None),
+    }
+
+def percentis(latencias):
+    latencias = sorted(latencias)
+    quantil = lambda q: latencias[min(len(latencias) - 1, int(q * len(latencias)))]
+    return {"p50_ms": round(statistics.median(latencias) * 1000, 2), "p95_ms": round(quantil(0.95) * 1000, 2), "p99_ms": round(quantil(0.99) * 1000, 2)}
+
+async def disparar(url, requisicoes, concorrencia):
+    limite = asyncio.Semaphore(concorrencia)
+    latencias = []
+    erros = 0
+
+    async def uma(cliente, metodo, caminho, corpo):
+        nonlocal erros
+        async with limite:
+            inicio = time.perf_counter()
+            try:
+                resposta = await cliente.request(metodo, caminho, json=corpo)
+                ok = resposta.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencias.append(time.perf_counter() - inicio)
+            erros += not ok
+
+    limites = httpx.Limits(max_connections=concorrencia, max_keepalive_connections=concorrencia)
+    async with httpx.AsyncClient(base_url=url, limits=limites, timeout=60) as cliente:
+        inicio = time.perf_counter()
+        await asyncio.gather(*(uma(cliente, *requisicao) for requisicao in requisicoes))
+        duracao = time.perf_counter() - inicio
+    return {"rps": round(len(requisicoes) / duracao, 1), **percentis(latencias), "erros": erros, "requisicoes": len(requisicoes)}
+
+def teste_de_carga(args):
+    from snapshot_boletim import carregar_csv
+
+    servidor_stub._ServidorHTTP.request_queue_size = 2048
+    ids = [praia["id"] for praia in carregar_csv(CSV_AMOSTRA)]
+    resultados = {}
+    with servidor_stub.ServidorStub(latencia=args.latencia, taxa_erro=args.taxa_erro, semente=args.semente) as stub:
+        porta = porta_livre()
+        processo = subir(FILHO_ASGI if args.modo == "asgi" else FILHO_WSGI, porta, args.threads, stub)
+        try:
+            url = f"http://127.0.0.1:{porta}"
+            for nome, sortear in endpoints(ids, random.Random(args.semente)).items():
+                if args.endpoints and not any(filtro in nome for filtro in args.endpoints.split(",")):
+                    continue
+                #aquecimento fora da medida: primeiras buscas na Open-Meteo, caches e conexões
+                asyncio.run(disparar(url, [sortear() for _ in range(args.aquecimento)], args.concorrencia))
+                resultados[nome] = asyncio.run(disparar(url, [sortear() for _ in range(args.requisicoes)], args.concorrencia))
+                r = resultados[nome]
+                print(f"{nome:<30}{r['rps']:>9.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['erros']:>7}")
+        finally:
+            processo.terminate()
+            processo.wait()
+    return resultados
+
+# --- Linha de base e comparação ---
+def comparar(base, atual, tolerancia):
+    """
+    Compara duas execuções e devolve as regressões como textos. Piora: tempo dos
+    micro-benchmarks ou p95 acima de (1 + tolerância) vezes a base, req/s abaixo de
+    (1 - tolerância) vezes a base, ou mais erros que na base. Medidas ausentes em uma das
+    execuções são ignoradas.
+    """
+    regressoes = []
+    for nome, medida in atual.get("micro", {}).items():
+        anterior = base.get("micro", {}).get(nome)
+        if anterior and medida["us"] > anterior["us"] * (1 + tolerancia):
+            regressoes.append(f"micro {nome}: {anterior['us']:.2f} -> {medida['us']:.2f} µs")
+    for nome, medida in atual.get("carga", {}).items():
+        anterior = base.get("carga", {}).get(nome)
+        if not anterior:
+            continue
+        if medida["p95_ms"] > anterior["p95_ms"] * (1 + tolerancia):
+            regressoes.append(f"carga {nome}: p95 {anterior['p95_ms']:.1f} -> {medida['p95_ms']:.1f} ms")
+        if medida["rps"] < anterior["rps"] * (1 - tolerancia):
+            regressoes.append(f"carga {nome}: {anterior['rps']:.1f} -> {medida['rps']:.1f} req/s")
+        if medida["erros"] > anterior["erros"]:
+            regressoes.append(f"carga {nome}: erros {anterior['erros']} -> {medida['erros']}")
+    return regressoes
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks (micro e carga) com Open-Meteo e SEMACE falsas")
+    parser.add_argument("--so", choices=("micro", "carga"), help="executa só uma das partes")
+    parser.add_argument("--rodadas", type=int, default=7, help="rodadas de cada micro-benchmark")
+    parser.add_argument("--modo", choices=("wsgi", "asgi"), default="wsgi")
+    parser.add_argument("--threads", type=int, default=8, help="threads do servidor WSGI")
+    parser.add_argument("--latencia", type=float, default=0.05, help="latência da Open-Meteo falsa (s)")
+    parser.add_argument("--taxa-erro", type=float, default=0.0, help="fração das chamadas à Open-Meteo falsa que respondem 503")
+    parser.add_argument("--requisicoes", type=int, default=200, help="requisições medidas por endpoint")
+    parser.add_argument("--aquecimento", type=int, default=20, help="requisições por endpoint antes da medida")
+    parser.add_argument("--concorrencia", type=int, default=16)
+    parser.add_argument("--endpoints", help="só os endpoints que contêm um destes textos (separados por vírgula)")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--salvar", help="grava os resultados (JSON) como linha de base")
+    parser.add_argument("--comparar", help="linha de base (JSON) para comparar")
+    #em uma máquina compartilhada as medidas variam bastante entre execuções; 50% separa ruído de regressão
+    parser.add_argument("--tolerancia", type=float, default=0.5, help="piora aceita antes de acusar regressão (fração)")
+    args = parser.parse_args(argv)
+
+    resultado = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "maquina": {"python": platform.python_version(), "plataforma": platform.platform(), "cpus": os.cpu_count()},
+        "parametros": {nome: getattr(args, nome) for nome in ("modo", "threads", "latencia", "taxa_erro", "requisicoes", "aquecimento", "concorrencia", "rodadas", "semente")},
+    }
+    if args.so != "micro":
+        print(f"Carga ({args.modo.upper()}): Open-Meteo falsa com {args.latencia:g}s de latência e {args.taxa_erro:.0%} de erros; {args.requisicoes} requisições por endpoint, concorrência {args.concorrencia}")
+        print(f"{'endpoint':<30}{'req/s':>9}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}{'erros':>7}")
+        resultado["carga"] = teste_de_carga(args)
+    if args.so != "carga":
+        #depois da carga: o app.py importado aqui não divide a CPU com o servidor filho
+        resultado["micro"] = micro_benchmarks(args.rodadas)
+        print(f"\n{'micro-benchmark':<30}{'µs/chamada':>12}")
+        for nome, medida in resultado["micro"].items():
+            print(f"{nome:<30}{medida['us']:>12.2f}")
+
+    if args.salvar:
+        with open(args.salvar, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+        print(f"\nLinha de base gravada em {args.salvar}")
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+        if base.get("parametros") != resultado["parametros"]:
+            print(f"\nAviso: parâmetros diferentes da linha de base ({base.get('parametros')})")
+        regressoes = comparar(base, resultado, args.tolerancia)
+        print(f"\n{len(regressoes)} regressão(ões) acima de {args.tolerancia:.0%} em relação a {args.comparar}")
+        for regressao in regressoes:
+            print(f"  - {regressao}")
+        return 1 if regressoes else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
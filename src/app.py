@@ -2,14 +2,27 @@
 
 from flask import Flask, Response, request
 from flasgger import Swagger
-import json
-from datetime import datetime
-import pandas as pd
-import subprocess
+from datetime import datetime, timedelta
 import os
-import sys
-import requests
-from coordenadas import COORDENADAS_POR_CODIGO
+import gc
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed, wait
+from coordenadas import COORDENADAS_NUMERICAS
+from cache_previsao import CachePrevisao, chave_previsao, series_do_dia
+from cache_persistente import CachePersistente
+from grade_previsao import GradePrevisao
+import cliente_http
+import metricas
+from metricas import REGISTRO, medir, submeter
+from atualizador import AtualizadorBoletim, TravaArquivo
+from prefetch_previsao import PrefetchPrevisoes
+from serie_horaria import SerieHoraria, instante_do_minuto, minuto_epoch
+from historico import HistoricoBoletins, codigo_do_nome
+from repositorio import RepositorioPraias
+from indice_espacial import IndiceEspacial
+from respostas import RespostasPreRenderizadas, serializar
+from snapshot_boletim import SnapshotIncompativel, caminho_snapshot, carregar_csv, carregar_snapshot
 
 app = Flask(__name__)
 app.config['JSON_AS_ASCII'] = False #para suportar acentos
@@ -28,37 +41,216 @@ template = {
 }
 swagger = Swagger(app, template=template)
 
-# --- Rodar scraper.py automaticamente antes de carregar os dados ---
+# --- Métricas (expostas em /metrics no formato do Prometheus) ---
+#cada processo (worker) tem as suas; o Prometheus soma os workers na consulta
+REQUISICAO_DURACAO = REGISTRO.histograma("api_requisicao_duracao_segundos", "Duração das requisições por rota (até o primeiro byte nas respostas em streaming).", ("rota", "metodo", "status"))
+REQUISICAO_UPSTREAM = REGISTRO.histograma("api_requisicao_chamadas_upstream", "Chamadas a serviços externos feitas durante cada requisição.", ("rota",), limites=(0, 1, 2, 4, 8, 16, 32))
+PREVISAO_DURACAO = REGISTRO.histograma("api_previsao_get_forecast_segundos", "Duração de get_forecast (pré-busca, cache ou Open-Meteo).")
+PREFETCH_CONSULTAS = REGISTRO.contador("api_previsao_prefetch_consultas_total", "Consultas à pré-busca de previsões, por resultado.", ("resultado",))
+BOLETIM_CARGA = REGISTRO.histograma("api_boletim_carga_segundos", "Duração da carga do boletim (snapshot ou CSV).", limites=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+
+# --- Caminhos do CSV e do histórico ---
 # Constrói os caminhos de forma robusta para funcionar na estrutura src/
 SRC_DIR = os.path.dirname(os.path.abspath(__file__))
-SCRAPER_FILE = os.path.join(SRC_DIR, "scraper.py")
-if os.path.exists(SCRAPER_FILE):
+BASE_DIR = os.path.dirname(SRC_DIR)
+#BOLETIM_CSV permite usar outro arquivo (ex.: o CSV de exemplo dos testes)
+CSV_FILE = os.environ.get("BOLETIM_CSV", os.path.join(BASE_DIR, "boletim_fortaleza.csv"))
+#histórico de todos os boletins já importados pelo scraper (SQLite)
+HISTORICO_DB = os.environ.get("HISTORICO_DB", os.path.join(BASE_DIR, "boletins_historico.sqlite3"))
+#intervalo, em segundos, entre atualizações do boletim em segundo plano (0 desativa)
+ATUALIZACAO_BOLETIM_S = int(os.environ.get("ATUALIZACAO_BOLETIM_S", 6 * 3600))
+
+# --- Rodar o scraper no próprio processo para atualizar o boletim ---
+def executar_scraper():
+    #importado só quando usado: o scraper puxa o pandas, que a API não usa para servir
+    import scraper
     print("Executando scraper para atualizar boletim...")
-    subprocess.run([sys.executable, SCRAPER_FILE], check=True, cwd=SRC_DIR)
-else:
-    print(f"Arquivo scraper.py não encontrado em {SCRAPER_FILE}. Usando CSV existente.")
+    #processos=1: a API tem outras threads vivas, e um fork aqui poderia travar o processo filho
+    scraper.run(caminho_csv=CSV_FILE, caminho_historico=HISTORICO_DB, mostrar=False, processos=1)
+
+# --- JSON compacto (sem indentação) ---
+#JSON_COMPACTO=1 torna o modo compacto o padrão; ?compacto=1 / ?compacto=0 escolhe por requisição
+JSON_COMPACTO = os.environ.get("JSON_COMPACTO", "0") == "1"
+def quer_compacto():
+    return compacto_da_consulta(request.args.get("compacto"))
+
+#usadas também pelo modo ASGI (asgi.py), que lê a query string sem o request do Flask
+def compacto_da_consulta(valor):
+    if valor is None:
+        return JSON_COMPACTO
+    return parametro_ligado(valor)
+
+#valor de parâmetro de consulta ou cabeçalho que liga uma opção (?compacto=1, X-Perfil: sim, ...)
+def parametro_ligado(valor):
+    return valor is not None and valor.lower() in ("1", "true", "sim")
 
 # --- Função para sempre retornar JSON com acentos ---
 def json_response(data, status=200):
-    return Response(json.dumps(data, ensure_ascii=False, indent=4), status=status, mimetype="application/json")
+    return Response(serializar(data, quer_compacto()), status=status, mimetype="application/json")
 
-# --- Carregar os dados gerados pelo scraper ---
-# Constrói o caminho para o CSV na pasta raiz do projeto
-BASE_DIR = os.path.dirname(SRC_DIR)
-CSV_FILE = os.path.join(BASE_DIR, "boletim_fortaleza.csv")
-try:
-    df = pd.read_csv(CSV_FILE)
-except FileNotFoundError:
-    raise FileNotFoundError(f"O arquivo {CSV_FILE} não foi encontrado. Execute o scraper primeiro.")
+# --- Devolve uma resposta pré-renderizada, com ETag e suporte a If-None-Match ---
+def resposta_pronta(pronta):
+    #If-None-Match usa a comparação fraca (RFC 9110): W/"..." também vale, e "*" casa com tudo
+    if request.if_none_match.contains_weak(pronta.etag):
+        response = Response(status=304)
+    else:
+        response = Response(pronta.corpo, status=pronta.status, mimetype="application/json")
+    response.set_etag(pronta.etag)
+    return response
+
+# --- Cache das previsões (séries horárias completas por ponto e data) ---
+#TTL e tamanho máximo configuráveis por variáveis de ambiente
+PREVISAO_CACHE_TTL = int(os.environ.get("PREVISAO_CACHE_TTL", 900))  # segundos
+PREVISAO_CACHE_MAX = int(os.environ.get("PREVISAO_CACHE_MAX", 512))  # entradas
+#cache em disco (SQLite) compartilhado pelos workers e mantido entre reinícios; PREVISAO_CACHE_DB="" desativa
+PREVISAO_CACHE_DB = os.environ.get("PREVISAO_CACHE_DB", os.path.join(BASE_DIR, "previsoes_cache.sqlite3"))
+PREVISAO_CACHE_DISCO_MB = int(os.environ.get("PREVISAO_CACHE_DISCO_MB", 64))
+#por quanto tempo uma série vencida fica no disco como reserva para quando a Open-Meteo cair
+PREVISAO_CACHE_RESERVA_S = int(os.environ.get("PREVISAO_CACHE_RESERVA_S", 86400))
+CACHE_PREVISAO = CachePrevisao(
+    ttl=PREVISAO_CACHE_TTL, max_entradas=PREVISAO_CACHE_MAX,
+    persistente=CachePersistente(
+        PREVISAO_CACHE_DB, ttl=PREVISAO_CACHE_TTL, max_bytes=PREVISAO_CACHE_DISCO_MB * 1024 * 1024, reserva=PREVISAO_CACHE_RESERVA_S,
+    ) if PREVISAO_CACHE_DB else None,
+)
 
-#converter o df para lista de dicionário
-praias = df.to_dict(orient="records")
+# --- Endpoints da Open-Meteo (configuráveis para testes com servidor local) ---
+OPEN_METEO_WEATHER_URL = os.environ.get("OPEN_METEO_WEATHER_URL", "https://api.open-meteo.com/v1/forecast")
+OPEN_METEO_MARINE_URL = os.environ.get("OPEN_METEO_MARINE_URL", "https://marine-api.open-meteo.com/v1/marine")
+
+# --- Paralelismo das consultas de previsão ---
+#PREVISAO_MAX_THREADS limita quantos grupos de previsões são buscados ao mesmo tempo
+#PREVISAO_PRAZO_S é o tempo máximo que uma requisição espera pelas previsões
+PREVISAO_MAX_THREADS = int(os.environ.get("PREVISAO_MAX_THREADS", 8))
+PREVISAO_PRAZO_S = float(os.environ.get("PREVISAO_PRAZO_S", 8.0))
+#um pool para os grupos de previsões e outro só para as chamadas HTTP (tempo e marinha em paralelo);
+#separados para que um grupo nunca fique esperando por uma vaga no próprio pool
+_EXECUTOR_PREVISOES = ThreadPoolExecutor(max_workers=PREVISAO_MAX_THREADS, thread_name_prefix="previsao")
+_EXECUTOR_UPSTREAM = ThreadPoolExecutor(max_workers=2 * PREVISAO_MAX_THREADS, thread_name_prefix="open-meteo")
+
+#quantas coordenadas vão em uma única chamada à Open-Meteo (limita o tamanho da URL)
+PREVISAO_LOTE_MAX = int(os.environ.get("PREVISAO_LOTE_MAX", 50))
+
+# --- Pré-busca das previsões de todos os pontos monitorados ---
+#intervalo, em segundos, entre pré-buscas (0 desativa) e quantos dias, a partir de hoje, cada uma cobre
+PREVISAO_PREFETCH_S = int(os.environ.get("PREVISAO_PREFETCH_S", 3600))
+PREVISAO_PREFETCH_DIAS = int(os.environ.get("PREVISAO_PREFETCH_DIAS", 7))
+
+# --- Grade de previsão ---
+#pontos a menos de PREVISAO_GRADE_GRAUS graus uns dos outros (mesma célula) compartilham a mesma
+#busca e a mesma entrada de cache; 0.02° ~ 2,2 km, bem abaixo da resolução dos modelos (0 desativa)
+PREVISAO_GRADE_GRAUS = float(os.environ.get("PREVISAO_GRADE_GRAUS", 0.02))
+GRADE_PREVISAO = GradePrevisao(COORDENADAS_NUMERICAS.values(), PREVISAO_GRADE_GRAUS)
+
+HOURLY_WEATHER = "temperature_2m,apparent_temperature,windspeed_10m,winddirection_10m,precipitation,cloudcover"
+HOURLY_MARINE = "wave_height,wave_direction,wave_period"
+
+# --- URLs de tempo e marinha para vários pontos (latitude/longitude separadas por vírgula) ---
+def urls_open_meteo(pontos, data, data_fim=None):
+    data_fim = data_fim or data
+    lats = ",".join(str(lat) for lat, _ in pontos)
+    lons = ",".join(str(lon) for _, lon in pontos)
+    weather_url = (f"{OPEN_METEO_WEATHER_URL}?latitude={lats}&longitude={lons}&hourly={HOURLY_WEATHER}&start_date={data}&end_date={data_fim}&timezone=America/Fortaleza")
+    marine_url = (f"{OPEN_METEO_MARINE_URL}?latitude={lats}&longitude={lons}&hourly={HOURLY_MARINE}&start_date={data}&end_date={data_fim}&timezone=America/Fortaleza")
+    return weather_url, marine_url
+
+# --- Chamada a um endpoint da Open-Meteo separando a resposta por ponto ---
+def _consultar_pontos(cliente, url, total):
+    #timeout, erro de rede ou disjuntor aberto: os pontos ficam sem série
+    try:
+        response = cliente.get(url)
+    except Exception:
+        return [{}] * total
+    return pontos_da_resposta(response, total)
+
+#separa a resposta da Open-Meteo por ponto (também usada pelo cliente assíncrono do asgi.py)
+def pontos_da_resposta(response, total):
+    if response.status_code != 200:
+        return [{}] * total
+    corpo = response.json()
+    #com uma coordenada a Open-Meteo devolve um objeto; com várias, uma lista na mesma ordem
+    if isinstance(corpo, dict):
+        corpo = [corpo]
+    if len(corpo) != total:
+        return [{}] * total
+    return corpo
+
+# --- Função para buscar as séries horárias na Open-Meteo (vários pontos por chamada) ---
+def buscar_series_lote(pontos, data, data_fim=None):
+    """
+    Busca o dia inteiro de dados horários (meteorológicos e marinhos) para vários pontos
+    com uma única chamada de tempo e uma de marinha (latitude/longitude separadas por vírgula).
+    Com `data_fim`, busca todas as horas de `data` até `data_fim` (usado pela pré-busca).
+    Retorna uma lista, na ordem de `pontos`, de {"weather": SerieHoraria, "marine": SerieHoraria};
+    séries indisponíveis vêm vazias.
+    """
+    weather_url, marine_url = urls_open_meteo(pontos, data, data_fim)
+    #as duas chamadas são independentes, então a marinha roda em paralelo com a de tempo
+    #submeter: a chamada na outra thread também entra no perfil da requisição
+    marine_futuro = submeter(_EXECUTOR_UPSTREAM, _consultar_pontos, cliente_http.OPEN_METEO_MARINE, marine_url, len(pontos))
+    weather_lista = _consultar_pontos(cliente_http.OPEN_METEO_WEATHER, weather_url, len(pontos))
+    return series_dos_pontos(weather_lista, marine_futuro.result())
+
+#as séries são convertidas uma única vez em vetores; cache e pré-busca guardam já convertidas
+def series_dos_pontos(weather_lista, marine_lista):
+    return [{"weather": SerieHoraria.de_hourly(w.get("hourly")), "marine": SerieHoraria.de_hourly(m.get("hourly"))} for w, m in zip(weather_lista, marine_lista)]
+
+# --- Função para buscar as séries horárias de um único ponto ---
+def buscar_series(lat, lon, data):
+    return buscar_series_lote([(lat, lon)], data)[0]
+
+#só guarda no cache quando pelo menos uma das séries veio da Open-Meteo
+def series_validas(series):
+    return bool(series["weather"] or series["marine"])
+
+# --- Reserva para quando a Open-Meteo falha ---
+def series_ou_reserva(chave, series):
+    #se a busca falhou, usa a última série conhecida para o ponto, mesmo vencida
+    if series_validas(series):
+        return series
+    return CACHE_PREVISAO.obter(chave, aceitar_expirado=True) or series
+
+def open_meteo_fora_do_ar():
+    return cliente_http.OPEN_METEO_WEATHER.disjuntor.aberto and cliente_http.OPEN_METEO_MARINE.disjuntor.aberto
+
+# --- Campos da previsão: (nome na resposta, série, variável da Open-Meteo) ---
+CAMPOS_PREVISAO = [
+    ("temperatura_c", "weather", "temperature_2m"),
+    ("sensacao_termica_c", "weather", "apparent_temperature"),
+    ("velocidade_vento_kmh", "weather", "windspeed_10m"),
+    ("direcao_vento_graus", "weather", "winddirection_10m"),
+    ("chuva_mm", "weather", "precipitation"),
+    ("cobertura_nuvens_pct", "weather", "cloudcover"),
+    ("altura_ondas_m", "marine", "wave_height"),
+    ("direcao_ondas_graus", "marine", "wave_direction"),
+    ("periodo_ondas_s", "marine", "wave_period"),
+]
+
+#valores de todos os campos em um instante (minutos desde 1970), interpolados entre as horas cheias
+def valores_no_instante(series, minuto):
+    return {campo: series[tipo].valor(variavel, minuto) for campo, tipo, variavel in CAMPOS_PREVISAO}
+
+# --- Monta a previsão de uma hora (HH:MM, qualquer minuto) a partir das séries horárias ---
+def montar_previsao(series, data, hora_consulta):
+    try:
+        valores = valores_no_instante(series, minuto_epoch(f"{data}T{hora_consulta}"))
+    except ValueError:
+        valores = {}  #data ou hora em formato inválido
+    if all(valor is None for valor in valores.values()):
+        if open_meteo_fora_do_ar():
+            return {"mensagem": "Previsão indisponível: Open-Meteo fora do ar no momento", "data": data, "hora_consulta": hora_consulta}
+        return {"mensagem": f"Previsão não disponível para {data} às {hora_consulta}", "data": data, "hora_consulta": hora_consulta}
+    return {"data": data, "hora_consulta": hora_consulta, **valores}
 
 # --- Função para obter previsão do tempo e marinha ---
 def get_forecast(lat, lon, data, hora=None):
     """
     Retorna previsão meteorológica e marinha para a latitude/longitude fornecida
     na data e hora desejadas.
+
+    As séries do dia inteiro ficam em cache (CACHE_PREVISAO), então consultas
+    para o mesmo ponto e data, em qualquer hora, não voltam à Open-Meteo.
+    Horas quebradas (ex.: 14:30) são interpoladas entre as horas cheias.
     
     Unidades:
         - temperatura: °C
@@ -72,50 +264,191 @@ def get_forecast(lat, lon, data, hora=None):
         - período das ondas: segundos
     """
     hora_consulta = hora if hora else "12:00"  # padrão meio-dia
-    weather_url = (f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&hourly=temperature_2m,apparent_temperature,windspeed_10m,winddirection_10m,precipitation,cloudcover&start_date={data}&end_date={data}&timezone=America/Fortaleza")
-    marine_url = (f"https://marine-api.open-meteo.com/v1/marine?latitude={lat}&longitude={lon}&hourly=wave_height,wave_direction,wave_period&start_date={data}&end_date={data}&timezone=America/Fortaleza")
-    weather_response = requests.get(weather_url)
-    marine_response = requests.get(marine_url)
-    weather_data = weather_response.json() if weather_response.status_code == 200 else {}
-    marine_data = marine_response.json() if marine_response.status_code == 200 else {}
-    forecast = {"data": data, "hora_consulta": hora_consulta, "temperatura_c": None, "sensacao_termica_c": None, "velocidade_vento_kmh": None, "direcao_vento_graus": None, "chuva_mm": None, "cobertura_nuvens_pct": None, "altura_ondas_m": None, "direcao_ondas_graus": None, "periodo_ondas_s": None}
-    if "hourly" in weather_data:
-        times = weather_data["hourly"]["time"]
-        alvo = f"{data}T{hora_consulta}"
-        if alvo in times:
-            idx = times.index(alvo)
-            forecast.update({"temperatura_c": weather_data["hourly"]["temperature_2m"][idx], "sensacao_termica_c": weather_data["hourly"]["apparent_temperature"][idx], "velocidade_vento_kmh": weather_data["hourly"]["windspeed_10m"][idx], "direcao_vento_graus": weather_data["hourly"]["winddirection_10m"][idx], "chuva_mm": weather_data["hourly"]["precipitation"][idx], "cobertura_nuvens_pct": weather_data["hourly"]["cloudcover"][idx]})
-    if "hourly" in marine_data:
-        times = marine_data["hourly"]["time"]
-        alvo = f"{data}T{hora_consulta}"
-        if alvo in times:
-            idx = times.index(alvo)
-            forecast.update({"altura_ondas_m": marine_data["hourly"]["wave_height"][idx], "direcao_ondas_graus": marine_data["hourly"]["wave_direction"][idx], "periodo_ondas_s": marine_data["hourly"]["wave_period"][idx]})
-    if all(value is None for key, value in forecast.items() if key not in ["data", "hora_consulta"]):
-        forecast = {"mensagem": f"Previsão não disponível para {data} às {hora_consulta}", "data": data, "hora_consulta": hora_consulta}
-    return forecast
+    with medir(PREVISAO_DURACAO, "get_forecast"):
+        return montar_previsao(obter_series(lat, lon, data), data, hora_consulta)
+
+# --- Séries da pré-busca, contando acertos e falhas para as métricas ---
+def series_pre_buscadas(chave):
+    series = PREFETCH_PREVISOES.obter(chave)
+    PREFETCH_CONSULTAS.inc(resultado="falha" if series is None else "acerto")
+    return series
+
+# --- Séries do dia inteiro para um ponto: pré-busca, cache ou Open-Meteo (nessa ordem) ---
+def obter_series(lat, lon, data):
+    lat, lon = GRADE_PREVISAO.ponto(lat, lon)
+    chave = chave_previsao(lat, lon, data)
+    #dentro da janela da pré-busca a resposta sai dos dados locais, sem chamada externa
+    series = series_pre_buscadas(chave)
+    if series is None:
+        series = CACHE_PREVISAO.obter_ou_buscar(chave, lambda: buscar_series(lat, lon, data), armazenar=series_validas)
+    return series_ou_reserva(chave, series)
 
 # --- Função para extrair código da praia ---
 def extrair_codigo(praia):
     # Caso exista campo 'Codigo', usa ele; senão extrai do Nome (ex: "05L - P. do Futuro")
     return (praia.get("Nome", "")[:3] or "").strip().upper()
 
-# --- Rotas ---
+# --- Função para obter as coordenadas numéricas da praia ---
+def coordenadas_da_praia(praia):
+    #retorna (lat, lon) ou None quando o código não tem coordenadas mapeadas
+    #as coordenadas já foram convertidas para números uma única vez (coordenadas.py)
+    return COORDENADAS_NUMERICAS.get(extrair_codigo(praia))
 
-#rota raiz
-@app.route('/') #a função home será executada quando a raíz for chamada
-def home():
+# --- Função para buscar previsões de várias praias de uma vez ---
+def buscar_previsoes(lista_praias, data, hora, prazo=None):
     """
-    Endpoint Raiz da API
-    Retorna uma mensagem de boas-vindas e um resumo de todos os endpoints disponíveis.
-    ---
-    tags:
-      - Geral
-    responses:
-      200:
-        description: Mensagem de boas-vindas e estrutura da API.
+    Busca as previsões de todas as praias com chamadas em lote à Open-Meteo: pontos repetidos
+    viram uma única chave e os que faltam no cache vão em grupos de até PREVISAO_LOTE_MAX
+    coordenadas (uma chamada de tempo e uma de marinha por grupo, grupos em paralelo).
+    Retorna (previsoes, parcial): uma previsão por praia, na mesma ordem, e se algum grupo
+    não ficou pronto dentro do prazo. As buscas atrasadas continuam em segundo plano e
+    abastecem o cache para as próximas requisições.
+    """
+    prazo = PREVISAO_PRAZO_S if prazo is None else prazo
+    hora = hora or "12:00"
+    previsoes = [None] * len(lista_praias)
+    chaves = [None] * len(lista_praias)
+    pontos = {}  # chave do cache -> (lat, lon)
+    for i, praia in enumerate(lista_praias):
+        coords = coordenadas_da_praia(praia)
+        if coords is None:
+            previsoes[i] = {"mensagem": "Coordenadas não disponíveis"}
+            continue
+        #praias na mesma célula da grade viram o mesmo ponto (uma busca, uma entrada de cache)
+        coords = GRADE_PREVISAO.ponto(*coords)
+        chaves[i] = chave_previsao(coords[0], coords[1], data)
+        pontos.setdefault(chaves[i], coords)
+
+    #o que já está na pré-busca ou no cache é respondido sem passar pelo pool
+    series = {}
+    for chave in pontos:
+        valor = series_pre_buscadas(chave) or CACHE_PREVISAO.obter(chave)
+        if valor is not None:
+            series[chave] = valor
+    faltantes = [chave for chave in pontos if chave not in series]
+
+    def buscar_lote(chaves_lote):
+        return buscar_series_lote([pontos[chave] for chave in chaves_lote], data)
+
+    futuros = {}
+    for inicio in range(0, len(faltantes), PREVISAO_LOTE_MAX):
+        grupo = faltantes[inicio:inicio + PREVISAO_LOTE_MAX]
+        futuros[submeter(_EXECUTOR_PREVISOES, CACHE_PREVISAO.obter_ou_buscar_lote, grupo, buscar_lote, series_validas)] = grupo
+    prontos, pendentes = wait(futuros, timeout=prazo)
+    for futuro in prontos:
+        try:
+            series.update(futuro.result())
+        except Exception:
+            pass  #as praias desse grupo ficam com a mensagem de indisponível
+    for chave in faltantes:
+        if chave not in series:
+            reserva = CACHE_PREVISAO.obter(chave, aceitar_expirado=True)
+            if reserva is not None:
+                series[chave] = reserva
+    atrasadas = {chave for futuro in pendentes for chave in futuros[futuro]}
+
+    for i, chave in enumerate(chaves):
+        if chave is None:
+            continue
+        if chave in series:
+            previsoes[i] = montar_previsao(series_ou_reserva(chave, series[chave]), data, hora)
+        elif chave in atrasadas:
+            previsoes[i] = {"mensagem": f"Previsão não disponível: tempo limite de {prazo:g}s excedido", "data": data, "hora_consulta": hora}
+        else:
+            previsoes[i] = {"mensagem": f"Previsão não disponível para {data} às {hora}", "data": data, "hora_consulta": hora}
+    return previsoes, bool(pendentes)
+
+# --- Séries de vários pontos ao longo de vários dias (consulta em lote) ---
+def buscar_series_periodo(pontos, dias, prazo=None):
+    """
+    Busca as séries de todos os `pontos` (já levados à grade) em todos os `dias`. Pontos com
+    todos os dias na pré-busca ou no cache ficam prontos na hora; os demais vão em grupos de até
+    PREVISAO_LOTE_MAX coordenadas pelo CACHE_PREVISAO (obter_ou_buscar_lote), então consultas
+    simultâneas aos mesmos pontos e dias esperam a mesma busca. Cada grupo faz uma única chamada
+    de tempo e uma de marinha cobrindo do primeiro ao último dia que falta, e cada dia vai para
+    o cache só com as suas horas.
+
+    As buscas são enviadas ao pool já nesta chamada (no contexto da requisição, para o perfil).
+    Retorna um gerador de (lote, atrasado), com lote = {(lat, lon): {dia: séries}}, à medida que
+    os grupos ficam prontos. Grupos que falham ou não terminam em `prazo` segundos saem com a
+    reserva do cache (ou séries vazias) e atrasado=True; as buscas atrasadas continuam em
+    segundo plano e abastecem o cache.
     """
-    data = {
+    prazo = PREVISAO_PRAZO_S if prazo is None else prazo
+    limite = time.monotonic() + prazo
+    prontos = {}
+    faltantes = []
+    for ponto in pontos:
+        por_dia = {dia: series_pre_buscadas(chave_previsao(*ponto, dia)) or CACHE_PREVISAO.obter(chave_previsao(*ponto, dia)) for dia in dias}
+        if all(series is not None for series in por_dia.values()):
+            prontos[ponto] = por_dia
+        else:
+            faltantes.append((ponto, por_dia))
+
+    def buscar_lote(chaves):
+        #uma chamada para os pontos e o período (do primeiro ao último dia) das chaves que faltam
+        pontos_lote = list(dict.fromkeys(chave[:2] for chave in chaves))
+        dias_lote = sorted({chave[2] for chave in chaves})
+        por_ponto = dict(zip(pontos_lote, buscar_series_lote(pontos_lote, dias_lote[0], dias_lote[-1])))
+        return [series_do_dia(por_ponto[chave[:2]], chave[2]) for chave in chaves]
+
+    futuros = {}
+    for inicio in range(0, len(faltantes), PREVISAO_LOTE_MAX):
+        grupo = faltantes[inicio:inicio + PREVISAO_LOTE_MAX]
+        chaves = [chave_previsao(*ponto, dia) for ponto, por_dia in grupo for dia, series in por_dia.items() if series is None]
+        futuros[submeter(_EXECUTOR_PREVISOES, CACHE_PREVISAO.obter_ou_buscar_lote, chaves, buscar_lote, series_validas)] = grupo
+
+    def completar(grupo, buscadas):
+        vazias = {"weather": SerieHoraria(0, {}), "marine": SerieHoraria(0, {})}
+        lote = {}
+        for ponto, por_dia in grupo:
+            for dia in dias:
+                if por_dia[dia] is None:
+                    chave = chave_previsao(*ponto, dia)
+                    por_dia[dia] = series_ou_reserva(chave, buscadas.get(chave) or vazias)
+            lote[ponto] = por_dia
+        return lote
+
+    def resultados():
+        if prontos:
+            yield prontos, False
+        pendentes = dict(futuros)
+        try:
+            for futuro in as_completed(futuros, timeout=max(0, limite - time.monotonic())):
+                grupo = pendentes.pop(futuro)
+                try:
+                    buscadas, falhou = futuro.result(), False
+                except Exception as erro:
+                    #a resposta já começou: o grupo sai com a reserva, sem interromper o NDJSON
+                    print(f"Falha na busca em lote de previsões: {erro}")
+                    buscadas, falhou = {}, True
+                yield completar(grupo, buscadas), falhou
+        except FuturesTimeoutError:
+            for grupo in pendentes.values():
+                yield completar(grupo, {}), True
+
+    return resultados()
+
+# --- Status aceitos nas rotas de filtro ---
+STATUS_MAP = {"propria": "Própria para banho", "impropria": "Imprópria para banho"}
+
+# --- Corpo das rotas de filtro quando a data não é informada ---
+def lista_sem_previsao(resultado):
+    return [{"praia": praia, "info": "Para obter previsão, informe ?data=YYYY-MM-DD."} for praia in resultado]
+
+# --- Monta a resposta das rotas de filtro (status/zona) ---
+def resposta_com_previsoes(resultado, data, hora):
+    if not data:
+        return json_response(lista_sem_previsao(resultado))
+    previsoes, parcial = buscar_previsoes(resultado, data, hora)
+    resposta = json_response([{"praia": praia, "previsao": forecast} for praia, forecast in zip(resultado, previsoes)])
+    #avisa o cliente quando alguma previsão ficou de fora por causa do prazo
+    resposta.headers["X-Previsao-Parcial"] = "true" if parcial else "false"
+    return resposta
+
+# --- Resumo da API exibido na rota raiz ---
+def resumo_api():
+    return {
         "message": "API de Balneabilidade e Previsão do Tempo - Fortaleza",
         "info": "Bem-vindo! Explore os endpoints abaixo ou use a documentação interativa para testar a API em tempo real.",
         "documentacao_interativa": {
@@ -138,6 +471,12 @@ def home():
                 "parametros": "?data=YYYY-MM-DD (obrigatório) &hora=HH:MM (opcional)",
                 "exemplo": "/praias/5/data?data=2025-09-13&hora=14:00"
             },
+            "/praias/<id>/previsao": {
+                "descricao": "Previsão hora a hora de uma praia em uma data (dia inteiro ou um intervalo de horas).",
+                "metodo": "GET",
+                "parametros": "?data=YYYY-MM-DD (obrigatório) &inicio=HH:MM&fim=HH:MM&passo=minutos (opcionais)",
+                "exemplo": "/praias/5/previsao?data=2025-09-13&inicio=08:00&fim=18:00&passo=30"
+            },
             "/praias/status/<status>": {
                 "descricao": "Filtra praias pelo status ('propria' ou 'impropria').",
                 "metodo": "GET",
@@ -151,10 +490,234 @@ def home():
                 "parametros_opcionais": "?data=YYYY-MM-DD&hora=HH:MM",
                 "exemplo_simples": "/praias/zona/Leste",
                 "exemplo_com_previsao": "/praias/zona/Leste?data=2025-09-13&hora=09:00"
+            },
+            "/praias/<id>/historico": {
+                "descricao": "Status diário de uma praia em todos os boletins importados.",
+                "metodo": "GET",
+                "parametros_opcionais": "?inicio=YYYY-MM-DD&fim=YYYY-MM-DD",
+                "exemplo": "/praias/5/historico?inicio=2025-01-01&fim=2025-09-30"
+            },
+            "/historico/zonas": {
+                "descricao": "Taxa de impropriedade por zona em um intervalo de datas.",
+                "metodo": "GET",
+                "parametros_opcionais": "?inicio=YYYY-MM-DD&fim=YYYY-MM-DD&zona=Leste|Centro|Oeste",
+                "exemplo": "/historico/zonas?inicio=2025-01-01&fim=2025-09-30"
+            },
+            "/praias/filtro": {
+                "descricao": "Combina os filtros de status, zona e data em uma única consulta.",
+                "metodo": "GET",
+                "parametros_opcionais": "?status=propria|impropria&zona=Leste|Centro|Oeste&data=YYYY-MM-DD&hora=HH:MM",
+                "exemplo": "/praias/filtro?status=propria&zona=Leste&data=2025-09-13"
+            },
+            "/praias/proximas": {
+                "descricao": "Praias mais próximas de uma coordenada (distância em km), com filtro opcional de status e previsão.",
+                "metodo": "GET",
+                "parametros": "?lat=...&lon=... (obrigatórios) &raio_km=...&k=5&status=propria|impropria&data=YYYY-MM-DD&hora=HH:MM (opcionais)",
+                "exemplo": "/praias/proximas?lat=-3.7255&lon=-38.4913&k=3&status=propria&data=2025-09-13"
+            },
+            "/praias/lote": {
+                "descricao": "Boletim e previsões de várias praias (ids ou códigos) em vários dias e horas, em uma única chamada. Resposta em NDJSON, enviada à medida que fica pronta.",
+                "metodo": "POST",
+                "corpo": {"praias": [1, "05L"], "inicio": "YYYY-MM-DD", "fim": "YYYY-MM-DD (opcional)", "horas": ["09:00", "12:00"]},
+                "exemplo": "curl -X POST /praias/lote -H 'Content-Type: application/json' -d '{\"praias\": [1, \"05L\"], \"inicio\": \"2025-09-13\", \"fim\": \"2025-09-15\", \"horas\": [\"09:00\", \"15:00\"]}'"
+            },
+            "/praias/ranking": {
+                "descricao": "Ranking das melhores praias para banho em uma data e hora, combinando o status da SEMACE com ondas, vento, chuva e nuvens.",
+                "metodo": "GET",
+                "parametros": "?data=YYYY-MM-DD (obrigatório) &hora=HH:MM&k=5&zona=...&incluir_improprias=1&peso_ondas=...&peso_vento=...&peso_chuva=...&peso_nuvens=...&peso_status=... (opcionais)",
+                "exemplo": "/praias/ranking?data=2025-09-13&hora=10:00&k=3&peso_ondas=5"
             }
         }
     }
-    return json_response(data)
+
+# --- Pré-renderização das respostas que só mudam com o boletim ---
+ZONAS = ["Leste", "Centro", "Oeste"]
+def montar_respostas(repositorio):
+    """
+    Serializa uma única vez, na carga do boletim, as respostas de /, /praias, /praias/<id>
+    e de /praias/status/* e /praias/zona/* sem data (mesmo conteúdo gerado pelas rotas).
+    """
+    respostas = RespostasPreRenderizadas()
+    respostas.adicionar("home", resumo_api())
+    respostas.adicionar("praias", [{"id": p["id"], "nome": p["Nome"], "zona": p["Zona"]} for p in repositorio.registros])
+    for praia in repositorio.registros:
+        respostas.adicionar(("praia", praia["id"]), praia)
+    for status_filtrado in STATUS_MAP.values():
+        resultado = repositorio.consultar(status=status_filtrado)
+        if resultado:
+            respostas.adicionar(("status", status_filtrado), lista_sem_previsao(resultado))
+        else:
+            respostas.adicionar(("status", status_filtrado), {"message": f"Nenhuma praia encontrada com status {status_filtrado}"}, status=404)
+    for zona_filtrada in set(ZONAS) | set(repositorio.ids_por_zona):
+        resultado = repositorio.consultar(zona=zona_filtrada)
+        if resultado:
+            respostas.adicionar(("zona", zona_filtrada), lista_sem_previsao(resultado))
+        else:
+            respostas.adicionar(("zona", zona_filtrada), {"message": f"Nenhuma praia encontrada na zona {zona_filtrada}"}, status=404)
+    return respostas
+
+# --- Dados do boletim em memória ---
+class DadosBoletim:
+    """
+    Registros do boletim com seus índices e respostas pré-renderizadas. Tudo é montado
+    antes de entrar em uso e trocado de uma vez, então uma requisição nunca mistura
+    dados de boletins diferentes.
+    """
+
+    def __init__(self, praias, dias_por_id=None):
+        self.praias = praias
+        #índices por id, status, zona e data montados uma única vez
+        self.repositorio = RepositorioPraias(praias, dias_por_id)
+        #índice espacial (grade) das praias com coordenadas, para a busca das mais próximas
+        self.indice = IndiceEspacial({p["id"]: coordenadas_da_praia(p) for p in praias if coordenadas_da_praia(p)})
+        #código da praia (ex.: "05L") -> id, para as consultas que aceitam códigos
+        self.id_por_codigo = {extrair_codigo(p): p["id"] for p in praias}
+        self.respostas = montar_respostas(self.repositorio)
+        self.gerado_em = None  # quando o scraper gravou o arquivo carregado (timestamp)
+
+# --- Carregar os dados gerados pelo scraper ---
+def carregar_dados(caminho=None):
+    caminho = caminho or CSV_FILE
+    with medir(BOLETIM_CARGA):
+        dados = _ler_dados(caminho)
+    dados.gerado_em = os.path.getmtime(caminho)
+    return dados
+
+def _ler_dados(caminho):
+    #o snapshot binário gravado pelo scraper já traz os registros prontos; o CSV fica como reserva
+    snapshot = caminho_snapshot(caminho)
+    if os.path.exists(snapshot):
+        try:
+            return DadosBoletim(*carregar_snapshot(snapshot, caminho))
+        except (SnapshotIncompativel, OSError, pickle.UnpicklingError) as erro:
+            print(f"Snapshot ignorado, lendo o CSV: {erro}")
+    #leitura com o módulo csv: os workers da API não precisam carregar o pandas
+    return DadosBoletim(carregar_csv(caminho))
+
+# --- Troca atômica dos dados (usada pela atualização em segundo plano) ---
+def recarregar_dados(caminho=None):
+    global DADOS
+    novos = carregar_dados(caminho)
+    #uma única atribuição: requisições em andamento continuam com o objeto antigo
+    DADOS = novos
+    print(f"Boletim recarregado: {len(novos.praias)} praias.")
+
+#na inicialização, usa o último boletim salvo; o scraper só roda antes se ainda não houver nenhum
+if not os.path.exists(CSV_FILE):
+    executar_scraper()
+try:
+    DADOS = carregar_dados()
+except FileNotFoundError:
+    raise FileNotFoundError(f"O arquivo {CSV_FILE} não foi encontrado. Execute o scraper primeiro.")
+#com gunicorn --preload, os dados carregados aqui são compartilhados pelos workers (cópia na escrita);
+#congelar o GC evita que a coleta toque nesses objetos e force a cópia das páginas em cada worker
+gc.freeze()
+
+#medidores lidos na hora da exposição em /metrics
+REGISTRO.medidor("api_boletim_idade_segundos", "Tempo desde que o boletim carregado foi gravado pelo scraper.", lambda: time.time() - DADOS.gerado_em)
+REGISTRO.medidor("api_boletim_praias", "Praias no boletim carregado.", lambda: len(DADOS.praias))
+REGISTRO.medidor("api_cache_previsao_acertos_total", "Consultas ao cache de previsões respondidas pelo cache.", lambda: CACHE_PREVISAO.acertos, tipo="counter")
+REGISTRO.medidor("api_cache_previsao_falhas_total", "Consultas ao cache de previsões que precisaram buscar na Open-Meteo.", lambda: CACHE_PREVISAO.falhas, tipo="counter")
+REGISTRO.medidor("api_cache_previsao_entradas", "Entradas no cache de previsões.", lambda: len(CACHE_PREVISAO))
+REGISTRO.medidor("api_cache_previsao_disco_acertos_total", "Faltas na memória respondidas pelo cache em disco.", lambda: CACHE_PREVISAO.acertos_disco, tipo="counter")
+REGISTRO.medidor("api_cache_previsao_disco_bytes", "Bytes de séries guardados no cache em disco.", lambda: CACHE_PREVISAO.persistente.tamanho_bytes() if CACHE_PREVISAO.persistente else None)
+
+#histórico de boletins (consultas por ponto e por zona ao longo do tempo)
+HISTORICO = HistoricoBoletins(HISTORICO_DB)
+
+# --- Validação de datas (YYYY-MM-DD) ---
+def data_valida(valor):
+    try:
+        datetime.strptime(valor, "%Y-%m-%d")
+        return True
+    except (TypeError, ValueError):
+        return False
+
+# --- Validação de horas (HH:MM) ---
+def hora_valida(valor):
+    try:
+        datetime.strptime(valor, "%H:%M")
+        return True
+    except (TypeError, ValueError):
+        return False
+
+# --- Período de consulta do histórico (padrão: últimos 365 dias) ---
+def periodo_consulta():
+    fim = request.args.get("fim") or datetime.today().strftime("%Y-%m-%d")
+    inicio = request.args.get("inicio")
+    if not inicio and data_valida(fim):
+        inicio = (datetime.strptime(fim, "%Y-%m-%d") - timedelta(days=365)).strftime("%Y-%m-%d")
+    return inicio, fim
+
+# --- Atualização do boletim em segundo plano ---
+atualizador = None
+def iniciar_atualizador():
+    #com gunicorn --preload, chame esta função no hook post_fork: a thread iniciada na importação
+    #ficou no processo mestre (threads não sobrevivem ao fork), então cada worker inicia a sua,
+    #que recarrega o DADOS do próprio worker
+    global atualizador
+    if ATUALIZACAO_BOLETIM_S > 0 and (atualizador is None or not atualizador.ativo()):
+        atualizador = AtualizadorBoletim(CSV_FILE, executar_scraper, recarregar_dados, ATUALIZACAO_BOLETIM_S).iniciar()
+    return atualizador
+
+iniciar_atualizador()
+
+#os pontos monitorados são fixos (coordenadas.py), então a pré-busca não depende do boletim carregado.
+#as séries vão também para o CACHE_PREVISAO (e o disco); com o cache em disco, a trava faz os
+#workers buscarem um de cada vez, e quem chega depois lê do disco o que o primeiro buscou
+PREFETCH_PREVISOES = PrefetchPrevisoes(
+    GRADE_PREVISAO.representantes(),
+    buscar_series_lote, PREVISAO_PREFETCH_S, dias=PREVISAO_PREFETCH_DIAS, lote=PREVISAO_LOTE_MAX,
+    cache=CACHE_PREVISAO, trava=TravaArquivo(PREVISAO_CACHE_DB + ".prefetch.lock") if PREVISAO_CACHE_DB else None,
+)
+def iniciar_prefetch():
+    #assim como o atualizador, com gunicorn --preload deve ser chamada no hook post_fork
+    #(a thread herdada do processo mestre não roda no worker e é iniciada de novo)
+    if PREVISAO_PREFETCH_S > 0:
+        PREFETCH_PREVISOES.iniciar()
+    return PREFETCH_PREVISOES
+
+iniciar_prefetch()
+
+# --- Instrumentação das requisições ---
+#o perfil de cada requisição acumula o tempo das etapas (get_forecast, chamadas externas, ...)
+@app.before_request
+def iniciar_medicao():
+    metricas.iniciar_perfil()
+
+@app.after_request
+def encerrar_medicao(response):
+    perfil = metricas.perfil_atual()
+    if perfil is not None:
+        rota = request.url_rule.rule if request.url_rule else "<sem rota>"
+        observar_requisicao(perfil, rota, request.method, response.status_code)
+        #perfil opt-in: com o cabeçalho X-Perfil: 1 a resposta traz o tempo de cada etapa
+        if parametro_ligado(request.headers.get("X-Perfil")):
+            response.headers["Server-Timing"] = perfil.server_timing()
+        metricas.encerrar_perfil()
+    return response
+
+#usadas também pelo modo ASGI (asgi.py)
+def observar_requisicao(perfil, rota, metodo, status):
+    REQUISICAO_DURACAO.observar(time.perf_counter() - perfil.inicio, rota=rota, metodo=metodo, status=status)
+    REQUISICAO_UPSTREAM.observar(perfil.vezes("upstream_"), rota=rota)
+
+# --- Rotas ---
+
+#rota raiz
+@app.route('/') #a função home será executada quando a raíz for chamada
+def home():
+    """
+    Endpoint Raiz da API
+    Retorna uma mensagem de boas-vindas e um resumo de todos os endpoints disponíveis.
+    ---
+    tags:
+      - Geral
+    responses:
+      200:
+        description: Mensagem de boas-vindas e estrutura da API.
+    """
+    return resposta_pronta(DADOS.respostas.obter("home", quer_compacto()))
 
 #rota para listar todas as praias
 @app.route("/praias")
@@ -169,8 +732,7 @@ def listar_praias():
       200:
         description: Lista de praias resumida.
     """
-    praias_resumo = [{"id": p["id"], "nome": p["Nome"], "zona": p["Zona"]} for p in praias]
-    return json_response(praias_resumo)
+    return resposta_pronta(DADOS.respostas.obter("praias", quer_compacto()))
 
 #buscar praia pelo id
 @app.route("/praias/<int:id>")
@@ -193,10 +755,28 @@ def buscar_praia_por_id(id):
       404:
         description: Praia não encontrada para o ID fornecido.
     """
-    praia = next((p for p in praias if p["id"] == id), None)
-    if not praia:
+    pronta = DADOS.respostas.obter(("praia", id), quer_compacto())
+    if pronta is None:
         return json_response({"message": f"Nenhuma praia encontrada com id {id}"}, status=404)
-    return json_response(praia)
+    return resposta_pronta(pronta)
+
+# --- Validação de /praias/<id>/data (compartilhada com o modo ASGI, asgi.py) ---
+class ConsultaInvalida(ValueError):
+    def __init__(self, mensagem, status):
+        super().__init__(mensagem)
+        self.status = status
+
+def praia_para_previsao(dados, id, data):
+    #retorna (praia, (lat, lon)) ou levanta ConsultaInvalida com a mensagem e o status HTTP
+    if not data:
+        raise ConsultaInvalida("É necessário informar a data no formato YYYY-MM-DD", 400)
+    praia = dados.repositorio.buscar(id)
+    if not praia:
+        raise ConsultaInvalida(f"Nenhuma praia encontrada com id {id}", 404)
+    coords = coordenadas_da_praia(praia)
+    if coords is None:
+        raise ConsultaInvalida("Coordenadas da praia não disponíveis", 500)
+    return praia, coords
 
 #buscar informações das praias pelo id e data
 @app.route("/praias/<int:id>/data")
@@ -234,22 +814,177 @@ def buscar_praia_por_id_e_data(id):
     #query params: ?data=YYYY-MM-DD&hora=HH:MM 
     data = request.args.get("data")
     hora = request.args.get("hora", "12:00")
-    if not data:
-        return json_response({"message": "É necessário informar a data no formato YYYY-MM-DD"}, status=400)
-    praia = next((p for p in praias if p["id"] == id), None)
+    dados = DADOS
+    try:
+        praia, (lat, lon) = praia_para_previsao(dados, id, data)
+    except ConsultaInvalida as erro:
+        return json_response({"message": str(erro)}, status=erro.status)
+    forecast = get_forecast(lat, lon, data, hora)
+    boletim_disponivel = dados.repositorio.tem_boletim(id, data)
+    boletim = praia if boletim_disponivel else boletim_do_historico(praia, data)
+    resposta = {"boletim": boletim, "previsao": forecast}
+    return json_response(resposta)
+
+#previsão hora a hora de uma praia, a partir de uma única busca das séries do dia
+@app.route("/praias/<int:id>/previsao")
+def previsao_praia(id):
+    """
+    Previsão hora a hora de uma praia
+    Retorna a previsão do tempo e do mar para uma praia ao longo de um dia inteiro, ou de um intervalo de horas, a partir das séries horárias da Open-Meteo. Horários entre horas cheias são interpolados.
+    ---
+    tags:
+      - Previsão
+    parameters:
+      - name: id
+        in: path
+        type: integer
+        required: true
+        description: O ID numérico da praia.
+      - name: data
+        in: query
+        type: string
+        required: true
+        description: Data da previsão (formato YYYY-MM-DD).
+      - name: inicio
+        in: query
+        type: string
+        required: false
+        description: Hora inicial (formato HH:MM, padrão 00:00).
+      - name: fim
+        in: query
+        type: string
+        required: false
+        description: Hora final (formato HH:MM, padrão 23:00).
+      - name: passo
+        in: query
+        type: integer
+        required: false
+        description: Intervalo entre os horários, em minutos (padrão 60, mínimo 15).
+    responses:
+      200:
+        description: Previsões da praia para cada horário do intervalo.
+      400:
+        description: Data, horas ou passo inválidos.
+      404:
+        description: Praia não encontrada para o ID fornecido.
+    """
+    data = request.args.get("data")
+    inicio = request.args.get("inicio", "00:00")
+    fim = request.args.get("fim", "23:00")
+    try:
+        minuto_inicio = minuto_epoch(f"{data}T{inicio}")
+        minuto_fim = minuto_epoch(f"{data}T{fim}")
+        passo = int(request.args.get("passo", 60))
+    except (TypeError, ValueError):
+        return json_response({"message": "Informe ?data=YYYY-MM-DD e, se quiser, inicio/fim no formato HH:MM e passo em minutos."}, status=400)
+    if passo < 15 or minuto_fim < minuto_inicio:
+        return json_response({"message": "O passo deve ser de pelo menos 15 minutos e o fim não pode ser antes do início."}, status=400)
+    praia = DADOS.repositorio.buscar(id)
     if not praia:
         return json_response({"message": f"Nenhuma praia encontrada com id {id}"}, status=404)
-    codigo = extrair_codigo(praia)
-    if not codigo or codigo not in COORDENADAS_POR_CODIGO:
+    coords = coordenadas_da_praia(praia)
+    if coords is None:
         return json_response({"message": "Coordenadas da praia não disponíveis"}, status=500)
-    lat_str, lon_str = COORDENADAS_POR_CODIGO[codigo].split(", ")
-    lat, lon = float(lat_str), float(lon_str)
-    forecast = get_forecast(lat, lon, data, hora)
-    boletim_disponivel = data in str(praia["Dias_Periodo"]).split(", ")
-    boletim = praia if boletim_disponivel else f"Não há boletim da Semace disponível para {data}"
-    resposta = {"boletim": boletim, "previsao": forecast}
+    series = obter_series(coords[0], coords[1], data)
+    previsoes = [
+        {"hora": instante_do_minuto(minuto)[11:], **valores_no_instante(series, minuto)}
+        for minuto in range(minuto_inicio, minuto_fim + 1, passo)
+    ]
+    resposta = {"id": id, "nome": praia["Nome"], "data": data, "inicio": inicio, "fim": fim, "passo_min": passo, "previsoes": previsoes}
+    if all(valor is None for item in previsoes for campo, valor in item.items() if campo != "hora"):
+        motivo = "Open-Meteo fora do ar no momento" if open_meteo_fora_do_ar() else f"sem dados para {data}"
+        resposta = {"id": id, "nome": praia["Nome"], "data": data, "mensagem": f"Previsão indisponível: {motivo}"}
     return json_response(resposta)
 
+# --- Boletim de datas fora do período atual, buscado no histórico ---
+#`registros`: {(codigo, data): registro} já lidos com HISTORICO.status_no_periodo (consulta em lote)
+def boletim_do_historico(praia, data, registros=None):
+    codigo = codigo_do_nome(praia["Nome"])
+    registro = HISTORICO.status_em(codigo, data) if registros is None else registros.get((codigo, data))
+    if registro is None:
+        return f"Não há boletim da Semace disponível para {data}"
+    return {"Nome": registro["nome"], "Status": registro["status"], "Zona": registro["zona"], "Numero_Boletim": registro["numero_boletim"], "data": data, "fonte": "historico"}
+
+#histórico de status de uma praia em um intervalo de datas
+@app.route("/praias/<int:id>/historico")
+def historico_praia(id):
+    """
+    Histórico de balneabilidade de uma praia
+    Retorna o status diário de uma praia em todos os boletins importados, dentro de um intervalo de datas.
+    ---
+    tags:
+      - Histórico
+    parameters:
+      - name: id
+        in: path
+        type: integer
+        required: true
+        description: O ID numérico da praia.
+      - name: inicio
+        in: query
+        type: string
+        required: false
+        description: Data inicial (formato YYYY-MM-DD, padrão 365 dias antes do fim).
+      - name: fim
+        in: query
+        type: string
+        required: false
+        description: Data final (formato YYYY-MM-DD, padrão hoje).
+    responses:
+      200:
+        description: Status diário da praia no intervalo.
+      400:
+        description: Datas em formato inválido.
+      404:
+        description: Praia não encontrada para o ID fornecido.
+    """
+    inicio, fim = periodo_consulta()
+    if not (data_valida(inicio) and data_valida(fim)):
+        return json_response({"message": "Datas inválidas. Use o formato YYYY-MM-DD."}, status=400)
+    praia = DADOS.repositorio.buscar(id)
+    if not praia:
+        return json_response({"message": f"Nenhuma praia encontrada com id {id}"}, status=404)
+    codigo = codigo_do_nome(praia["Nome"])
+    return json_response({"id": id, "codigo": codigo, "nome": praia["Nome"], "inicio": inicio, "fim": fim, "historico": HISTORICO.historico_ponto(codigo, inicio, fim)})
+
+#taxa de impropriedade por zona em um intervalo de datas
+@app.route("/historico/zonas")
+def historico_zonas():
+    """
+    Taxa de impropriedade por zona
+    Retorna, para cada zona, quantos registros diários existem no intervalo e a fração deles com status impróprio.
+    ---
+    tags:
+      - Histórico
+    parameters:
+      - name: inicio
+        in: query
+        type: string
+        required: false
+        description: Data inicial (formato YYYY-MM-DD, padrão 365 dias antes do fim).
+      - name: fim
+        in: query
+        type: string
+        required: false
+        description: Data final (formato YYYY-MM-DD, padrão hoje).
+      - name: zona
+        in: query
+        type: string
+        required: false
+        description: Limita o resultado a uma zona.
+        enum: [Leste, Centro, Oeste]
+    responses:
+      200:
+        description: Taxa de impropriedade por zona.
+      400:
+        description: Datas em formato inválido.
+    """
+    inicio, fim = periodo_consulta()
+    if not (data_valida(inicio) and data_valida(fim)):
+        return json_response({"message": "Datas inválidas. Use o formato YYYY-MM-DD."}, status=400)
+    zona = request.args.get("zona")
+    return json_response({"inicio": inicio, "fim": fim, "zonas": HISTORICO.impropriedade_por_zona(inicio, fim, zona.capitalize() if zona else None)})
+
 #buscar praia por status com data opcional e previsão meteorológica
 @app.route("/praias/status/<status>")
 def filtrar_por_status(status):
@@ -291,29 +1026,13 @@ def filtrar_por_status(status):
     """
     data = request.args.get("data")
     hora = request.args.get("hora", "12:00")
-    status_map = {"propria": "Própria para banho", "impropria": "Imprópria para banho"}
-    status_filtrado = status_map.get(status.lower())
+    status_filtrado = STATUS_MAP.get(status.lower())
     if not status_filtrado:
         return json_response({"message": "Status inválido. Use 'propria' ou 'impropria'."}, status=400)
-    resultado = [p for p in praias if p["Status"] == status_filtrado]
-    if data:
-        resultado = [p for p in resultado if data in str(p["Dias_Periodo"]).split(", ")]
-    if not resultado and not data:
-        return json_response({"message": f"Nenhuma praia encontrada com status {status_filtrado}"}, status=404)
-    resposta = []
-    for praia in resultado:
-        if not data:
-            resposta.append({"praia": praia, "info": "Para obter previsão, informe ?data=YYYY-MM-DD."})
-            continue
-        codigo = extrair_codigo(praia)
-        if codigo and codigo in COORDENADAS_POR_CODIGO:
-            lat_str, lon_str = COORDENADAS_POR_CODIGO[codigo].split(", ")
-            lat, lon = float(lat_str), float(lon_str)
-            forecast = get_forecast(lat, lon, data, hora)
-        else:
-            forecast = {"mensagem": "Coordenadas não disponíveis"}
-        resposta.append({"praia": praia, "previsao": forecast})
-    return json_response(resposta)
+    if not data:
+        return resposta_pronta(DADOS.respostas.obter(("status", status_filtrado), quer_compacto()))
+    resultado = DADOS.repositorio.consultar(status=status_filtrado, data=data)
+    return resposta_com_previsoes(resultado, data, hora)
 
 #buscar praias por zona geográfica e data opcional com previsão meteorológica
 @app.route("/praias/zona/<zona>")
@@ -355,25 +1074,378 @@ def filtrar_por_zona(zona):
     data = request.args.get("data")
     hora = request.args.get("hora", "12:00")
     zona_filtrada = zona.capitalize()
-    resultado = [p for p in praias if p["Zona"] == zona_filtrada]
-    if data:
-        resultado = [p for p in resultado if data in str(p["Dias_Periodo"]).split(", ")]
+    dados = DADOS
+    if not data:
+        #só as zonas do boletim (e as três de Fortaleza) têm resposta pronta; as demais não têm praias
+        pronta = dados.respostas.obter(("zona", zona_filtrada), quer_compacto())
+        if pronta is None:
+            return json_response({"message": f"Nenhuma praia encontrada na zona {zona_filtrada}"}, status=404)
+        return resposta_pronta(pronta)
+    resultado = dados.repositorio.consultar(zona=zona_filtrada, data=data)
+    return resposta_com_previsoes(resultado, data, hora)
+
+#buscar praias combinando status, zona e data em uma única consulta
+@app.route("/praias/filtro")
+def filtrar_combinado():
+    """
+    Filtro combinado (status, zona e data)
+    Retorna as praias que atendem a todos os filtros informados. Todos são opcionais; se uma data (?data=...) for fornecida, apenas praias com boletim nessa data são retornadas e a previsão do tempo é incluída.
+    ---
+    tags:
+      - Filtros
+    parameters:
+      - name: status
+        in: query
+        type: string
+        required: false
+        description: O status de balneabilidade para filtrar.
+        enum: [propria, impropria]
+      - name: zona
+        in: query
+        type: string
+        required: false
+        description: A zona geográfica para filtrar.
+        enum: [Leste, Centro, Oeste]
+      - name: data
+        in: query
+        type: string
+        required: false
+        description: Data do boletim e da previsão (formato YYYY-MM-DD).
+      - name: hora
+        in: query
+        type: string
+        required: false
+        description: Hora para refinar a previsão (formato HH:MM).
+    responses:
+      200:
+        description: Lista de praias que atendem aos filtros.
+      400:
+        description: Status inválido.
+      404:
+        description: Nenhuma praia encontrada para os critérios.
+    """
+    status = request.args.get("status")
+    zona = request.args.get("zona")
+    data = request.args.get("data")
+    hora = request.args.get("hora", "12:00")
+    status_filtrado = None
+    if status:
+        status_filtrado = STATUS_MAP.get(status.lower())
+        if not status_filtrado:
+            return json_response({"message": "Status inválido. Use 'propria' ou 'impropria'."}, status=400)
+    zona_filtrada = zona.capitalize() if zona else None
+    resultado = DADOS.repositorio.consultar(status=status_filtrado, zona=zona_filtrada, data=data or None)
     if not resultado and not data:
-        return json_response({"message": f"Nenhuma praia encontrada na zona {zona_filtrada}"}, status=404)
-    resposta = []
-    for praia in resultado:
-        if not data:
-            resposta.append({"praia": praia, "info": "Para obter previsão, informe ?data=YYYY-MM-DD."})
-            continue
-        codigo = extrair_codigo(praia)
-        if codigo and codigo in COORDENADAS_POR_CODIGO:
-            lat_str, lon_str = COORDENADAS_POR_CODIGO[codigo].split(", ")
-            lat, lon = float(lat_str), float(lon_str)
-            forecast = get_forecast(lat, lon, data, hora)
+        return json_response({"message": "Nenhuma praia encontrada para os filtros informados"}, status=404)
+    return resposta_com_previsoes(resultado, data, hora)
+
+#praias mais próximas de uma coordenada, pelo índice espacial
+@app.route("/praias/proximas")
+def praias_proximas():
+    """
+    Praias mais próximas de uma localização
+    Retorna as k praias mais próximas da coordenada informada, ordenadas pela distância (haversine, em km). Opcionalmente filtra pelo status e por um raio máximo; com ?data=..., só entram praias com boletim nessa data e a previsão do tempo é incluída.
+    ---
+    tags:
+      - Filtros
+    parameters:
+      - name: lat
+        in: query
+        type: number
+        required: true
+        description: Latitude em graus decimais.
+      - name: lon
+        in: query
+        type: number
+        required: true
+        description: Longitude em graus decimais.
+      - name: raio_km
+        in: query
+        type: number
+        required: false
+        description: Distância máxima em km (sem limite se omitido).
+      - name: k
+        in: query
+        type: integer
+        required: false
+        description: Quantas praias retornar (padrão 5).
+      - name: status
+        in: query
+        type: string
+        required: false
+        description: O status de balneabilidade para filtrar.
+        enum: [propria, impropria]
+      - name: data
+        in: query
+        type: string
+        required: false
+        description: Data do boletim e da previsão (formato YYYY-MM-DD).
+      - name: hora
+        in: query
+        type: string
+        required: false
+        description: Hora para refinar a previsão (formato HH:MM).
+    responses:
+      200:
+        description: Praias ordenadas da mais próxima para a mais distante.
+      400:
+        description: Coordenadas, raio, k ou status inválidos.
+    """
+    try:
+        lat = float(request.args.get("lat"))
+        lon = float(request.args.get("lon"))
+        raio_km = float(request.args["raio_km"]) if request.args.get("raio_km") else None
+        k = int(request.args.get("k", 5))
+    except (TypeError, ValueError):
+        return json_response({"message": "Informe ?lat=...&lon=... em graus decimais; raio_km e k devem ser números."}, status=400)
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180) or k < 1 or (raio_km is not None and raio_km <= 0):
+        return json_response({"message": "Coordenadas fora do intervalo válido, ou raio_km/k não positivos."}, status=400)
+    status = request.args.get("status")
+    status_filtrado = None
+    if status:
+        status_filtrado = STATUS_MAP.get(status.lower())
+        if not status_filtrado:
+            return json_response({"message": "Status inválido. Use 'propria' ou 'impropria'."}, status=400)
+    data = request.args.get("data")
+    hora = request.args.get("hora", "12:00")
+
+    dados = DADOS
+    permitidos = None
+    if status_filtrado or data:
+        permitidos = {praia["id"] for praia in dados.repositorio.consultar(status=status_filtrado, data=data or None)}
+    proximas = dados.indice.proximos(lat, lon, k=k, raio_km=raio_km, filtro=permitidos.__contains__ if permitidos is not None else None)
+    praias = [dados.repositorio.buscar(id_praia) for id_praia, _ in proximas]
+    if not data:
+        return json_response([{"praia": praia, "distancia_km": round(distancia, 3)} for praia, (_, distancia) in zip(praias, proximas)])
+    previsoes, parcial = buscar_previsoes(praias, data, hora)
+    resposta = json_response([
+        {"praia": praia, "distancia_km": round(distancia, 3), "previsao": forecast}
+        for praia, (_, distancia), forecast in zip(praias, proximas, previsoes)
+    ])
+    resposta.headers["X-Previsao-Parcial"] = "true" if parcial else "false"
+    return resposta
+
+#melhores praias para banho em uma data/hora, com a pontuação detalhada por fator
+@app.route("/praias/ranking")
+def ranking_praias():
+    """
+    Ranking das melhores praias para banho
+    Pontua as praias com boletim na data informada combinando o status da SEMACE com a previsão (altura das ondas, vento, chuva e nuvens) e retorna as k melhores, com a nota e o peso de cada fator. Por padrão só entram praias próprias para banho.
+    ---
+    tags:
+      - Filtros
+    parameters:
+      - name: data
+        in: query
+        type: string
+        required: true
+        description: Data do boletim e da previsão (formato YYYY-MM-DD).
+      - name: hora
+        in: query
+        type: string
+        required: false
+        description: Hora da previsão (formato HH:MM, padrão 12:00).
+      - name: k
+        in: query
+        type: integer
+        required: false
+        description: Quantas praias retornar (padrão 5).
+      - name: zona
+        in: query
+        type: string
+        required: false
+        description: Restringe o ranking a uma zona.
+        enum: [Leste, Centro, Oeste]
+      - name: incluir_improprias
+        in: query
+        type: boolean
+        required: false
+        description: Inclui as praias impróprias (com nota zero no fator status).
+      - name: peso_ondas
+        in: query
+        type: number
+        required: false
+        description: Peso da altura das ondas (padrão 3). Também existem peso_vento (2), peso_chuva (3), peso_nuvens (1) e peso_status (1).
+    responses:
+      200:
+        description: Ranking das praias, da maior para a menor pontuação.
+      400:
+        description: Data, hora, k ou pesos inválidos.
+    """
+    #importado só aqui: o NumPy não pesa a inicialização dos workers que nunca recebem esta rota
+    from ranking import STATUS_PROPRIA, pesos_da_consulta, ranquear
+    data = request.args.get("data")
+    hora = request.args.get("hora", "12:00")
+    zona = request.args.get("zona")
+    if not data_valida(data):
+        return json_response({"message": "É necessário informar a data no formato YYYY-MM-DD"}, status=400)
+    if not hora_valida(hora):
+        return json_response({"message": f"Hora inválida: {hora!r} (formato HH:MM)"}, status=400)
+    try:
+        k = int(request.args.get("k", 5))
+        pesos = pesos_da_consulta(request.args)
+    except ValueError as erro:
+        return json_response({"message": f"Parâmetros inválidos: {erro}"}, status=400)
+    if k < 1:
+        return json_response({"message": "k deve ser maior que zero"}, status=400)
+    status = None if parametro_ligado(request.args.get("incluir_improprias")) else STATUS_PROPRIA
+    praias = DADOS.repositorio.consultar(status=status, zona=zona.capitalize() if zona else None, data=data)
+    previsoes, parcial = buscar_previsoes(praias, data, hora)
+    resposta = json_response({"data": data, "hora": hora, "pesos": pesos, "avaliadas": len(praias), "ranking": ranquear(praias, previsoes, pesos, k)})
+    resposta.headers["X-Previsao-Parcial"] = "true" if parcial else "false"
+    return resposta
+
+#métricas no formato de texto do Prometheus
+@app.route("/metrics")
+def metrics():
+    """
+    Métricas da API (Prometheus)
+    Latência por rota e por serviço externo (histogramas), erros e respostas diferentes de 200 dos serviços externos, acertos do cache e da pré-busca de previsões e idade do boletim carregado, no formato de texto do Prometheus. Os valores são do processo (worker) que atendeu a requisição.
+    ---
+    tags:
+      - Monitoramento
+    produces:
+      - text/plain
+    responses:
+      200:
+        description: Métricas no formato de exposição do Prometheus.
+    """
+    return Response(REGISTRO.exposicao(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+# --- Consulta em lote: limites e validação do corpo ---
+#a Open-Meteo prevê no máximo 16 dias; o total de linhas (praias x dias) também é limitado
+LOTE_MAX_DIAS = 16
+LOTE_MAX_LINHAS = int(os.environ.get("LOTE_MAX_LINHAS", 5000))
+LOTE_MAX_HORAS = 96
+
+def consulta_em_lote_valida(corpo, dados):
+    """
+    Valida o corpo de POST /praias/lote e retorna (ids, nao_encontradas, dias, horas), com
+    ids sem repetição (um id e o código da mesma praia contam uma vez). ValueError se inválido.
+    """
+    if not isinstance(corpo, dict) or not isinstance(corpo.get("praias"), list) or not corpo["praias"]:
+        raise ValueError("Informe 'praias': uma lista de ids ou códigos (ex.: [5, \"05L\"])")
+    inicio = corpo.get("inicio")
+    fim = corpo.get("fim") or inicio
+    if not data_valida(inicio) or not data_valida(fim) or fim < inicio:
+        raise ValueError("Informe 'inicio' (e, se quiser, 'fim') no formato YYYY-MM-DD, com o fim depois do início")
+    primeiro = datetime.strptime(inicio, "%Y-%m-%d")
+    total_dias = (datetime.strptime(fim, "%Y-%m-%d") - primeiro).days + 1
+    if total_dias > LOTE_MAX_DIAS:
+        raise ValueError(f"O período pode ter no máximo {LOTE_MAX_DIAS} dias")
+    dias = [(primeiro + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(total_dias)]
+    horas = corpo.get("horas") or ["12:00"]
+    if not isinstance(horas, list) or len(horas) > LOTE_MAX_HORAS:
+        raise ValueError(f"'horas' deve ser uma lista de até {LOTE_MAX_HORAS} horários HH:MM")
+    for hora in horas:
+        try:
+            minuto_epoch(f"{inicio}T{hora}")
+        except (TypeError, ValueError):
+            raise ValueError(f"Hora inválida: {hora!r} (formato HH:MM)")
+    ids, nao_encontradas = {}, []
+    for item in corpo["praias"]:
+        id_praia = item if isinstance(item, int) and not isinstance(item, bool) else dados.id_por_codigo.get(str(item).strip().upper())
+        if dados.repositorio.buscar(id_praia) is None:
+            nao_encontradas.append(item)
         else:
-            forecast = {"mensagem": "Coordenadas não disponíveis"}
-        resposta.append({"praia": praia, "previsao": forecast})
-    return json_response(resposta)
+            ids[id_praia] = None
+    if len(ids) * len(dias) > LOTE_MAX_LINHAS:
+        raise ValueError(f"A consulta passa de {LOTE_MAX_LINHAS} linhas (praias x dias)")
+    return list(ids), nao_encontradas, dias, list(dict.fromkeys(horas))
+
+#boletim e previsões de várias praias em vários dias, devolvidos em NDJSON à medida que ficam prontos
+@app.route("/praias/lote", methods=["POST"])
+def consulta_em_lote():
+    """
+    Consulta em lote (várias praias, dias e horas)
+    Substitui várias chamadas a /praias/{id}/data: praias repetidas (por id ou código) e praias que dividem o mesmo ponto de previsão são resolvidas uma única vez, e as previsões que faltam no cache são buscadas em lote, com uma chamada à Open-Meteo cobrindo o período inteiro. A resposta é NDJSON (um objeto JSON por linha), enviada à medida que as previsões ficam prontas; a ordem das linhas segue essa ordem, não a da lista pedida. A última linha é um resumo.
+    ---
+    tags:
+      - Previsão do Tempo
+    consumes:
+      - application/json
+    produces:
+      - application/x-ndjson
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          required: [praias, inicio]
+          properties:
+            praias:
+              type: array
+              description: IDs numéricos ou códigos das praias (por exemplo 5 ou "05L").
+              items: {}
+              example: [1, "05L", 12]
+            inicio:
+              type: string
+              description: Primeiro dia (YYYY-MM-DD).
+              example: "2025-09-13"
+            fim:
+              type: string
+              description: Último dia (YYYY-MM-DD, padrão igual ao início; no máximo 16 dias).
+              example: "2025-09-15"
+            horas:
+              type: array
+              description: Horários das previsões (HH:MM, padrão 12:00).
+              items:
+                type: string
+              example: ["09:00", "12:00", "15:30"]
+    responses:
+      200:
+        description: "Uma linha por praia e dia: {id, nome, data, boletim, previsoes}; praias não encontradas viram {praia, mensagem}; a última linha é {resumo}."
+      400:
+        description: Corpo inválido ou consulta acima dos limites.
+    """
+    dados = DADOS
+    try:
+        ids, nao_encontradas, dias, horas = consulta_em_lote_valida(request.get_json(silent=True), dados)
+    except ValueError as erro:
+        return json_response({"message": str(erro)}, status=400)
+
+    #praias que dividem o ponto de previsão (mesma célula da grade) são resolvidas juntas
+    praias_por_ponto = {}
+    sem_coordenadas = []
+    for id_praia in ids:
+        praia = dados.repositorio.buscar(id_praia)
+        coords = coordenadas_da_praia(praia)
+        if coords is None:
+            sem_coordenadas.append(praia)
+        else:
+            praias_por_ponto.setdefault(GRADE_PREVISAO.ponto(*coords), []).append(praia)
+
+    def linha(objeto):
+        return serializar(objeto, compacto=True) + b"\n"
+
+    #as buscas começam aqui, ainda no contexto da requisição (entram no perfil/Server-Timing)
+    lotes = buscar_series_periodo(list(praias_por_ponto), dias)
+    #dias fora do boletim atual: o histórico do período inteiro vem de uma consulta só
+    fora_do_boletim = [codigo_do_nome(praia["Nome"]) for praias in praias_por_ponto.values() for praia in praias for dia in dias if not dados.repositorio.tem_boletim(praia["id"], dia)]
+    registros_historico = HISTORICO.status_no_periodo(fora_do_boletim, dias[0], dias[-1])
+
+    def gerar():
+        #só usa variáveis já calculadas: o gerador roda depois que a view retorna
+        for item in nao_encontradas:
+            yield linha({"praia": item, "mensagem": "Praia não encontrada"})
+        for praia in sem_coordenadas:
+            for dia in dias:
+                yield linha({"id": praia["id"], "nome": praia["Nome"], "data": dia, "mensagem": "Coordenadas não disponíveis"})
+        linhas = 0
+        parcial = False
+        for lote, atrasado in lotes:
+            parcial = parcial or atrasado
+            for ponto, series_por_dia in lote.items():
+                for praia in praias_por_ponto[ponto]:
+                    for dia in dias:
+                        boletim = praia if dados.repositorio.tem_boletim(praia["id"], dia) else boletim_do_historico(praia, dia, registros_historico)
+                        previsoes = [montar_previsao(series_por_dia[dia], dia, hora) for hora in horas]
+                        yield linha({"id": praia["id"], "nome": praia["Nome"], "data": dia, "boletim": boletim, "previsoes": previsoes})
+                        linhas += 1
+        yield linha({"resumo": {"linhas": linhas, "praias": len(ids), "dias": len(dias), "horas": len(horas), "pontos_de_previsao": len(praias_por_ponto), "nao_encontradas": len(nao_encontradas), "parcial": parcial}})
+
+    return Response(gerar(), mimetype="application/x-ndjson")
 
 if __name__ == "__main__":
     # lat, lon = -3.7227, -38.4793  # Praia do Futuro
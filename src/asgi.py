@@ -0,0 +1,246 @@
+# src/asgi.py
+#
+# Modo assíncrono da API (ASGI). Uso, na raiz do projeto:
+#   uvicorn asgi:app --app-dir src --port 5000
+#
+# A rota de previsão por praia e data (/praias/<id>/data) roda direto no loop de eventos, com as
+# chamadas à Open-Meteo feitas por um cliente HTTP assíncrono: enquanto espera a resposta, a
+# requisição não ocupa nenhuma thread. As demais rotas (inclusive o Swagger em /apidocs) são as
+# mesmas do app.py, executadas pela aplicação Flask em um pool de threads.
+
+import asyncio
+import io
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+import app as api
+import cliente_http
+import metricas
+from cache_previsao import chave_previsao
+from cliente_http_async import ClienteUpstreamAsync
+from respostas import serializar
+
+#threads para as rotas síncronas (Flask) e para o histórico em SQLite
+ASGI_THREADS = int(os.environ.get("ASGI_THREADS", 16))
+_EXECUTOR = ThreadPoolExecutor(max_workers=ASGI_THREADS, thread_name_prefix="asgi-wsgi")
+
+OPEN_METEO_WEATHER = ClienteUpstreamAsync(cliente_http.OPEN_METEO_WEATHER)
+OPEN_METEO_MARINE = ClienteUpstreamAsync(cliente_http.OPEN_METEO_MARINE)
+
+# --- Busca das séries na Open-Meteo sem bloquear o loop ---
+async def _consultar_pontos(cliente, url, total):
+    #timeout, erro de rede ou disjuntor aberto: os pontos ficam sem série (como no app.py)
+    try:
+        response = await cliente.get(url)
+    except Exception:
+        return [{}] * total
+    return api.pontos_da_resposta(response, total)
+
+async def buscar_series_lote(pontos, data, data_fim=None):
+    #mesmas URLs e mesmo formato de retorno de app.buscar_series_lote, com tempo e marinha em paralelo
+    weather_url, marine_url = api.urls_open_meteo(pontos, data, data_fim)
+    weather_lista, marine_lista = await asyncio.gather(
+        _consultar_pontos(OPEN_METEO_WEATHER, weather_url, len(pontos)),
+        _consultar_pontos(OPEN_METEO_MARINE, marine_url, len(pontos)),
+    )
+    return api.series_dos_pontos(weather_lista, marine_lista)
+
+# --- Séries de um ponto: pré-busca, cache ou Open-Meteo (a mesma ordem de app.obter_series) ---
+_EM_ANDAMENTO = {}  # chave -> asyncio.Task (requisições simultâneas para o mesmo ponto esperam a mesma busca)
+
+async def _buscar_e_guardar(chave, lat, lon, data):
+    loop = asyncio.get_running_loop()
+    #o cache em disco (SQLite) é lido e gravado no pool de threads, fora do loop
+    if api.CACHE_PREVISAO.persistente is not None:
+        series = await loop.run_in_executor(_EXECUTOR, api.CACHE_PREVISAO.obter, chave)
+        if series is not None:
+            return series
+    series = (await buscar_series_lote([(lat, lon)], data))[0]
+    if api.series_validas(series):
+        await loop.run_in_executor(_EXECUTOR, api.CACHE_PREVISAO.guardar, chave, series)
+    return series
+
+async def obter_series(lat, lon, data):
+    lat, lon = api.GRADE_PREVISAO.ponto(lat, lon)
+    chave = chave_previsao(lat, lon, data)
+    #pré-busca e cache são os mesmos objetos das rotas síncronas
+    series = api.series_pre_buscadas(chave) or api.CACHE_PREVISAO.obter(chave, disco=False)
+    if series is None:
+        busca = _EM_ANDAMENTO.get(chave)
+        if busca is None:
+            busca = asyncio.ensure_future(_buscar_e_guardar(chave, lat, lon, data))
+            _EM_ANDAMENTO[chave] = busca
+            busca.add_done_callback(lambda _: _EM_ANDAMENTO.pop(chave, None))
+        #shield: se um cliente desistir, a busca continua para quem mais estiver esperando
+        series = await asyncio.shield(busca)
+    return api.series_ou_reserva(chave, series)
+
+# --- Respostas ---
+async def _enviar(send, corpo, status=200, content_type=b"application/json"):
+    await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", content_type), (b"content-length", str(len(corpo)).encode())]})
+    await send({"type": "http.response.body", "body": corpo})
+
+def _consulta(scope):
+    #como o request.args do Flask: o primeiro valor de cada parâmetro, mantendo os vazios
+    return {nome: valores[0] for nome, valores in parse_qs(scope["query_string"].decode("latin-1"), keep_blank_values=True).items()}
+
+# --- /praias/<id>/data assíncrona (mesma validação e mesmo corpo da rota do app.py) ---
+async def buscar_praia_por_id_e_data(id, args, send):
+    compacto = api.compacto_da_consulta(args.get("compacto"))
+    data = args.get("data")
+    hora = args.get("hora", "12:00")
+    dados = api.DADOS
+    try:
+        praia, (lat, lon) = api.praia_para_previsao(dados, id, data)
+    except api.ConsultaInvalida as erro:
+        return await _enviar(send, serializar({"message": str(erro)}, compacto), erro.status)
+    with metricas.medir(api.PREVISAO_DURACAO, "get_forecast"):
+        forecast = api.montar_previsao(await obter_series(lat, lon, data), data, hora or "12:00")
+    if dados.repositorio.tem_boletim(id, data):
+        boletim = praia
+    else:
+        #consulta ao SQLite do histórico: fora do loop para não travar as outras requisições
+        boletim = await asyncio.get_running_loop().run_in_executor(_EXECUTOR, api.boletim_do_historico, praia, data)
+    await _enviar(send, serializar({"boletim": boletim, "previsao": forecast}, compacto))
+
+#rotas atendidas direto no loop de eventos: (método, padrão do caminho, nome da rota no Flask, função)
+ROTAS_ASYNC = [
+    ("GET", re.compile(r"/praias/(\d+)/data"), "/praias/<int:id>/data", lambda rota, args, send: buscar_praia_por_id_e_data(int(rota.group(1)), args, send)),
+]
+
+# --- Métricas e perfil das rotas assíncronas (as do Flask usam os hooks do app.py) ---
+async def _medir_rota(nome, scope, atender, send):
+    #cada requisição roda na sua própria task, então o perfil (contextvar) é só dela
+    perfil = metricas.iniciar_perfil()
+    cabecalhos = dict(scope["headers"])
+    resposta = {"status": 500}
+
+    async def enviar(mensagem):
+        if mensagem["type"] == "http.response.start":
+            resposta["status"] = mensagem["status"]
+            if api.parametro_ligado(cabecalhos.get(b"x-perfil", b"").decode("latin-1") or None):
+                mensagem = {**mensagem, "headers": [*mensagem["headers"], (b"server-timing", perfil.server_timing().encode("latin-1"))]}
+        await send(mensagem)
+
+    try:
+        await atender(enviar)
+    finally:
+        api.observar_requisicao(perfil, nome, scope["method"], resposta["status"])
+        metricas.encerrar_perfil()
+
+# --- Ponte ASGI -> WSGI para as rotas síncronas do Flask ---
+class PonteWSGI:
+    """
+    Executa a aplicação WSGI em um pool de threads e repassa ao loop cada pedaço do corpo
+    assim que o iterável WSGI o produz (as respostas em streaming, como o NDJSON de
+    /praias/lote, continuam saindo aos poucos). Serve para as rotas sem versão assíncrona,
+    que continuam sendo exatamente as do app.py (inclusive o Swagger).
+    """
+
+    def __init__(self, wsgi_app, executor):
+        self.wsgi_app = wsgi_app
+        self.executor = executor
+
+    async def __call__(self, scope, receive, send):
+        corpo = b""
+        while True:
+            mensagem = await receive()
+            corpo += mensagem.get("body", b"")
+            if not mensagem.get("more_body"):
+                break
+        loop = asyncio.get_running_loop()
+        status, headers, iteravel, primeira = await loop.run_in_executor(self.executor, self._iniciar, self._environ(scope, corpo))
+        iterador = iter(iteravel)
+        try:
+            await send({"type": "http.response.start", "status": status, "headers": headers})
+            if primeira:
+                await send({"type": "http.response.body", "body": primeira, "more_body": True})
+            #cada next() roda no pool: o gerador pode bloquear esperando as previsões
+            while (parte := await loop.run_in_executor(self.executor, next, iterador, None)) is not None:
+                if parte:
+                    await send({"type": "http.response.body", "body": parte, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            if hasattr(iteravel, "close"):
+                await loop.run_in_executor(self.executor, iteravel.close)
+
+    @staticmethod
+    def _environ(scope, corpo):
+        servidor = scope.get("server") or ("localhost", 80)
+        environ = {
+            "REQUEST_METHOD": scope["method"],
+            "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+            #PEP 3333: o caminho chega como bytes UTF-8 lidos em latin-1
+            "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+            "QUERY_STRING": scope["query_string"].decode("latin-1"),
+            "SERVER_NAME": servidor[0],
+            "SERVER_PORT": str(servidor[1]),
+            "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+            "REMOTE_ADDR": (scope.get("client") or ("", 0))[0],
+            "CONTENT_LENGTH": str(len(corpo)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", "http"),
+            "wsgi.input": io.BytesIO(corpo),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": True,
+            "wsgi.run_once": False,
+        }
+        for nome, valor in scope["headers"]:
+            nome = nome.decode("latin-1").upper().replace("-", "_")
+            valor = valor.decode("latin-1")
+            if nome == "CONTENT_TYPE":
+                environ["CONTENT_TYPE"] = valor
+            elif nome != "CONTENT_LENGTH":
+                chave = f"HTTP_{nome}"
+                environ[chave] = f"{environ[chave]},{valor}" if chave in environ else valor
+        return environ
+
+    def _iniciar(self, environ):
+        #retorna (status, headers, iterável, primeiro pedaço já lido ou b"")
+        resposta = {}
+
+        def start_response(status, headers, exc_info=None):
+            resposta["status"] = int(status.split(" ", 1)[0])
+            resposta["headers"] = [(nome.lower().encode("latin-1"), valor.encode("latin-1")) for nome, valor in headers]
+
+        iteravel = self.wsgi_app(environ, start_response)
+        primeira = b""
+        if "status" not in resposta:
+            #PEP 3333: a aplicação pode chamar start_response só na primeira iteração
+            try:
+                primeira = next(iter(iteravel), b"")
+            except BaseException:
+                if hasattr(iteravel, "close"):
+                    iteravel.close()
+                raise
+        return resposta["status"], resposta["headers"], iteravel, primeira
+
+ROTAS_WSGI = PonteWSGI(api.app, _EXECUTOR)
+
+# --- Ciclo de vida: fecha os pools de conexões ao encerrar o servidor ---
+async def _ciclo_de_vida(receive, send):
+    while True:
+        mensagem = await receive()
+        if mensagem["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif mensagem["type"] == "lifespan.shutdown":
+            await OPEN_METEO_WEATHER.fechar()
+            await OPEN_METEO_MARINE.fechar()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+# --- Aplicação ASGI ---
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await _ciclo_de_vida(receive, send)
+    if scope["type"] != "http":
+        return
+    for metodo, padrao, nome, rota in ROTAS_ASYNC:
+        encontrada = padrao.fullmatch(scope["path"])
+        if encontrada and scope["method"] == metodo:
+            return await _medir_rota(nome, scope, lambda enviar: rota(encontrada, _consulta(scope), enviar), send)
+    await ROTAS_WSGI(scope, receive, send)
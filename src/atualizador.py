@@ -0,0 +1,122 @@
+# src/atualizador.py
+
+import os
+import threading
+import time
+
+try:
+    import fcntl  # trava entre processos (Linux/macOS)
+except ImportError:  # Windows: sem trava entre processos, cada processo atualiza sozinho
+    fcntl = None
+
+# --- Trava de arquivo para que só um processo rode o scraper por vez ---
+class TravaArquivo:
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._arquivo = None
+
+    def tentar_adquirir(self):
+        #não bloqueia: se outro processo já está atualizando, apenas desiste
+        self._arquivo = open(self.caminho, "a")
+        if fcntl is None:
+            return True
+        try:
+            fcntl.flock(self._arquivo, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            self._arquivo.close()
+            self._arquivo = None
+            return False
+
+    def adquirir(self):
+        #bloqueia até o outro processo liberar a trava
+        self._arquivo = open(self.caminho, "a")
+        if fcntl is not None:
+            fcntl.flock(self._arquivo, fcntl.LOCK_EX)
+
+    def liberar(self):
+        if self._arquivo is not None:
+            if fcntl is not None:
+                fcntl.flock(self._arquivo, fcntl.LOCK_UN)
+            self._arquivo.close()
+            self._arquivo = None
+
+# --- Atualização periódica do boletim em segundo plano ---
+class AtualizadorBoletim:
+    """
+    Thread que mantém o boletim em dia sem bloquear a API:
+
+    - a cada `verificar_a_cada` segundos, se a última verificação do boletim tiver mais de
+      `intervalo` segundos, tenta pegar a trava e roda `executar_scraper()`. Com vários
+      workers (gunicorn), só quem pega a trava faz o scraping; os outros seguem servindo;
+    - sempre que o arquivo muda no disco (atualizado por este ou por outro processo),
+      chama `recarregar()` para trocar os dados em memória.
+    """
+
+    def __init__(self, caminho_dados, executar_scraper, recarregar, intervalo, verificar_a_cada=60, espera_apos_falha=600, caminho_trava=None):
+        self.caminho_dados = caminho_dados
+        self.executar_scraper = executar_scraper
+        self.recarregar = recarregar
+        self.intervalo = intervalo
+        self.verificar_a_cada = min(verificar_a_cada, intervalo)
+        #com a SEMACE fora do ar, não tenta de novo a cada verificação
+        self.espera_apos_falha = espera_apos_falha
+        self._proxima_tentativa = 0
+        self.trava = TravaArquivo(caminho_trava or caminho_dados + ".lock")
+        #marca a última execução bem-sucedida do scraper, mesmo quando o boletim não mudou
+        self.caminho_verificado = caminho_dados + ".verificado"
+        self._mtime_carregado = self._mtime()
+        self._parar = threading.Event()
+        self._thread = None
+        self.pid = None  # processo em que a thread foi iniciada
+
+    def _mtime(self, caminho=None):
+        try:
+            return os.path.getmtime(caminho or self.caminho_dados)
+        except OSError:
+            return None
+
+    def desatualizado(self):
+        verificado = self._mtime(self.caminho_verificado) or self._mtime()
+        return verificado is None or time.time() - verificado >= self.intervalo
+
+    def ciclo(self):
+        #1) se o boletim está velho, tenta atualizar (só um processo por vez)
+        if self.desatualizado() and time.time() >= self._proxima_tentativa and self.trava.tentar_adquirir():
+            try:
+                #outro processo pode ter acabado de atualizar enquanto esperávamos
+                if self.desatualizado():
+                    self.executar_scraper()
+                    with open(self.caminho_verificado, "w") as marcador:
+                        marcador.write(time.strftime("%Y-%m-%dT%H:%M:%S"))
+            except Exception as erro:
+                self._proxima_tentativa = time.time() + self.espera_apos_falha
+                print(f"Falha ao atualizar o boletim, mantendo os dados atuais: {erro}")
+            finally:
+                self.trava.liberar()
+        #2) se o arquivo mudou no disco, troca os dados em memória
+        mtime = self._mtime()
+        if mtime is not None and mtime != self._mtime_carregado:
+            try:
+                self.recarregar()
+                self._mtime_carregado = mtime
+            except Exception as erro:
+                print(f"Falha ao recarregar o boletim, mantendo os dados atuais: {erro}")
+
+    def _loop(self):
+        while not self._parar.wait(self.verificar_a_cada):
+            self.ciclo()
+
+    def ativo(self):
+        #a thread só existe no processo que a iniciou: num processo filho (fork), o objeto
+        #herdado continua aqui, mas ninguém mais executa o _loop
+        return self._thread is not None and self.pid == os.getpid() and self._thread.is_alive()
+
+    def iniciar(self):
+        self.pid = os.getpid()
+        self._thread = threading.Thread(target=self._loop, name="atualizador-boletim", daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self._parar.set()
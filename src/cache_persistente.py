@@ -0,0 +1,167 @@
+# src/cache_persistente.py
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+# --- Esquema do cache em disco ---
+#uma linha por ponto e data: a série do dia inteiro (tempo e marinha) serializada com pickle
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS previsoes (
+    lat REAL NOT NULL,
+    lon REAL NOT NULL,
+    data TEXT NOT NULL,
+    expira_em REAL NOT NULL,
+    usado_em REAL NOT NULL,
+    tamanho INTEGER NOT NULL,
+    valor BLOB NOT NULL,
+    PRIMARY KEY (lat, lon, data)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_previsoes_usado ON previsoes (usado_em);
+"""
+
+#leituras não regravam usado_em mais de uma vez nesse intervalo (segundos), para não virar escrita
+INTERVALO_USO = 60
+
+# --- Cache de previsões em SQLite, compartilhado entre processos e reinícios ---
+class CachePersistente:
+    """
+    Guarda as séries da Open-Meteo (chave: lat, lon, data) em um arquivo SQLite usado por todos
+    os workers da API ao mesmo tempo e mantido entre reinícios, então um processo novo já começa
+    com as previsões buscadas pelos outros.
+
+    - Modo WAL: leituras não bloqueiam a escrita nem umas às outras; escritas de processos
+      diferentes esperam a vez por até `timeout` segundos.
+    - O TTL usa o relógio de parede (o monotônico recomeça a cada processo). Entradas vencidas
+      ficam como reserva (`obter(..., aceitar_expirado=True)`) por mais `reserva` segundos.
+    - Acima de `max_bytes` de séries, as entradas usadas há mais tempo são apagadas.
+    - Erros do SQLite (arquivo travado, disco cheio) contam como falha do cache: a consulta
+      segue para a Open-Meteo em vez de falhar.
+    """
+
+    def __init__(self, caminho, ttl=900, max_bytes=64 * 1024 * 1024, reserva=86400, timeout=2, descartar_a_cada=32, relogio=time.time):
+        self.caminho = caminho
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.reserva = reserva
+        self.timeout = timeout
+        self.descartar_a_cada = descartar_a_cada
+        self._relogio = relogio
+        self._local = threading.local()
+        self._herdadas = []
+        self._gravacoes = 0
+        self.erros = 0
+        #conexão só da criação, fechada em seguida: nenhuma conexão aberta passa para os workers no fork
+        with closing(self._conectar()) as conexao:
+            conexao.executescript(ESQUEMA)
+            self.descartar(conexao)
+
+    def _conectar(self):
+        conexao = sqlite3.connect(self.caminho, timeout=self.timeout, isolation_level=None)
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute("PRAGMA synchronous=NORMAL")
+        return conexao
+
+    def _conexao(self):
+        #uma conexão por thread e por processo (conexões SQLite não podem ser usadas depois do fork)
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None or self._local.pid != os.getpid():
+            if conexao is not None:
+                #a conexão herdada do processo pai nunca é fechada no filho: fechar o arquivo
+                #soltaria as travas do SQLite que a conexão nova deste processo acabou de pegar
+                self._herdadas.append(conexao)
+            conexao = self._conectar()
+            self._local.conexao = conexao
+            self._local.pid = os.getpid()
+        return conexao
+
+    def obter(self, chave, aceitar_expirado=False):
+        #retorna (valor, segundos até expirar) ou None; vencida, o tempo restante é negativo
+        lat, lon, data = chave
+        agora = self._relogio()
+        try:
+            conexao = self._conexao()
+            linha = conexao.execute("SELECT expira_em, usado_em, valor FROM previsoes WHERE lat = ? AND lon = ? AND data = ?", (lat, lon, data)).fetchone()
+            if linha is None or (linha[0] <= agora and not aceitar_expirado):
+                return None
+            if agora - linha[1] >= INTERVALO_USO:
+                conexao.execute("UPDATE previsoes SET usado_em = ? WHERE lat = ? AND lon = ? AND data = ?", (agora, lat, lon, data))
+            return pickle.loads(linha[2]), linha[0] - agora
+        except Exception:
+            #arquivo travado, disco com problema ou valor ilegível: segue como se não houvesse entrada
+            self.erros += 1
+            return None
+
+    def guardar_lote(self, itens, ttl=None):
+        #itens: [(chave, valor)], gravados em uma única transação
+        agora = self._relogio()
+        ttl = self.ttl if ttl is None else ttl
+        linhas = []
+        for (lat, lon, data), valor in itens:
+            blob = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+            linhas.append((lat, lon, data, agora + ttl, agora, len(blob), blob))
+        if not linhas:
+            return
+        try:
+            conexao = self._conexao()
+            with conexao:
+                conexao.execute("BEGIN IMMEDIATE")
+                conexao.executemany("INSERT OR REPLACE INTO previsoes VALUES (?, ?, ?, ?, ?, ?, ?)", linhas)
+            self._gravacoes += 1
+            if self._gravacoes % self.descartar_a_cada == 0:
+                self.descartar()
+        except Exception:
+            self.erros += 1
+
+    def guardar(self, chave, valor):
+        self.guardar_lote([(chave, valor)])
+
+    def descartar(self, conexao=None):
+        """
+        Apaga as entradas vencidas há mais de `reserva` segundos e, se o total passar de
+        `max_bytes`, as usadas há mais tempo até sobrar 90% do limite. Retorna quantas apagou.
+        """
+        agora = self._relogio()
+        try:
+            conexao = conexao or self._conexao()
+            with conexao:
+                conexao.execute("BEGIN IMMEDIATE")
+                apagadas = conexao.execute("DELETE FROM previsoes WHERE expira_em < ?", (agora - self.reserva,)).rowcount
+                total = conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM previsoes").fetchone()[0]
+                if total > self.max_bytes:
+                    excesso = total - int(self.max_bytes * 0.9)
+                    limite = None
+                    for usado_em, tamanho in conexao.execute("SELECT usado_em, tamanho FROM previsoes ORDER BY usado_em"):
+                        limite = usado_em
+                        excesso -= tamanho
+                        if excesso <= 0:
+                            break
+                    apagadas += conexao.execute("DELETE FROM previsoes WHERE usado_em <= ?", (limite,)).rowcount
+            return apagadas
+        except Exception:
+            self.erros += 1
+            return 0
+
+    def limpar(self):
+        try:
+            with self._conexao() as conexao:
+                conexao.execute("DELETE FROM previsoes")
+        except sqlite3.Error:
+            self.erros += 1
+
+    def tamanho_bytes(self):
+        try:
+            return self._conexao().execute("SELECT COALESCE(SUM(tamanho), 0) FROM previsoes").fetchone()[0]
+        except sqlite3.Error:
+            self.erros += 1
+            return None
+
+    def __len__(self):
+        try:
+            return self._conexao().execute("SELECT COUNT(*) FROM previsoes").fetchone()[0]
+        except sqlite3.Error:
+            self.erros += 1
+            return 0
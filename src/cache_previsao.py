@@ -0,0 +1,188 @@
+# src/cache_previsao.py
+
+import threading
+import time
+from collections import OrderedDict
+
+# --- Chave do cache: coordenadas arredondadas + data ---
+def chave_previsao(lat, lon, data, casas=4):
+    #4 casas decimais ~ 11 metros, suficiente para considerar o mesmo ponto
+    return (round(float(lat), casas), round(float(lon), casas), data)
+
+# --- Séries de vários dias recortadas em um dia (o que vai sob a chave de cada data) ---
+def series_do_dia(series, dia):
+    return {tipo: serie.do_dia(dia) for tipo, serie in series.items()}
+
+# --- Busca em andamento (usada para coalescer chamadas simultâneas) ---
+class _BuscaEmAndamento:
+    def __init__(self):
+        self.evento = threading.Event()
+        self.valor = None
+        self.erro = None
+        self.restante = None  # segundos até expirar, quando o valor veio do cache em disco
+
+# --- Cache em memória com TTL por entrada e descarte LRU ---
+class CachePrevisao:
+    """
+    Cache em memória para as séries horárias retornadas pela Open-Meteo.
+
+    - Cada entrada expira após `ttl` segundos (`obter(..., aceitar_expirado=True)` ainda a devolve).
+    - Ao passar de `max_entradas`, a entrada usada há mais tempo é descartada (LRU).
+    - Chamadas simultâneas para a mesma chave compartilham uma única busca.
+    - Com `persistente` (um CachePersistente), as faltas na memória são procuradas no disco
+      antes de buscar, e o que é guardado também vai para o disco.
+    """
+
+    def __init__(self, ttl=900, max_entradas=512, relogio=time.monotonic, persistente=None):
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self._relogio = relogio
+        self.persistente = persistente
+        self._entradas = OrderedDict()  # chave -> (expira_em, valor)
+        self._em_andamento = {}  # chave -> _BuscaEmAndamento
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.acertos_disco = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entradas)
+
+    def _obter_sem_lock(self, chave, aceitar_expirado=False):
+        entrada = self._entradas.get(chave)
+        if entrada is None:
+            return None
+        expira_em, valor = entrada
+        if expira_em <= self._relogio():
+            #entradas vencidas ficam guardadas (até serem descartadas pelo LRU) para servirem
+            #de reserva quando a Open-Meteo estiver fora do ar
+            return valor if aceitar_expirado else None
+        #marca como usada recentemente
+        self._entradas.move_to_end(chave)
+        return valor
+
+    def _guardar_sem_lock(self, chave, valor, ttl=None):
+        self._entradas[chave] = (self._relogio() + (self.ttl if ttl is None else ttl), valor)
+        self._entradas.move_to_end(chave)
+        while len(self._entradas) > self.max_entradas:
+            self._entradas.popitem(last=False)
+
+    def _obter_do_disco(self, chave, aceitar_expirado=False):
+        #fora do lock: a leitura do SQLite não segura as outras threads
+        encontrado = self.persistente.obter(chave, aceitar_expirado)
+        if encontrado is None:
+            return None
+        valor, restante = encontrado
+        #volta para a memória com o tempo que ainda resta (vencida, fica só no disco)
+        if restante > 0:
+            with self._lock:
+                self._guardar_sem_lock(chave, valor, restante)
+        return valor
+
+    def obter(self, chave, aceitar_expirado=False, disco=True):
+        #disco=False consulta só a memória (ex.: no loop de eventos do modo ASGI)
+        with self._lock:
+            valor = self._obter_sem_lock(chave, aceitar_expirado)
+        if valor is None and disco and self.persistente is not None:
+            valor = self._obter_do_disco(chave, aceitar_expirado)
+        return valor
+
+    def guardar(self, chave, valor):
+        self.guardar_lote([(chave, valor)])
+
+    def guardar_lote(self, itens, ttl=None):
+        #itens: [(chave, valor)]; no disco, uma única transação para todos
+        with self._lock:
+            for chave, valor in itens:
+                self._guardar_sem_lock(chave, valor, ttl)
+        if self.persistente is not None:
+            self.persistente.guardar_lote(itens, ttl)
+
+    def limpar(self):
+        #limpa também o disco, que é compartilhado com os outros processos
+        with self._lock:
+            self._entradas.clear()
+            self.acertos = 0
+            self.falhas = 0
+            self.acertos_disco = 0
+        if self.persistente is not None:
+            self.persistente.limpar()
+
+    def obter_ou_buscar(self, chave, buscar, armazenar=None):
+        """
+        Retorna o valor em cache para `chave` ou executa `buscar()` uma única vez,
+        mesmo que várias threads peçam a mesma chave ao mesmo tempo.
+        `armazenar(valor)` decide se o resultado deve ser guardado (ex.: não guardar respostas vazias).
+        """
+        return self.obter_ou_buscar_lote([chave], lambda chaves: [buscar()], armazenar)[chave]
+
+    def obter_ou_buscar_lote(self, chaves, buscar_lote, armazenar=None):
+        """
+        Versão em lote de `obter_ou_buscar`. `buscar_lote(faltantes)` recebe apenas as chaves
+        que não estão no cache nem sendo buscadas por outra thread, e devolve os valores na
+        mesma ordem. Retorna {chave: valor} para todas as chaves pedidas.
+        """
+        valores = {}
+        lideres = {}  # chaves que esta chamada vai buscar
+        aguardar = {}  # chaves que outra thread já está buscando
+        with self._lock:
+            for chave in dict.fromkeys(chaves):
+                valor = self._obter_sem_lock(chave)
+                if valor is not None:
+                    self.acertos += 1
+                    valores[chave] = valor
+                    continue
+                self.falhas += 1
+                busca = self._em_andamento.get(chave)
+                if busca is None:
+                    busca = _BuscaEmAndamento()
+                    self._em_andamento[chave] = busca
+                    lideres[chave] = busca
+                else:
+                    aguardar[chave] = busca
+
+        if lideres:
+            novos = []  # (chave, valor) buscados agora, para gravar no disco
+            try:
+                faltantes = list(lideres)
+                #o disco é consultado uma vez por chave, pela thread que lidera a busca
+                if self.persistente is not None:
+                    for chave in faltantes:
+                        encontrado = self.persistente.obter(chave)
+                        if encontrado is not None:
+                            lideres[chave].valor, lideres[chave].restante = encontrado
+                    faltantes = [chave for chave in faltantes if lideres[chave].restante is None]
+                if faltantes:
+                    for chave, valor in zip(faltantes, buscar_lote(faltantes)):
+                        lideres[chave].valor = valor
+            except Exception as erro:
+                for busca in lideres.values():
+                    busca.erro = erro
+                raise
+            finally:
+                with self._lock:
+                    for chave, busca in lideres.items():
+                        del self._em_andamento[chave]
+                        if busca.erro is not None:
+                            continue
+                        if busca.restante is not None:
+                            self.acertos_disco += 1
+                            self._guardar_sem_lock(chave, busca.valor, busca.restante)
+                        elif armazenar is None or armazenar(busca.valor):
+                            self._guardar_sem_lock(chave, busca.valor)
+                            novos.append((chave, busca.valor))
+                for busca in lideres.values():
+                    busca.evento.set()
+            #gravado depois de liberar quem espera: a escrita no disco não atrasa nenhuma resposta
+            if novos and self.persistente is not None:
+                self.persistente.guardar_lote(novos)
+            valores.update((chave, busca.valor) for chave, busca in lideres.items())
+
+        #quem chegou depois apenas espera o resultado da busca em andamento
+        for chave, busca in aguardar.items():
+            busca.evento.wait()
+            if busca.erro is not None:
+                raise busca.erro
+            valores[chave] = busca.valor
+        return valores
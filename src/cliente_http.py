@@ -0,0 +1,120 @@
+# src/cliente_http.py
+
+import os
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from metricas import UPSTREAM_DURACAO, UPSTREAM_ERROS, UPSTREAM_NAO_200, medir
+
+# --- Configuração padrão das chamadas externas (variáveis de ambiente) ---
+UPSTREAM_TIMEOUT_CONEXAO = float(os.environ.get("UPSTREAM_TIMEOUT_CONEXAO", 3.05))  # segundos
+UPSTREAM_TIMEOUT_LEITURA = float(os.environ.get("UPSTREAM_TIMEOUT_LEITURA", 10))  # segundos
+UPSTREAM_TENTATIVAS = int(os.environ.get("UPSTREAM_TENTATIVAS", 2))  # novas tentativas após a primeira
+UPSTREAM_POOL = int(os.environ.get("UPSTREAM_POOL", 20))  # conexões mantidas abertas por host
+
+# --- Erro lançado quando o disjuntor está aberto ---
+class CircuitoAberto(requests.RequestException):
+    pass
+
+# --- Disjuntor (circuit breaker) ---
+class Disjuntor:
+    """
+    Depois de `limite_falhas` falhas seguidas o disjuntor abre e as chamadas são recusadas
+    na hora, sem esperar pelo timeout. Passados `tempo_aberto` segundos, uma única chamada de
+    teste é liberada: se der certo o disjuntor fecha, se falhar ele abre de novo.
+    """
+
+    def __init__(self, limite_falhas=5, tempo_aberto=30, relogio=time.monotonic):
+        self.limite_falhas = limite_falhas
+        self.tempo_aberto = tempo_aberto
+        self._relogio = relogio
+        self._falhas = 0
+        self._aberto_ate = None
+        self._testando = False
+        self._lock = threading.Lock()
+
+    @property
+    def aberto(self):
+        with self._lock:
+            return self._aberto_ate is not None and (self._testando or self._relogio() < self._aberto_ate)
+
+    def permitir(self):
+        with self._lock:
+            if self._aberto_ate is None:
+                return True
+            #meio-aberto: libera só uma chamada de teste por vez
+            if self._relogio() >= self._aberto_ate and not self._testando:
+                self._testando = True
+                return True
+            return False
+
+    def registrar_sucesso(self):
+        with self._lock:
+            self._falhas = 0
+            self._aberto_ate = None
+            self._testando = False
+
+    def registrar_falha(self):
+        with self._lock:
+            self._falhas += 1
+            if self._testando or self._falhas >= self.limite_falhas:
+                self._aberto_ate = self._relogio() + self.tempo_aberto
+            self._testando = False
+
+# --- Cliente HTTP compartilhado para um serviço externo ---
+class ClienteUpstream:
+    """
+    Sessão HTTP reaproveitada entre requisições (pool de conexões com keep-alive),
+    com timeouts de conexão/leitura, novas tentativas com espera exponencial e jitter
+    para erros de rede/5xx/429, e um disjuntor que corta as chamadas enquanto o serviço
+    estiver fora do ar.
+    """
+
+    def __init__(self, nome, timeout=None, tentativas=None, backoff=0.3, jitter=0.3, pool=None, disjuntor=None):
+        self.nome = nome
+        #nome da etapa no perfil da requisição (cabeçalho Server-Timing), ex.: upstream_open-meteo
+        self.etapa = "upstream_" + nome.lower().replace(" ", "_")
+        self.timeout = timeout or (UPSTREAM_TIMEOUT_CONEXAO, UPSTREAM_TIMEOUT_LEITURA)
+        self.disjuntor = disjuntor or Disjuntor()
+        tentativas = UPSTREAM_TENTATIVAS if tentativas is None else tentativas
+        retry = Retry(
+            total=tentativas,
+            backoff_factor=backoff,
+            backoff_jitter=jitter,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET", "HEAD"),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool or UPSTREAM_POOL, max_retries=retry)
+        self.sessao = requests.Session()
+        self.sessao.mount("http://", adapter)
+        self.sessao.mount("https://", adapter)
+
+    def get(self, url, **kwargs):
+        if not self.disjuntor.permitir():
+            UPSTREAM_ERROS.inc(servico=self.nome)
+            raise CircuitoAberto(f"{self.nome} indisponível (disjuntor aberto)")
+        kwargs.setdefault("timeout", self.timeout)
+        try:
+            with medir(UPSTREAM_DURACAO, self.etapa, servico=self.nome):
+                response = self.sessao.get(url, **kwargs)
+        except requests.RequestException:
+            UPSTREAM_ERROS.inc(servico=self.nome)
+            self.disjuntor.registrar_falha()
+            raise
+        if response.status_code != 200:
+            UPSTREAM_NAO_200.inc(servico=self.nome, status=response.status_code)
+        if response.status_code >= 500:
+            self.disjuntor.registrar_falha()
+        else:
+            self.disjuntor.registrar_sucesso()
+        return response
+
+# --- Clientes usados pela API e pelo scraper ---
+#um cliente por host, para que a queda da API marinha não bloqueie a de tempo (e vice-versa)
+OPEN_METEO_WEATHER = ClienteUpstream("Open-Meteo")
+OPEN_METEO_MARINE = ClienteUpstream("Open-Meteo Marine")
+#o PDF da SEMACE pode demorar mais para ser baixado
+SEMACE = ClienteUpstream("SEMACE", timeout=(UPSTREAM_TIMEOUT_CONEXAO, 60), pool=2)
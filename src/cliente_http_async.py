@@ -0,0 +1,78 @@
+# src/cliente_http_async.py
+
+import asyncio
+import random
+import httpx
+from cliente_http import UPSTREAM_TIMEOUT_CONEXAO, UPSTREAM_TIMEOUT_LEITURA, UPSTREAM_TENTATIVAS, CircuitoAberto
+from metricas import UPSTREAM_DURACAO, UPSTREAM_ERROS, UPSTREAM_NAO_200, medir
+
+#mesmos status que o Retry do cliente síncrono repete
+STATUS_NOVA_TENTATIVA = (429, 500, 502, 503, 504)
+#conexões simultâneas por serviço no modo ASGI (cada requisição em andamento usa no máximo uma)
+UPSTREAM_POOL_ASYNC = 200
+
+# --- Cliente HTTP assíncrono para um serviço externo (modo ASGI) ---
+class ClienteUpstreamAsync:
+    """
+    Versão assíncrona do ClienteUpstream (cliente_http.py), com httpx.AsyncClient: a espera
+    pela resposta não ocupa uma thread, então um único processo mantém centenas de chamadas
+    em andamento. Mantém as mesmas regras do cliente síncrono (timeouts, novas tentativas com
+    espera exponencial e jitter) e usa o mesmo disjuntor do serviço, então as rotas síncronas
+    e assíncronas enxergam o mesmo estado da Open-Meteo.
+    """
+
+    def __init__(self, sincrono, tentativas=None, backoff=0.3, jitter=0.3, pool=None):
+        self.nome = sincrono.nome
+        self.etapa = sincrono.etapa
+        self.timeout = sincrono.timeout or (UPSTREAM_TIMEOUT_CONEXAO, UPSTREAM_TIMEOUT_LEITURA)
+        self.disjuntor = sincrono.disjuntor
+        self.tentativas = UPSTREAM_TENTATIVAS if tentativas is None else tentativas
+        self.backoff = backoff
+        self.jitter = jitter
+        self.pool = pool or UPSTREAM_POOL_ASYNC
+        self._cliente = None
+        self._loop = None
+
+    def _cliente_do_loop(self):
+        #o pool de conexões pertence ao loop de eventos em que foi criado
+        loop = asyncio.get_running_loop()
+        if self._cliente is None or self._loop is not loop:
+            conexao, leitura = self.timeout
+            self._cliente = httpx.AsyncClient(
+                timeout=httpx.Timeout(leitura, connect=conexao),
+                limits=httpx.Limits(max_connections=self.pool, max_keepalive_connections=self.pool),
+            )
+            self._loop = loop
+        return self._cliente
+
+    async def get(self, url):
+        if not self.disjuntor.permitir():
+            UPSTREAM_ERROS.inc(servico=self.nome)
+            raise CircuitoAberto(f"{self.nome} indisponível (disjuntor aberto)")
+        cliente = self._cliente_do_loop()
+        with medir(UPSTREAM_DURACAO, self.etapa, servico=self.nome):
+            for tentativa in range(self.tentativas + 1):
+                ultima = tentativa == self.tentativas
+                try:
+                    response = await cliente.get(url)
+                except httpx.HTTPError:
+                    if ultima:
+                        UPSTREAM_ERROS.inc(servico=self.nome)
+                        self.disjuntor.registrar_falha()
+                        raise
+                else:
+                    if ultima or response.status_code not in STATUS_NOVA_TENTATIVA:
+                        break
+                await asyncio.sleep(self.backoff * 2 ** tentativa + random.uniform(0, self.jitter))
+        if response.status_code != 200:
+            UPSTREAM_NAO_200.inc(servico=self.nome, status=response.status_code)
+        if response.status_code >= 500:
+            self.disjuntor.registrar_falha()
+        else:
+            self.disjuntor.registrar_sucesso()
+        return response
+
+    async def fechar(self):
+        if self._cliente is not None:
+            await self._cliente.aclose()
+            self._cliente = None
@@ -35,3 +35,6 @@ COORDENADAS_POR_CODIGO = {
     "30O": "-3.693798305915436, -38.58376844156292",
     "31O": "-3.6932983239755615, -38.58761246540475",
 }
+
+# --- Coordenadas numéricas (lat, lon), convertidas uma única vez na importação ---
+COORDENADAS_NUMERICAS = {codigo: tuple(float(v) for v in coords.split(", ")) for codigo, coords in COORDENADAS_POR_CODIGO.items()}
@@ -0,0 +1,89 @@
+# src/extracao_pdfplumber.py
+
+import statistics
+
+import pandas as pd
+import pdfplumber
+
+from extracao_tabelas import normalizar_tabelas
+
+#palavras cujo topo difere menos que isso (em pontos) estão na mesma linha
+TOLERANCIA_LINHA = 3
+#distância máxima (em pontos) entre o início de um status e o início típico da coluna Status
+TOLERANCIA_COLUNA = 20
+
+# --- Metadados do boletim a partir do texto da primeira página ---
+def metadados_do_texto(texto_pg1):
+    #retorna (numero_boletim, periodo, tipos_amostragem)
+    texto_pg1 = " ".join((texto_pg1 or "").split())  # tudo em uma linha
+
+    periodo = ""
+    numero_boletim = ""
+    tipos_amostragem = ""
+
+    if "Nº" in texto_pg1 and "Período:" in texto_pg1 and "Tipos de amostras:" in texto_pg1:
+        bol_index = texto_pg1.find("Nº")
+        per_index = texto_pg1.find("Período:", bol_index)
+        tipos_index = texto_pg1.find("Tipos de amostras:", per_index)
+
+        numero_boletim = texto_pg1[bol_index + 2:per_index].strip()
+        periodo = texto_pg1[per_index + len("Período:"):tipos_index].strip()
+
+        # pega só até o primeiro ponto final (.)
+        resto = texto_pg1[tipos_index + len("Tipos de amostras:"):].strip()
+        tipos_amostragem = resto.split(".")[0].strip()
+    return numero_boletim, periodo, tipos_amostragem
+
+#--- Extração de metadados (só a primeira página) ---
+def extrair_metadados(arquivo_pdf):
+    with pdfplumber.open(arquivo_pdf) as pdf:
+        return metadados_do_texto(pdf.pages[0].extract_text())
+
+# --- Agrupa as palavras da página em linhas, de cima para baixo ---
+def _linhas_da_pagina(palavras):
+    linhas = []
+    for palavra in sorted(palavras, key=lambda p: (p["top"], p["x0"])):
+        if linhas and abs(palavra["top"] - linhas[-1][0]["top"]) <= TOLERANCIA_LINHA:
+            linhas[-1].append(palavra)
+        else:
+            linhas.append([palavra])
+    return [sorted(linha, key=lambda p: p["x0"]) for linha in linhas]
+
+# --- Tabela (Nome, Status) de uma página, pela posição das palavras ---
+def tabela_da_pagina(pagina):
+    """
+    Monta a tabela bruta de uma página no mesmo formato do Camelot (uma linha de texto por
+    linha da tabela, colunas 0 = Nome e 1 = Status). A coluna Status é localizada pela posição
+    típica dos tokens P/I que terminam as linhas; o que estiver nela vira o Status e o resto
+    da linha vira o Nome. Cabeçalhos, títulos e rodapés passam adiante e são descartados na
+    normalização, como acontece com as tabelas do Camelot.
+    """
+    linhas = _linhas_da_pagina(pagina.extract_words())
+    finais = [linha[-1]["x0"] for linha in linhas if len(linha) > 1 and linha[-1]["text"].strip().upper() in ("P", "I")]
+    if not finais:
+        return pd.DataFrame(columns=[0, 1])
+    coluna_status = statistics.median(finais)
+
+    registros = []
+    for linha in linhas:
+        nome = [p["text"] for p in linha if p["x0"] < coluna_status - TOLERANCIA_COLUNA]
+        status = [p["text"] for p in linha if p["x0"] >= coluna_status - TOLERANCIA_COLUNA]
+        registros.append([" ".join(nome), " ".join(status)])
+    return pd.DataFrame(registros, columns=[0, 1])
+
+# --- Metadados e tabelas em uma única passada do pdfplumber ---
+def tabelas_do_boletim(arquivo_pdf):
+    #retorna (tabelas brutas no formato do Camelot, (numero_boletim, periodo, tipos_amostragem))
+    with pdfplumber.open(arquivo_pdf) as pdf:
+        metadados = metadados_do_texto(pdf.pages[0].extract_text())
+        tabelas = [tabela_da_pagina(pagina) for pagina in pdf.pages]
+    return tabelas, metadados
+
+def extrair_boletim(arquivo_pdf):
+    """
+    Alternativa leve ao Camelot: abre o PDF uma única vez e devolve
+    (DataFrame Nome/Status, (numero_boletim, periodo, tipos_amostragem)), com o mesmo
+    formato de `extracao_tabelas.extrair_tabelas` e de `extrair_metadados`.
+    """
+    tabelas, metadados = tabelas_do_boletim(arquivo_pdf)
+    return normalizar_tabelas(tabelas), metadados
@@ -0,0 +1,179 @@
+# src/extracao_tabelas.py
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pdfplumber
+
+COLUNAS = ["Nome", "Status"]
+#palavras-chave que indicam linha inútil (títulos, rodapés, cabeçalhos, etc.)
+NOISE_TERMS = ["nome", "status", "trecho", "ponto", "boletim", "semace"]
+_REGEX_RUIDO = "|".join(NOISE_TERMS)
+
+# --- Número de processos para a extração (SCRAPER_PROCESSOS, padrão: núcleos da máquina) ---
+def processos_padrao():
+    try:
+        return max(1, int(os.environ.get("SCRAPER_PROCESSOS", "")))
+    except ValueError:
+        return os.cpu_count() or 1
+
+#--- Filtragem de dados da tabela e normalização ---
+
+#limpeza dos status em 'P' ou 'I'
+def clean_status_token(tok: str) -> str:
+    #remove espaços extras e converte para maiúscula
+    tok = tok.strip().upper()
+    #retorna apenas se for P (Própria) ou I (Imprópria), caso contrário retorna vazio
+    return tok if tok in ("P", "I") else ""
+
+#verifica se a linha é ruído (não contém informação válida de praia)
+def is_noise_row(nome: str, status: str) -> bool:
+    #junta nome e status em uma string só (em minúsculo)
+    txt = f"{str(nome)} {str(status)}".lower()
+    #se a linha tiver menos de 3 caracteres, é descartada
+    if len(txt.strip()) < 3:
+        return True
+    #se tiver qualquer palavra de ruído, também é descartada
+    return any(term in txt for term in NOISE_TERMS)
+
+#quebra cada célula em tokens (um por linha do texto), guardando a linha da tabela e a posição na célula
+def _tokens(serie, coluna):
+    tokens = serie.astype(str).str.split("\n").explode().str.strip()
+    if coluna == "Status":
+        tokens = tokens.str.upper()
+        tokens = tokens[tokens.isin(["P", "I"])]
+    else:
+        tokens = tokens[tokens != ""]
+    return pd.DataFrame({"linha": tokens.index, "pos": tokens.groupby(level=0).cumcount().to_numpy(), coluna: tokens.to_numpy()})
+
+# --- Normalização vetorizada das tabelas do Camelot ---
+def normalizar_tabelas(tabelas):
+    return normalizar_tabelas_contando_ruido(tabelas)[0]
+
+def normalizar_tabelas_contando_ruido(tabelas):
+    """
+    Converte as tabelas brutas do Camelot em linhas (Nome, Status), com as mesmas regras da
+    versão linha a linha (`normalizar_tabela_linha_a_linha`), mas com operações de coluna
+    sobre todas as tabelas de uma vez:
+
+    - cada célula é quebrada em tokens por "\\n"; status fora de P/I são descartados;
+    - um único status para vários nomes vale para todos eles; nos demais casos, o n-ésimo
+      nome recebe o n-ésimo status (sobras de qualquer lado são ignoradas, como no zip);
+    - linhas de ruído (títulos, cabeçalhos, rodapés) são removidas.
+
+    Retorna (DataFrame Nome/Status, quantidade de linhas descartadas como ruído).
+    """
+    #ignora tabelas inválidas com menos de 2 colunas e mantém só Nome e Status
+    validas = [t.iloc[:, :2].set_axis(COLUNAS, axis=1) for t in tabelas if t.shape[1] >= 2]
+    if not validas:
+        return pd.DataFrame(columns=COLUNAS), 0
+    #cada linha de cada tabela ganha um número único, na ordem do PDF
+    df_raw = pd.concat(validas, ignore_index=True)
+
+    nomes = _tokens(df_raw["Nome"], "Nome")
+    status = _tokens(df_raw["Status"], "Status")
+    if nomes.empty or status.empty:
+        return pd.DataFrame(columns=COLUNAS), 0
+
+    #um status para várias praias: todos os nomes da linha apontam para o status 0
+    qtd_nomes = nomes.groupby("linha")["pos"].transform("size")
+    qtd_status = nomes["linha"].map(status.groupby("linha").size()).fillna(0)
+    nomes["pos_status"] = nomes["pos"].where(~((qtd_status == 1) & (qtd_nomes > 1)), 0)
+
+    #o merge interno faz o papel do zip: só ficam pares com nome e status
+    status = status.rename(columns={"pos": "pos_status"})
+    pares = nomes.merge(status, on=["linha", "pos_status"])
+    pares = pares.sort_values(["linha", "pos"], kind="stable")
+
+    txt = (pares["Nome"] + " " + pares["Status"]).str.lower()
+    ruido = (txt.str.strip().str.len() < 3) | txt.str.contains(_REGEX_RUIDO, regex=True)
+    return pares.loc[~ruido, COLUNAS].reset_index(drop=True), int(ruido.sum())
+
+# --- Normalização original, linha a linha (referência para testes e benchmark) ---
+def normalizar_tabelas_linha_a_linha(tabelas):
+    return _concatenar([normalizar_tabela_linha_a_linha(t) for t in tabelas])
+
+def normalizar_tabela_linha_a_linha(df_raw):
+    if df_raw.shape[1] < 2:
+        return pd.DataFrame(columns=COLUNAS)
+
+    #mantém apenas as duas primeiras colunas (Nome e Status)
+    df_raw = df_raw.iloc[:, :2]
+    df_raw.columns = COLUNAS
+
+    linhas = []  #lista para armazenar os registros válidos
+
+    #percorre cada linha da tabela
+    for _, row in df_raw.iterrows():
+        #quebra o campo "Nome" em várias linhas (caso contenha "\n") e remove espaços extras
+        nomes = [x.strip() for x in row["Nome"].split("\n") if x.strip()]
+        #faz o mesmo para "Status", limpando os tokens com clean_status_token
+        status_tokens = [clean_status_token(x) for x in row["Status"].split("\n")]
+        status_tokens = [x for x in status_tokens if x]  # remove vazios
+
+        #caso não não tem nome ou status, pula a linha
+        if not nomes or not status_tokens:
+            continue
+
+        #um único status para várias praias (ex: várias linhas de nomes, mas só um "P")
+        if len(status_tokens) == 1 and len(nomes) > 1:
+            for n in nomes:
+                if not is_noise_row(n, status_tokens[0]):
+                    linhas.append({"Nome": n, "Status": status_tokens[0]})
+        else:
+            #caso mais comum: cada nome tem um status correspondente
+            for n, s in zip(nomes, status_tokens):
+                if not is_noise_row(n, s):
+                    linhas.append({"Nome": n, "Status": s})
+
+    return pd.DataFrame(linhas, columns=COLUNAS)
+
+#junta as tabelas normalizadas na ordem em que aparecem no PDF
+def _concatenar(dfs):
+    dfs = [df for df in dfs if not df.empty]
+    return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame(columns=COLUNAS)
+
+# --- Tabelas brutas de uma página (executada nos processos do pool) ---
+def tabelas_da_pagina(arquivo_pdf, pagina):
+    import camelot  # importado só quando usado: puxa OpenCV e leva meio segundo para carregar
+    return [t.df for t in camelot.read_pdf(arquivo_pdf, pages=str(pagina), flavor="stream")]
+
+def contar_paginas(arquivo_pdf):
+    with pdfplumber.open(arquivo_pdf) as pdf:
+        return len(pdf.pages)
+
+#fork não reimporta o programa principal nos filhos, mas só é seguro em um processo com uma única
+#thread (a linha de comando do scraper): o filho herda as travas que as outras threads seguravam
+#(logging, SQLite, pools do urllib3) e pode travar para sempre. Com outras threads vivas (a API)
+#ou sem fork (Windows/macOS), a extração fica no próprio processo
+def _contexto_pool():
+    if "fork" in multiprocessing.get_all_start_methods() and threading.active_count() == 1:
+        return multiprocessing.get_context("fork")
+    return None
+
+# --- Extração das tabelas do boletim (Camelot), sem normalizar ---
+def extrair_tabelas_brutas(arquivo_pdf, processos=None):
+    """
+    Lê as tabelas de todas as páginas do PDF com o Camelot e devolve a lista de tabelas
+    brutas, na ordem do PDF. Com `processos` > 1, as páginas são distribuídas entre processos
+    (uma tarefa por página); com 1 processo, o Camelot lê o PDF inteiro de uma vez.
+    """
+    processos = processos_padrao() if processos is None else processos
+    contexto = _contexto_pool()
+    paginas = contar_paginas(arquivo_pdf) if processos > 1 and contexto is not None else 1
+
+    if paginas <= 1:
+        import camelot
+        return [t.df for t in camelot.read_pdf(arquivo_pdf, pages="1-end", flavor="stream")]
+
+    with ProcessPoolExecutor(max_workers=min(processos, paginas), mp_context=contexto) as executor:
+        #map devolve os resultados na ordem das páginas, qualquer que seja a ordem de término
+        resultados = executor.map(tabelas_da_pagina, [arquivo_pdf] * paginas, range(1, paginas + 1))
+        return [tabela for tabelas in resultados for tabela in tabelas]
+
+# --- Extração e normalização das tabelas do boletim ---
+def extrair_tabelas(arquivo_pdf, processos=None, normalizar=normalizar_tabelas):
+    return normalizar(extrair_tabelas_brutas(arquivo_pdf, processos))
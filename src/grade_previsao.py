@@ -0,0 +1,52 @@
+# src/grade_previsao.py
+
+import math
+
+# --- Célula da grade que contém um ponto ---
+#células centradas nos múltiplos de `resolucao` (como as grades dos modelos, alinhadas em 0°)
+def celula(lat, lon, resolucao):
+    return (round(lat / resolucao), round(lon / resolucao))
+
+# --- Agrupamento dos pontos monitorados em células de previsão ---
+class GradePrevisao:
+    """
+    Mapeia cada ponto para a célula de `resolucao` graus que o contém. Todos os pontos de uma
+    célula usam o mesmo ponto representante (o mais próximo do centro da célula) para buscar a
+    previsão, então dividem uma única chamada e uma única entrada de cache. O representante é
+    um ponto real (e não o centro da célula), para a série marinha não cair sobre a terra.
+    Com `resolucao` <= 0 cada ponto é a sua própria célula.
+    """
+
+    def __init__(self, pontos, resolucao):
+        self.resolucao = resolucao
+        self.pontos = list(dict.fromkeys(pontos))
+        self._representante = {}  # célula -> (lat, lon)
+        if resolucao <= 0:
+            return
+        for lat, lon in self.pontos:
+            chave = celula(lat, lon, resolucao)
+            centro = (chave[0] * resolucao, chave[1] * resolucao)
+            atual = self._representante.get(chave)
+            if atual is None or math.dist((lat, lon), centro) < math.dist(atual, centro):
+                self._representante[chave] = (lat, lon)
+
+    def ponto(self, lat, lon):
+        #ponto usado para a previsão de (lat, lon); em células sem ponto monitorado, o próprio ponto
+        if self.resolucao <= 0:
+            return (lat, lon)
+        return self._representante.get(celula(lat, lon, self.resolucao), (lat, lon))
+
+    def representantes(self):
+        #um ponto por célula: o que de fato é consultado na Open-Meteo
+        if self.resolucao <= 0:
+            return list(self.pontos)
+        return list(dict.fromkeys(self.ponto(lat, lon) for lat, lon in self.pontos))
+
+# --- Relatório: quantas consultas distintas o conjunto de pontos vira em cada resolução ---
+if __name__ == "__main__":
+    from coordenadas import COORDENADAS_NUMERICAS
+    pontos = list(COORDENADAS_NUMERICAS.values())
+    print(f"{'resolução (graus)':<20}{'~km':>6}{'pontos':>8}{'consultas':>11}")
+    for resolucao in (0, 0.005, 0.01, 0.02, 0.05, 0.1):
+        grade = GradePrevisao(pontos, resolucao)
+        print(f"{resolucao:<20g}{resolucao * 111.2:>6.1f}{len(grade.pontos):>8}{len(grade.representantes()):>11}")
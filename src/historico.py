@@ -0,0 +1,124 @@
+# src/historico.py
+
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+# --- Esquema do histórico ---
+#boletins: um registro por boletim importado
+#status_diario: status de cada ponto em cada dia coberto por um boletim, chave (codigo, data)
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS boletins (
+    numero_boletim TEXT PRIMARY KEY,
+    periodo TEXT,
+    tipos_amostragem TEXT,
+    url TEXT,
+    importado_em TEXT
+);
+CREATE TABLE IF NOT EXISTS status_diario (
+    codigo TEXT NOT NULL,
+    data TEXT NOT NULL,
+    nome TEXT,
+    zona TEXT,
+    status TEXT,
+    numero_boletim TEXT,
+    PRIMARY KEY (codigo, data)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_status_data_zona ON status_diario (data, zona, status);
+"""
+
+# --- Código do ponto (ex.: "05L") a partir do nome ---
+def codigo_do_nome(nome):
+    return (str(nome or "")[:3] or "").strip().upper()
+
+# --- Histórico de boletins em SQLite (somente inclusão) ---
+class HistoricoBoletins:
+    """
+    Arquivo SQLite com todos os boletins já importados. Os registros nunca são apagados
+    nem sobrescritos: um dia já registrado para um ponto mantém o primeiro status gravado.
+    As consultas por ponto e por período usam a chave (codigo, data) e o índice por data.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        with closing(self._conectar()) as conexao:
+            conexao.executescript(ESQUEMA)
+
+    def _conectar(self):
+        conexao = sqlite3.connect(self.caminho, timeout=10)
+        conexao.row_factory = sqlite3.Row
+        return conexao
+
+    def tem_boletim(self, numero_boletim):
+        with closing(self._conectar()) as conexao:
+            return conexao.execute("SELECT 1 FROM boletins WHERE numero_boletim = ?", (numero_boletim,)).fetchone() is not None
+
+    def url_importada(self, url):
+        with closing(self._conectar()) as conexao:
+            return conexao.execute("SELECT 1 FROM boletins WHERE url = ?", (url,)).fetchone() is not None
+
+    def registrar(self, registros, url=None):
+        """
+        Grava os registros de um boletim (mesmas colunas do CSV: Nome, Status, Zona, Periodo,
+        Dias_Periodo, Numero_Boletim, Tipos_Amostragem). Retorna quantos dias novos entraram.
+        """
+        registros = list(registros)
+        if not registros:
+            return 0
+        primeiro = registros[0]
+        linhas = []
+        for praia in registros:
+            dias = [d.strip() for d in str(praia.get("Dias_Periodo") or "").split(",") if d.strip()]
+            for dia in dias:
+                linhas.append((codigo_do_nome(praia["Nome"]), dia, praia["Nome"], praia.get("Zona"), praia.get("Status"), str(praia.get("Numero_Boletim"))))
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.execute(
+                "INSERT OR IGNORE INTO boletins (numero_boletim, periodo, tipos_amostragem, url, importado_em) VALUES (?, ?, ?, ?, ?)",
+                (str(primeiro.get("Numero_Boletim")), primeiro.get("Periodo"), primeiro.get("Tipos_Amostragem"), url, datetime.now().isoformat(timespec="seconds")),
+            )
+            antes = conexao.total_changes
+            conexao.executemany("INSERT OR IGNORE INTO status_diario VALUES (?, ?, ?, ?, ?, ?)", linhas)
+            return conexao.total_changes - antes
+
+    def status_em(self, codigo, data):
+        with closing(self._conectar()) as conexao:
+            linha = conexao.execute("SELECT * FROM status_diario WHERE codigo = ? AND data = ?", (codigo, data)).fetchone()
+        return dict(linha) if linha else None
+
+    def status_no_periodo(self, codigos, inicio, fim):
+        """Status de vários pontos em um intervalo de datas, em uma única consulta: {(codigo, data): registro}."""
+        codigos = list(dict.fromkeys(codigos))
+        if not codigos:
+            return {}
+        with closing(self._conectar()) as conexao:
+            linhas = conexao.execute(
+                f"SELECT * FROM status_diario WHERE codigo IN ({', '.join('?' * len(codigos))}) AND data BETWEEN ? AND ?",
+                (*codigos, inicio, fim),
+            ).fetchall()
+        return {(linha["codigo"], linha["data"]): dict(linha) for linha in linhas}
+
+    def historico_ponto(self, codigo, inicio, fim):
+        with closing(self._conectar()) as conexao:
+            linhas = conexao.execute(
+                "SELECT data, status, numero_boletim FROM status_diario WHERE codigo = ? AND data BETWEEN ? AND ? ORDER BY data",
+                (codigo, inicio, fim),
+            ).fetchall()
+        return [dict(linha) for linha in linhas]
+
+    def impropriedade_por_zona(self, inicio, fim, zona=None):
+        """Para cada zona, quantos pontos-dia foram amostrados no período e a fração imprópria."""
+        consulta = (
+            "SELECT zona, COUNT(*) AS amostras, SUM(status = 'Imprópria para banho') AS improprias "
+            "FROM status_diario WHERE data BETWEEN ? AND ?"
+        )
+        parametros = [inicio, fim]
+        if zona:
+            consulta += " AND zona = ?"
+            parametros.append(zona)
+        consulta += " GROUP BY zona ORDER BY zona"
+        with closing(self._conectar()) as conexao:
+            linhas = conexao.execute(consulta, parametros).fetchall()
+        return [
+            {"zona": l["zona"], "amostras": l["amostras"], "improprias": l["improprias"], "taxa_impropriedade": round(l["improprias"] / l["amostras"], 4)}
+            for l in linhas
+        ]
@@ -0,0 +1,96 @@
+# src/indice_espacial.py
+
+import math
+from collections import defaultdict
+
+RAIO_TERRA_KM = 6371.0088
+KM_POR_GRAU_LAT = math.pi * RAIO_TERRA_KM / 180
+
+# --- Distância em km entre dois pontos (lat, lon em graus) pela fórmula de haversine ---
+def haversine_km(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * RAIO_TERRA_KM * math.asin(math.sqrt(a))
+
+# --- Índice espacial em grade ---
+class IndiceEspacial:
+    """
+    Grade de células de `celula_km` x `celula_km` com os pontos de cada célula. A busca dos
+    vizinhos começa na célula da consulta e vai abrindo anéis de células ao redor, parando
+    quando os k mais próximos já encontrados estão mais perto do que qualquer ponto dos anéis
+    seguintes poderia estar (ou quando o raio é ultrapassado). Só os pontos das células
+    visitadas têm a distância calculada.
+    """
+
+    def __init__(self, pontos, celula_km=2.0):
+        #pontos: {chave: (lat, lon)}
+        self.pontos = dict(pontos)
+        self.celula_km = celula_km
+        self._dlat = celula_km / KM_POR_GRAU_LAT
+        #largura em graus de longitude na maior latitude (em módulo) dos pontos: células nunca menores que celula_km
+        lat_ref = max((abs(lat) for lat, _ in self.pontos.values()), default=0.0)
+        self._dlon = celula_km / (KM_POR_GRAU_LAT * max(math.cos(math.radians(lat_ref)), 1e-6))
+        self._celulas = defaultdict(list)
+        for chave, (lat, lon) in self.pontos.items():
+            self._celulas[self._celula(lat, lon)].append(chave)
+        linhas = [c[0] for c in self._celulas] or [0]
+        colunas = [c[1] for c in self._celulas] or [0]
+        self._limites = (min(linhas), max(linhas), min(colunas), max(colunas))
+
+    def __len__(self):
+        return len(self.pontos)
+
+    def _celula(self, lat, lon):
+        return (math.floor(lat / self._dlat), math.floor(lon / self._dlon))
+
+    def _anel(self, centro, r):
+        linha, coluna = centro
+        if r == 0:
+            yield centro
+            return
+        for dc in range(-r, r + 1):
+            yield (linha - r, coluna + dc)
+            yield (linha + r, coluna + dc)
+        for dl in range(-r + 1, r):
+            yield (linha + dl, coluna - r)
+            yield (linha + dl, coluna + r)
+
+    def _aneis_ate_cobrir(self, centro):
+        #quantos anéis até a grade inteira estar coberta a partir do centro
+        min_l, max_l, min_c, max_c = self._limites
+        return max(abs(centro[0] - min_l), abs(centro[0] - max_l), abs(centro[1] - min_c), abs(centro[1] - max_c))
+
+    def proximos(self, lat, lon, k=5, raio_km=None, filtro=None):
+        """
+        Retorna até `k` pares (chave, distância em km), do mais próximo ao mais distante,
+        dentro de `raio_km` (sem limite se None). `filtro(chave)` descarta pontos.
+        """
+        centro = self._celula(lat, lon)
+        min_l, max_l, min_c, max_c = self._limites
+        if not (min_l <= centro[0] <= max_l and min_c <= centro[1] <= max_c):
+            #consulta fora da área dos pontos: os anéis seriam quase todos vazios, então mede todos
+            return self._todos(lat, lon, k, raio_km, filtro)
+        encontrados = []
+        for r in range(self._aneis_ate_cobrir(centro) + 1):
+            #qualquer ponto fora dos anéis já vistos está a pelo menos r células de distância
+            distancia_minima = max(r - 1, 0) * self.celula_km
+            if raio_km is not None and distancia_minima > raio_km:
+                break
+            if len(encontrados) >= k and encontrados[k - 1][1] <= distancia_minima:
+                break
+            for celula in self._anel(centro, r):
+                for chave in self._celulas.get(celula, ()):
+                    if filtro is not None and not filtro(chave):
+                        continue
+                    plat, plon = self.pontos[chave]
+                    distancia = haversine_km(lat, lon, plat, plon)
+                    if raio_km is None or distancia <= raio_km:
+                        encontrados.append((chave, distancia))
+            encontrados.sort(key=lambda par: par[1])
+        return encontrados[:k]
+
+    def _todos(self, lat, lon, k, raio_km, filtro):
+        distancias = ((chave, haversine_km(lat, lon, plat, plon)) for chave, (plat, plon) in self.pontos.items() if filtro is None or filtro(chave))
+        return sorted((par for par in distancias if raio_km is None or par[1] <= raio_km), key=lambda par: par[1])[:k]
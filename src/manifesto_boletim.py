@@ -0,0 +1,36 @@
+# src/manifesto_boletim.py
+
+import json
+import os
+from datetime import datetime
+
+# --- Manifesto da última coleta do boletim ---
+#guarda os validadores HTTP (ETag/Last-Modified) da página de listagem e do PDF, a URL do
+#boletim, o hash do PDF e o número do boletim, para o scraper pular o que não mudou
+
+def carregar_manifesto(caminho):
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def salvar_manifesto(caminho, manifesto):
+    manifesto["verificado_em"] = datetime.now().isoformat(timespec="seconds")
+    caminho_tmp = caminho + ".tmp"
+    with open(caminho_tmp, "w", encoding="utf-8") as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=4)
+    os.replace(caminho_tmp, caminho)
+
+# --- Cabeçalhos de requisição condicional a partir do que foi salvo ---
+def cabecalhos_condicionais(registro):
+    cabecalhos = {}
+    if registro.get("etag"):
+        cabecalhos["If-None-Match"] = registro["etag"]
+    if registro.get("last_modified"):
+        cabecalhos["If-Modified-Since"] = registro["last_modified"]
+    return cabecalhos
+
+# --- Validadores devolvidos pelo servidor ---
+def validadores(response):
+    return {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
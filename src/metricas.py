@@ -0,0 +1,192 @@
+# src/metricas.py
+
+import bisect
+import contextvars
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+#limites (em segundos) dos baldes dos histogramas de latência
+LIMITES_PADRAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _rotulos(nomes, valores, extra=""):
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+def _numero(valor):
+    if math.isinf(valor):
+        return "+Inf"
+    return repr(float(valor)) if not float(valor).is_integer() else str(int(valor))
+
+# --- Contador (só aumenta), com rótulos ---
+class Contador:
+    tipo = "counter"
+
+    def __init__(self, nome, ajuda, rotulos=()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._valores = {}  # valores dos rótulos -> total
+        self._lock = threading.Lock()
+
+    def inc(self, valor=1, **rotulos):
+        chave = tuple(str(rotulos[nome]) for nome in self.rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def valor(self, **rotulos):
+        return self._valores.get(tuple(str(rotulos[nome]) for nome in self.rotulos), 0)
+
+    def amostras(self):
+        with self._lock:
+            return [f"{self.nome}{_rotulos(self.rotulos, chave)} {_numero(total)}" for chave, total in sorted(self._valores.items())]
+
+# --- Histograma com baldes fixos (cumulativos na exposição), com rótulos ---
+class Histograma:
+    tipo = "histogram"
+
+    def __init__(self, nome, ajuda, rotulos=(), limites=LIMITES_PADRAO):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self.limites = tuple(limites)
+        self._series = {}  # valores dos rótulos -> [contagem por balde (+Inf no fim), soma]
+        self._lock = threading.Lock()
+
+    def observar(self, valor, **rotulos):
+        chave = tuple(str(rotulos[nome]) for nome in self.rotulos)
+        balde = bisect.bisect_left(self.limites, valor)
+        with self._lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = self._series[chave] = [[0] * (len(self.limites) + 1), 0.0]
+            serie[0][balde] += 1
+            serie[1] += valor
+
+    def contagem(self, **rotulos):
+        serie = self._series.get(tuple(str(rotulos[nome]) for nome in self.rotulos))
+        return sum(serie[0]) if serie else 0
+
+    def amostras(self):
+        linhas = []
+        with self._lock:
+            for chave, (baldes, soma) in sorted(self._series.items()):
+                acumulado = 0
+                for limite, contagem in zip(self.limites + (math.inf,), baldes):
+                    acumulado += contagem
+                    le = 'le="%s"' % _numero(limite)
+                    linhas.append(f"{self.nome}_bucket{_rotulos(self.rotulos, chave, le)} {acumulado}")
+                linhas.append(f"{self.nome}_sum{_rotulos(self.rotulos, chave)} {_numero(soma)}")
+                linhas.append(f"{self.nome}_count{_rotulos(self.rotulos, chave)} {acumulado}")
+        return linhas
+
+# --- Valor calculado na hora da exposição (ex.: idade do boletim, acertos do cache) ---
+class Medidor:
+    def __init__(self, nome, ajuda, funcao, tipo="gauge"):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.funcao = funcao
+        self.tipo = tipo
+
+    def amostras(self):
+        valor = self.funcao()
+        return [] if valor is None else [f"{self.nome} {_numero(valor)}"]
+
+# --- Registro das métricas, exposto no formato de texto do Prometheus ---
+class RegistroMetricas:
+    def __init__(self):
+        self._metricas = {}
+
+    def registrar(self, metrica):
+        #registrar de novo o mesmo nome (ex.: módulo importado duas vezes) devolve a métrica existente
+        return self._metricas.setdefault(metrica.nome, metrica)
+
+    def contador(self, nome, ajuda, rotulos=()):
+        return self.registrar(Contador(nome, ajuda, rotulos))
+
+    def histograma(self, nome, ajuda, rotulos=(), limites=LIMITES_PADRAO):
+        return self.registrar(Histograma(nome, ajuda, rotulos, limites))
+
+    def medidor(self, nome, ajuda, funcao, tipo="gauge"):
+        return self.registrar(Medidor(nome, ajuda, funcao, tipo))
+
+    def exposicao(self):
+        linhas = []
+        for metrica in self._metricas.values():
+            linhas.append(f"# HELP {metrica.nome} {metrica.ajuda}")
+            linhas.append(f"# TYPE {metrica.nome} {metrica.tipo}")
+            linhas.extend(metrica.amostras())
+        return "\n".join(linhas) + "\n"
+
+REGISTRO = RegistroMetricas()
+
+# --- Métricas das chamadas externas (usadas pelos clientes síncrono e assíncrono) ---
+UPSTREAM_DURACAO = REGISTRO.histograma("api_upstream_duracao_segundos", "Duração das chamadas a serviços externos (com as novas tentativas).", ("servico",))
+UPSTREAM_ERROS = REGISTRO.contador("api_upstream_erros_total", "Chamadas externas que falharam sem resposta (rede, timeout ou disjuntor aberto).", ("servico",))
+UPSTREAM_NAO_200 = REGISTRO.contador("api_upstream_respostas_nao_200_total", "Respostas de serviços externos com status diferente de 200.", ("servico", "status"))
+
+# --- Perfil de uma requisição (tempo por etapa), para o cabeçalho Server-Timing ---
+class Perfil:
+    """
+    Acumula o tempo gasto em cada etapa de uma requisição (ex.: get_forecast, chamadas à
+    Open-Meteo). Etapas executadas em outras threads entram no mesmo perfil quando a tarefa é
+    enviada ao pool com `submeter`.
+    """
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.etapas = {}  # etapa -> [segundos, vezes]
+        self._lock = threading.Lock()
+
+    def registrar(self, etapa, segundos):
+        with self._lock:
+            total = self.etapas.setdefault(etapa, [0.0, 0])
+            total[0] += segundos
+            total[1] += 1
+
+    def vezes(self, prefixo):
+        with self._lock:
+            return sum(vezes for etapa, (_, vezes) in self.etapas.items() if etapa.startswith(prefixo))
+
+    def server_timing(self):
+        #formato do cabeçalho Server-Timing: etapa;dur=milissegundos;desc="N vezes"
+        with self._lock:
+            partes = [f'{etapa};dur={segundos * 1000:.1f};desc="{vezes}x"' for etapa, (segundos, vezes) in self.etapas.items()]
+        partes.append(f"total;dur={(time.perf_counter() - self.inicio) * 1000:.1f}")
+        return ", ".join(partes)
+
+_PERFIL = contextvars.ContextVar("perfil_requisicao", default=None)
+
+def iniciar_perfil():
+    perfil = Perfil()
+    _PERFIL.set(perfil)
+    return perfil
+
+def encerrar_perfil():
+    _PERFIL.set(None)
+
+def perfil_atual():
+    return _PERFIL.get()
+
+def submeter(executor, funcao, *args):
+    #executor.submit em que a tarefa roda com uma cópia do contexto (e do perfil) de quem a enviou
+    return executor.submit(contextvars.copy_context().run, funcao, *args)
+
+@contextmanager
+def medir(histograma, etapa=None, **rotulos):
+    """Observa a duração do bloco no histograma e, se houver perfil ativo, registra a etapa."""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracao = time.perf_counter() - inicio
+        histograma.observar(duracao, **rotulos)
+        perfil = _PERFIL.get()
+        if perfil is not None and etapa:
+            perfil.registrar(etapa, duracao)
@@ -0,0 +1,144 @@
+# src/prefetch_previsao.py
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from cache_previsao import chave_previsao, series_do_dia
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    try:
+        FUSO_FORTALEZA = ZoneInfo("America/Fortaleza")
+    except ZoneInfoNotFoundError:  # sem base de fusos (ex.: Windows sem tzdata)
+        FUSO_FORTALEZA = None
+except ImportError:
+    FUSO_FORTALEZA = None
+if FUSO_FORTALEZA is None:
+    #Fortaleza não tem horário de verão: UTC-3 o ano todo
+    FUSO_FORTALEZA = timezone(timedelta(hours=-3), "America/Fortaleza")
+
+# --- Data de hoje em Fortaleza (a das séries da Open-Meteo), independente do fuso do servidor ---
+def hoje_fortaleza():
+    return datetime.now(FUSO_FORTALEZA).date()
+
+# --- Pré-busca periódica das previsões de todos os pontos monitorados ---
+class PrefetchPrevisoes:
+    """
+    Thread que, a cada `intervalo` segundos, busca as séries horárias (tempo e marinha) dos
+    próximos `dias` dias (a partir de hoje em Fortaleza) para todos os `pontos` e guarda o
+    recorte de cada dia sob a chave daquele dia (a mesma chave do CACHE_PREVISAO). As rotas
+    consultam `obter(chave)` antes de ir à Open-Meteo, então datas dentro da janela são
+    respondidas sem chamada externa.
+
+    `buscar_periodo(pontos, inicio, fim)` devolve, na ordem dos pontos,
+    {"weather": SerieHoraria, "marine": SerieHoraria} com todas as horas do período.
+    Se uma pré-busca falhar, as séries anteriores continuam valendo.
+
+    Com `cache` (o CachePrevisao da API), as séries buscadas também são gravadas nele, valendo
+    por `intervalo` segundos, e chegam ao cache em disco compartilhado pelos workers. Antes de
+    buscar um grupo, o ciclo procura no cache: se outro worker já fez a pré-busca, as séries
+    são lidas de lá, sem chamada externa. A `trava` (TravaArquivo, opcional) faz os workers
+    esperarem a vez, para que só o primeiro busque na Open-Meteo.
+    """
+
+    def __init__(self, pontos, buscar_periodo, intervalo, dias=7, lote=50, hoje=hoje_fortaleza, cache=None, trava=None):
+        self.pontos = list(dict.fromkeys(pontos))
+        self.buscar_periodo = buscar_periodo
+        self.intervalo = intervalo
+        self.dias = dias
+        self.lote = lote
+        self._hoje = hoje
+        self.cache = cache
+        self.trava = trava
+        self._series = {}  # chave_previsao -> {"weather": SerieHoraria, "marine": SerieHoraria}
+        self.janela = None  # (primeiro dia, último dia) da última pré-busca
+        self.atualizado_em = None
+        self._parar = threading.Event()
+        self._thread = None
+        self.pid = None  # processo em que a thread foi iniciada
+
+    def __len__(self):
+        return len(self._series)
+
+    def obter(self, chave):
+        return self._series.get(chave)
+
+    def _do_cache(self, grupo, dias):
+        #{chave: séries} do grupo inteiro, se todos os pontos e dias estão no cache; senão None
+        if self.cache is None:
+            return None
+        encontradas = {}
+        for lat, lon in grupo:
+            for dia in dias:
+                chave = chave_previsao(lat, lon, dia)
+                encontradas[chave] = self.cache.obter(chave)
+                if encontradas[chave] is None:
+                    return None
+        return encontradas
+
+    def _buscar_grupo(self, grupo, dias):
+        #{chave: séries do dia} buscadas na Open-Meteo e gravadas no cache
+        resultados = self.buscar_periodo(grupo, dias[0], dias[-1])
+        buscadas = {}
+        for (lat, lon), series in zip(grupo, resultados):
+            #cada dia guarda só as suas horas (e não a série da janela inteira)
+            for dia in set(series["weather"].dias()) | set(series["marine"].dias()):
+                buscadas[chave_previsao(lat, lon, dia)] = series_do_dia(series, dia)
+        if self.cache is not None and buscadas:
+            self.cache.guardar_lote(list(buscadas.items()), ttl=self.intervalo)
+        return buscadas
+
+    def ciclo(self):
+        inicio = self._hoje()
+        dias = [(inicio + timedelta(days=i)).isoformat() for i in range(self.dias)]
+        #parte do que já existe na nova janela; cada lote bem-sucedido sobrescreve os seus pontos
+        novas = {chave: valor for chave, valor in self._series.items() if dias[0] <= chave[2] <= dias[-1]}
+        buscados = 0
+        if self.trava is not None:
+            self.trava.adquirir()
+        try:
+            for i in range(0, len(self.pontos), self.lote):
+                grupo = self.pontos[i:i + self.lote]
+                try:
+                    series = self._do_cache(grupo, dias) or self._buscar_grupo(grupo, dias)
+                except Exception as erro:
+                    print(f"Falha na pré-busca de previsões, mantendo as anteriores: {erro}")
+                    continue
+                novas.update(series)
+                buscados += len({chave[:2] for chave in series})
+        finally:
+            if self.trava is not None:
+                self.trava.liberar()
+        #troca de uma vez: leitores veem o dicionário antigo ou o novo, nunca um pela metade
+        self._series = novas
+        if buscados:
+            self.janela = (dias[0], dias[-1])
+            self.atualizado_em = time.time()
+        return buscados
+
+    def _loop(self):
+        #a primeira pré-busca é feita logo ao iniciar
+        while True:
+            try:
+                self.ciclo()
+            except Exception as erro:
+                print(f"Falha na pré-busca de previsões: {erro}")
+            if self._parar.wait(self.intervalo):
+                break
+
+    def ativo(self):
+        #depois de um fork, o objeto herdado tem _thread, mas a thread ficou no processo pai
+        return self._thread is not None and self.pid == os.getpid() and self._thread.is_alive()
+
+    def iniciar(self):
+        if self.ativo():
+            return self
+        self.pid = os.getpid()
+        self._thread = threading.Thread(target=self._loop, name="prefetch-previsoes", daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self._parar.set()
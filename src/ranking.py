@@ -0,0 +1,65 @@
+# src/ranking.py
+
+import numpy as np
+
+# --- Fatores da pontuação: (nome, campo da previsão, valor a partir do qual a nota é zero) ---
+#para todos os fatores, quanto menor o valor, melhor para o banho
+FATORES = [
+    ("ondas", "altura_ondas_m", 2.5),
+    ("vento", "velocidade_vento_kmh", 40.0),
+    ("chuva", "chuva_mm", 5.0),
+    ("nuvens", "cobertura_nuvens_pct", 100.0),
+]
+#pesos padrão; cada um pode ser trocado na consulta com ?peso_<fator>=...
+PESOS_PADRAO = {"status": 1.0, "ondas": 3.0, "vento": 2.0, "chuva": 3.0, "nuvens": 1.0}
+#nota de um fator sem previsão disponível (nem premia nem pune)
+NOTA_SEM_DADOS = 0.5
+STATUS_PROPRIA = "Própria para banho"
+
+# --- Pesos informados na consulta (?peso_ondas=5&peso_nuvens=0) ---
+def pesos_da_consulta(args):
+    #ValueError para pesos que não são números não negativos ou que somam zero
+    pesos = dict(PESOS_PADRAO)
+    for fator in pesos:
+        valor = args.get(f"peso_{fator}")
+        if valor is not None:
+            pesos[fator] = float(valor)
+            if not np.isfinite(pesos[fator]) or pesos[fator] < 0:
+                raise ValueError(f"peso_{fator} deve ser um número maior ou igual a zero")
+    if sum(pesos.values()) == 0:
+        raise ValueError("Pelo menos um peso deve ser maior que zero")
+    return pesos
+
+# --- Pontuação de todas as praias de uma vez ---
+def ranquear(praias, previsoes, pesos, k):
+    """
+    Calcula a pontuação (0 a 100) de cada praia a partir do status da SEMACE e da previsão
+    na mesma posição de `previsoes`, em uma única passada de NumPy sobre todos os pontos:
+    cada fator vira uma nota entre 0 e 1 (1 = ideal) e a pontuação é a média ponderada das
+    notas. Retorna as `k` melhores, da maior para a menor pontuação, com o detalhamento.
+    """
+    if not praias:
+        return []
+    nomes = ["status"] + [nome for nome, _, _ in FATORES]
+    #None vira NaN na conversão para float
+    valores = np.array([[previsao.get(campo) for _, campo, _ in FATORES] for previsao in previsoes], dtype=float)
+    limites = np.array([limite for _, _, limite in FATORES])
+    notas_previsao = 1.0 - np.clip(valores / limites, 0.0, 1.0)
+    notas_previsao = np.where(np.isnan(notas_previsao), NOTA_SEM_DADOS, notas_previsao)
+    notas_status = np.array([1.0 if praia.get("Status") == STATUS_PROPRIA else 0.0 for praia in praias])
+    notas = np.column_stack([notas_status, notas_previsao])
+
+    vetor_pesos = np.array([pesos[nome] for nome in nomes])
+    pontuacao = notas @ vetor_pesos / vetor_pesos.sum() * 100
+
+    #ordenação estável: empates ficam na ordem do boletim
+    melhores = np.argsort(-pontuacao, kind="stable")[:k]
+    ranking = []
+    for posicao, i in enumerate(melhores, start=1):
+        praia = praias[i]
+        fatores = {"status": {"valor": praia.get("Status"), "nota": round(float(notas[i, 0]), 3), "peso": pesos["status"]}}
+        for j, (nome, campo, _) in enumerate(FATORES, start=1):
+            valor = valores[i, j - 1]
+            fatores[nome] = {"valor": None if np.isnan(valor) else float(valor), "nota": round(float(notas[i, j]), 3), "peso": pesos[nome]}
+        ranking.append({"posicao": posicao, "id": praia["id"], "nome": praia["Nome"], "zona": praia.get("Zona"), "pontuacao": round(float(pontuacao[i]), 1), "fatores": fatores})
+    return ranking
@@ -0,0 +1,67 @@
+# src/relatorio_execucao.py
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource  # só existe em sistemas Unix
+except ImportError:
+    resource = None
+
+# --- Pico de memória (RSS máximo) do processo ou dos processos filhos, em MB ---
+def pico_memoria_mb(filhos=False):
+    if resource is None:
+        return None
+    maximo = resource.getrusage(resource.RUSAGE_CHILDREN if filhos else resource.RUSAGE_SELF).ru_maxrss
+    #o Linux informa em KiB e o macOS em bytes
+    return round(maximo / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+# --- Relatório de uma execução do scraper (tempo por etapa, memória e contagem de linhas) ---
+class RelatorioExecucao:
+    """
+    Acumula o tempo de parede de cada etapa, o pico de memória ao fim de cada uma e as
+    contagens de linhas da execução, e grava tudo em JSON. O pico de memória é o do processo
+    até aquele ponto (não da etapa isolada): a etapa em que ele sobe é a que mais alocou. O
+    pico dos processos filhos cobre a extração paralela do Camelot.
+    """
+
+    def __init__(self, **dados):
+        self.inicio = time.perf_counter()
+        self.dados = {"iniciado_em": datetime.now().isoformat(timespec="seconds"), **dados}
+        self.etapas = {}  # etapa -> {"segundos": ..., "pico_memoria_mb": ...}
+        self.linhas = {}
+
+    @contextmanager
+    def etapa(self, nome):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.etapas[nome] = {"segundos": round(time.perf_counter() - inicio, 4), "pico_memoria_mb": pico_memoria_mb()}
+
+    def contar(self, **linhas):
+        self.linhas.update({nome: int(valor) for nome, valor in linhas.items()})
+
+    def registrar(self, **dados):
+        self.dados.update(dados)
+
+    def como_dict(self):
+        return {
+            **self.dados,
+            "duracao_segundos": round(time.perf_counter() - self.inicio, 4),
+            "etapas": self.etapas,
+            "linhas": self.linhas,
+            "pico_memoria_mb": pico_memoria_mb(),
+            "pico_memoria_filhos_mb": pico_memoria_mb(filhos=True),
+        }
+
+    def salvar(self, caminho):
+        #grava em um temporário e troca de uma vez, como o CSV
+        caminho_tmp = caminho + ".tmp"
+        with open(caminho_tmp, "w", encoding="utf-8") as f:
+            json.dump(self.como_dict(), f, ensure_ascii=False, indent=2)
+        os.replace(caminho_tmp, caminho)
@@ -0,0 +1,65 @@
+# src/repositorio.py
+
+from collections import defaultdict
+
+# --- Quebra o campo Dias_Periodo ("2025-09-08, 2025-09-09, ...") em uma lista de datas ---
+def dias_do_periodo(valor):
+    if not isinstance(valor, str) or not valor.strip():
+        return ()
+    return tuple(d.strip() for d in valor.split(",") if d.strip())
+
+# --- Repositório de praias indexado na carga ---
+class RepositorioPraias:
+    """
+    Guarda os registros do boletim e monta, uma única vez, os índices usados pelas rotas:
+    id -> registro, status -> ids, zona -> ids e data -> ids (a partir de Dias_Periodo).
+    Os filtros viram buscas em dicionário e interseção de conjuntos, sem percorrer a lista.
+    """
+
+    def __init__(self, registros, dias_por_id=None):
+        #dias_por_id: datas de cada id já separadas (vêm prontas do snapshot do scraper)
+        self.registros = list(registros)
+        self.por_id = {}
+        self.ids_por_status = defaultdict(set)
+        self.ids_por_zona = defaultdict(set)
+        self.ids_por_data = defaultdict(set)
+        self.dias_por_id = {}
+        self._posicao = {}  # id -> posição no boletim, para manter a ordem original
+        for posicao, praia in enumerate(self.registros):
+            id_praia = praia["id"]
+            self.por_id[id_praia] = praia
+            self._posicao[id_praia] = posicao
+            self.ids_por_status[praia.get("Status")].add(id_praia)
+            self.ids_por_zona[praia.get("Zona")].add(id_praia)
+            dias = dias_por_id[id_praia] if dias_por_id is not None else dias_do_periodo(praia.get("Dias_Periodo"))
+            self.dias_por_id[id_praia] = frozenset(dias)
+            for dia in dias:
+                self.ids_por_data[dia].add(id_praia)
+
+    def __len__(self):
+        return len(self.registros)
+
+    def buscar(self, id_praia):
+        return self.por_id.get(id_praia)
+
+    def tem_boletim(self, id_praia, data):
+        return data in self.dias_por_id.get(id_praia, ())
+
+    def consultar(self, status=None, zona=None, data=None):
+        """
+        Retorna as praias que atendem a todos os filtros informados (status, zona e data),
+        na ordem do boletim. Filtros `None` são ignorados.
+        """
+        conjuntos = []
+        if status is not None:
+            conjuntos.append(self.ids_por_status.get(status, set()))
+        if zona is not None:
+            conjuntos.append(self.ids_por_zona.get(zona, set()))
+        if data is not None:
+            conjuntos.append(self.ids_por_data.get(data, set()))
+        if not conjuntos:
+            return list(self.registros)
+        #começa pelo menor conjunto para a interseção sair mais barata
+        conjuntos.sort(key=len)
+        ids = set(conjuntos[0]).intersection(*conjuntos[1:])
+        return [self.por_id[i] for i in sorted(ids, key=self._posicao.__getitem__)]
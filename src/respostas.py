@@ -0,0 +1,38 @@
+# src/respostas.py
+
+import hashlib
+import json
+
+# --- Serialização JSON (com acentos) em bytes UTF-8 ---
+def serializar(data, compacto=False):
+    if compacto:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, indent=4).encode("utf-8")
+
+# --- Corpo já serializado, com seu ETag ---
+class RespostaPronta:
+    def __init__(self, corpo, status=200):
+        self.corpo = corpo
+        self.status = status
+        #ETag forte: muda sempre que o conteúdo muda
+        self.etag = hashlib.sha1(corpo).hexdigest()
+
+# --- Conjunto de respostas pré-renderizadas ---
+class RespostasPreRenderizadas:
+    """
+    Guarda o corpo das respostas que só mudam quando o boletim muda, serializado uma
+    única vez nas duas formas (indentada e compacta). As rotas apenas devolvem os bytes.
+    """
+
+    def __init__(self):
+        self._respostas = {}  # (chave, compacto) -> RespostaPronta
+
+    def __len__(self):
+        return len(self._respostas)
+
+    def adicionar(self, chave, data, status=200):
+        for compacto in (False, True):
+            self._respostas[(chave, compacto)] = RespostaPronta(serializar(data, compacto), status)
+
+    def obter(self, chave, compacto=False):
+        return self._respostas.get((chave, compacto))
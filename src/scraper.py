@@ -1,14 +1,21 @@
-import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
-import pdfplumber
 import unicodedata
 from datetime import datetime, timedelta
-import camelot
 import pandas as pd
 import os
+import sys
+import hashlib
+import tempfile
 
 from coordenadas import COORDENADAS_POR_CODIGO
+from cliente_http import SEMACE
+from historico import HistoricoBoletins
+from snapshot_boletim import caminho_snapshot, registros_do_dataframe, salvar_snapshot
+from extracao_tabelas import extrair_tabelas_brutas, normalizar_tabelas_contando_ruido
+from extracao_pdfplumber import tabelas_do_boletim, extrair_metadados
+from manifesto_boletim import carregar_manifesto, salvar_manifesto, cabecalhos_condicionais, validadores
+from relatorio_execucao import RelatorioExecucao
 
 # --- Extrair primeiros caracteres do nome das praias
 def extract_point_code(nome: str) -> str:
@@ -59,201 +66,320 @@ def classify_zona(nome: str) -> str:
     if any(k in n for k in oeste_kw): return "Oeste"
     return "Desconhecida"
 
-print(classify_zona("Praia do Pirambu"))
-
-# --- Baixar o boletim mais recente da Sema ---
-url_base = "https://www.semace.ce.gov.br/boletim-de-balneabilidade/"
-res = requests.get(url_base)
-soup = BeautifulSoup(res.text, "html.parser")
-
-links_boletim = [
-    a['href'] for a in soup.find_all('a', href=True) #percorre todas as tags <a> que possuem atributo href e guarda apenas o valor do link (URL)
-    if "Boletim das Praias de Fortaleza" in a.get_text() #link do boletim correspondente á cidade de Fortaleza
-]
-
-if not links_boletim:
-    raise ValueError("Nenhum boletim encontrado.")
-
-ultimo_boletim_url = urljoin(url_base, links_boletim[0])
-#print("Último boletim:", ultimo_boletim_url)
-
-#--- Baixar o arquivo .pdf ---
-res = requests.get(ultimo_boletim_url, stream=True)
-arquivo_pdf = "boletim_fortaleza.pdf"
-with open(arquivo_pdf, "wb") as f:
-    for chunk in res.iter_content(8192):
-        f.write(chunk)
-
-print(f"PDF salvo em {arquivo_pdf}")
-
-#--- Extração de metadados ---
-arquivo_pdf = "boletim_fortaleza.pdf"
-
-with pdfplumber.open(arquivo_pdf) as pdf:
-    texto_pg1 = pdf.pages[0].extract_text()
-    texto_pg1 = " ".join(texto_pg1.split())  # tudo em uma linha
-
-periodo = ""
-numero_boletim = ""
-tipos_amostragem = ""
-
-if "Nº" in texto_pg1 and "Período:" in texto_pg1 and "Tipos de amostras:" in texto_pg1:
-    bol_index = texto_pg1.find("Nº")
-    per_index = texto_pg1.find("Período:", bol_index)
-    tipos_index = texto_pg1.find("Tipos de amostras:", per_index)
-
-    numero_boletim = texto_pg1[bol_index + 2:per_index].strip()
-    periodo = texto_pg1[per_index + len("Período:"):tipos_index].strip()
-
-    # pega só até o primeiro ponto final (.)
-    resto = texto_pg1[tipos_index + len("Tipos de amostras:"):].strip()
-    tipos_amostragem = resto.split(".")[0].strip()
-
-# gera lista de dias a partir do período
-dias_periodo = expand_periodo(periodo)
-data_extracao = datetime.today().strftime("%Y-%m-%d")
-
-# --- Extração das tabelas ---
-arquivo_pdf = "boletim_fortaleza.pdf"
-
-#extrai todas as tabelas do boletim
-tables = camelot.read_pdf(arquivo_pdf, pages="1-end", flavor="stream")
-print("Total de tabelas encontradas:", len(tables))
-
-#exibe as primeiras linhas da primeira tabela
-if tables:
-    print(tables[0].df.head())
-
-#--- Filtragem de dados da tabela e normalização ---
-
-#limpeza dos status em 'P' ou 'I'
-def clean_status_token(tok: str) -> str:
-    #remove espaços extras e converte para maiúscula
-    tok = tok.strip().upper()
-    #retorna apenas se for P (Própria) ou I (Imprópria), caso contrário retorna vazio
-    return tok if tok in ("P", "I") else ""
-
-#verifica se a linha é ruído (não contém informação válida de praia)
-def is_noise_row(nome: str, status: str) -> bool:
-    #junta nome e status em uma string só (em minúsculo)
-    txt = f"{str(nome)} {str(status)}".lower()
-    #palavras-chave que indicam linha inútil (títulos, rodapés, cabeçalhos, etc.)
-    noise_terms = ["nome", "status", "trecho", "ponto", "boletim", "semace"]
-    #se a linha tiver menos de 3 caracteres, é descartada
-    if len(txt.strip()) < 3:
-        return True
-    #se tiver qualquer palavra de ruído, também é descartada
-    return any(term in txt for term in noise_terms)
-
-#lista para acumular dfs
-dfs_norm = []
-
-#iteração sobre todas as tabelas detectadas pelo Camelot
-for t in tables:
-    df_raw = t.df.copy()  #copia a tabela bruta
-    if df_raw.shape[1] < 2:
-        continue  #ignora tabelas inválidas com menos de 2 colunas
-
-    #mantém apenas as duas primeiras colunas (Nome e Status)
-    df_raw = df_raw.iloc[:, :2]
-    df_raw.columns = ["Nome", "Status"]
-
-    linhas = []  #lista para armazenar os registros válidos
-
-    #percorre cada linha da tabela
-    for _, row in df_raw.iterrows():
-        #quebra o campo "Nome" em várias linhas (caso contenha "\n") e remove espaços extras
-        nomes = [x.strip() for x in row["Nome"].split("\n") if x.strip()]
-        #faz o mesmo para "Status", limpando os tokens com clean_status_token
-        status_tokens = [clean_status_token(x) for x in row["Status"].split("\n")]
-        status_tokens = [x for x in status_tokens if x]  # remove vazios
-
-        #caso não não tem nome ou status, pula a linha
-        if not nomes or not status_tokens:
+# --- Caminhos de saída (pasta raiz do projeto) ---
+PASTA_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+#manifesto, relatório e PDF baixado ficam ao lado do CSV, com o mesmo nome (boletim_fortaleza.*)
+CAMINHO_CSV = os.path.join(PASTA_RAIZ, "boletim_fortaleza.csv")
+
+#configurável para apontar o scraper para uma SEMACE falsa local (benchmarks e testes)
+URL_LISTAGEM = os.environ.get("SEMACE_LISTAGEM_URL", "https://www.semace.ce.gov.br/boletim-de-balneabilidade/")
+
+#interrompe a execução quando não há boletim novo para processar
+class SemAlteracoes(Exception):
+    pass
+
+# --- Listagem de boletins na página da SEMACE ---
+def parse_listing(html, url=URL_LISTAGEM):
+    #urls absolutas dos boletins de Fortaleza, do mais recente ao mais antigo
+    soup = BeautifulSoup(html, "html.parser")
+    return [
+        urljoin(url, a['href']) for a in soup.find_all('a', href=True) #percorre todas as tags <a> que possuem atributo href e guarda apenas o valor do link (URL)
+        if "Boletim das Praias de Fortaleza" in a.get_text() #link do boletim correspondente á cidade de Fortaleza
+    ]
+
+def fetch_listing(url=URL_LISTAGEM, headers=None):
+    #retorna (resposta, urls dos boletins); as urls são None quando o servidor responde 304 (a página não mudou)
+    res = SEMACE.get(url, headers=headers or {})
+    if res.status_code == 304:
+        return res, None
+    res.raise_for_status()
+    links_boletim = parse_listing(res.text, url)
+    if not links_boletim:
+        raise ValueError("Nenhum boletim encontrado.")
+    return res, links_boletim
+
+# --- Baixar um PDF calculando seu hash ---
+def download_pdf(url, destino, headers=None):
+    #retorna (resposta, sha256); sha256 é None quando o servidor responde 304
+    res = SEMACE.get(url, stream=True, headers=headers or {})
+    if res.status_code == 304:
+        return res, None
+    res.raise_for_status()
+    hash_pdf = hashlib.sha256()
+    with open(destino, "wb") as f:
+        for chunk in res.iter_content(8192):
+            hash_pdf.update(chunk)
+            f.write(chunk)
+    return res, hash_pdf.hexdigest()
+
+# --- Leitura do PDF pelo motor escolhido ---
+#camelot (padrão): metadados pelo pdfplumber e tabelas pelo Camelot, em processos paralelos;
+#pdfplumber: metadados e tabelas em uma única passada, sem carregar o Camelot/OpenCV
+MOTORES = ("camelot", "pdfplumber")
+
+def ler_boletim(arquivo_pdf, motor):
+    #retorna (tabelas brutas, (numero_boletim, periodo, tipos_amostragem)); com o Camelot, as
+    #tabelas são None e só são extraídas depois (extrair_tabelas_brutas), se o boletim ainda não foi processado
+    if motor == "pdfplumber":
+        return tabelas_do_boletim(arquivo_pdf)
+    return None, extrair_metadados(arquivo_pdf)
+
+# --- Leitura do boletim: metadados e linhas (Nome, Status) normalizadas ---
+def parse_bulletin(pdf, motor="camelot", relatorio=None, numero_processado=None, processos=None):
+    """
+    Lê um boletim em PDF (caminho ou bytes) e devolve um dicionário com os metadados
+    (numero_boletim, periodo, tipos_amostragem) e as linhas normalizadas em "linhas"
+    ([{"Nome": ..., "Status": "P" ou "I"}]). Se o número do boletim for `numero_processado`,
+    as tabelas não são extraídas e "linhas" vem None. `processos` limita os processos da
+    extração com o Camelot (1: tudo no próprio processo).
+    """
+    if isinstance(pdf, (bytes, bytearray)):
+        #o Camelot e o pdfplumber leem de um arquivo
+        with tempfile.TemporaryDirectory() as pasta:
+            arquivo_pdf = os.path.join(pasta, "boletim.pdf")
+            with open(arquivo_pdf, "wb") as f:
+                f.write(pdf)
+            return parse_bulletin(arquivo_pdf, motor, relatorio, numero_processado, processos)
+
+    relatorio = relatorio or RelatorioExecucao()
+    #com o motor pdfplumber, as tabelas vêm na mesma passada dos metadados
+    with relatorio.etapa("metadados"):
+        tabelas, (numero_boletim, periodo, tipos_amostragem) = ler_boletim(pdf, motor)
+    boletim = {"numero_boletim": numero_boletim, "periodo": periodo, "tipos_amostragem": tipos_amostragem, "linhas": None}
+    #PDF diferente, mas mesmo número de boletim já processado: pula a extração das tabelas (camelot)
+    if numero_boletim and numero_boletim == numero_processado:
+        return boletim
+
+    if tabelas is None:
+        #as páginas do PDF são divididas entre `processos` (padrão: SCRAPER_PROCESSOS ou núcleos da máquina)
+        with relatorio.etapa("extracao"):
+            tabelas = extrair_tabelas_brutas(pdf, processos)
+    with relatorio.etapa("normalizacao"):
+        df_tabelas, ruido = normalizar_tabelas_contando_ruido(tabelas)
+    relatorio.contar(linhas_tabelas=sum(len(t) for t in tabelas), linhas_ruido=ruido, linhas_extraidas=len(df_tabelas))
+    boletim["linhas"] = df_tabelas.to_dict(orient="records")
+    return boletim
+
+# --- Montagem do dataset final (limpeza, metadados, ids e coordenadas) ---
+def montar_dataset(df, numero_boletim, periodo, tipos_amostragem, mostrar=True):
+    # gera lista de dias a partir do período
+    dias_periodo = expand_periodo(periodo)
+    data_extracao = datetime.today().strftime("%Y-%m-%d")
+
+    # --- Limpeza do campo 'Nome'
+    df["Nome"] = df["Nome"].apply(lambda x: " ".join(x.split()))
+    df = df.drop_duplicates(subset=["Nome"]).reset_index(drop=True)
+
+    #teste
+    if mostrar:
+        print(df)
+
+    # --- Dados da amostragem
+
+    df["Zona"] = df["Nome"].apply(classify_zona)
+    df["Periodo"] = periodo
+    df["Dias_Periodo"] = [", ".join(dias_periodo)] * len(df)
+    df["Numero_Boletim"] = numero_boletim
+    df["Tipos_Amostragem"] = tipos_amostragem
+    df["Data_Extração"] = data_extracao
+
+    #teste
+    if mostrar:
+        print("Metadados adicionados ao dataset:")
+        print(df[["Nome", "Periodo", "Numero_Boletim", "Tipos_Amostragem"]].head())
+
+    #traduz status para própria para banho ou imprópria para banho
+    df["Status"] = df["Status"].map({
+        "P": "Própria para banho",
+        "I": "Imprópria para banho"
+    })
+
+    #teste
+    if mostrar:
+        print("Status traduzidos:")
+        print(df[["Nome", "Status"]].head())
+
+    #coluna com os ids para cada praia
+    df.insert(0, "id", range(1, len(df) + 1))
+
+    #teste
+    if mostrar:
+        print("Dataset com ID sequencial:")
+        print(df.head())
+
+    # --- Adicionar coordenadas geográficas ---
+    df["Coordenadas"] = df["Nome"].apply(lambda n: COORDENADAS_POR_CODIGO.get(extract_point_code(n), None))
+
+    #teste
+    if mostrar:
+        print("Amostra de dataset com coordenadas:")
+        print(df[["Nome", "Coordenadas"]].head(10))
+
+    miss = df["Coordenadas"].isna().sum()
+    print(f"Total de pontos SEM coordenadas mapeadas: {miss}")
+    return df
+
+# --- Registros do dataset (mesmas colunas do CSV) a partir do boletim lido ---
+def build_dataset(boletim, relatorio=None, mostrar=True):
+    relatorio = relatorio or RelatorioExecucao()
+    df_tabelas = pd.DataFrame(boletim["linhas"], columns=["Nome", "Status"])
+    print(f"Total de linhas extraídas das tabelas: {len(df_tabelas)}")
+    if mostrar:
+        print(df_tabelas.head())
+    with relatorio.etapa("montagem"):
+        df = montar_dataset(df_tabelas, boletim["numero_boletim"], boletim["periodo"], boletim["tipos_amostragem"], mostrar)
+        registros = registros_do_dataframe(df)
+    relatorio.contar(
+        linhas_duplicadas=len(df_tabelas) - len(df),
+        linhas_sem_coordenadas=df["Coordenadas"].isna().sum(),
+        linhas_dataset=len(df),
+    )
+    return registros
+
+# --- Gravação do snapshot binário (lido pela API) e do .csv (para consulta humana) ---
+def write_dataset(registros, caminho_csv):
+    #escreve em um arquivo temporário e troca de uma vez, para a API nunca ler um CSV pela metade
+    caminho_tmp = caminho_csv + ".tmp"
+    pd.DataFrame(registros).to_csv(caminho_tmp, index=False, encoding="utf-8")
+    #o snapshot leva a assinatura do CSV novo e é gravado antes da troca: quando a API
+    #perceber a mudança do CSV, o snapshot correspondente já está pronto
+    salvar_snapshot(caminho_snapshot(caminho_csv), registros, caminho_tmp)
+    os.replace(caminho_tmp, caminho_csv)
+    print(f"CSV salvo em: {caminho_csv}")
+
+# --- Modo histórico completo: importa todos os boletins listados ---
+def importar_historico(links_boletim, motor, caminho_historico, arquivo_pdf, relatorio, mostrar=True, processos=None):
+    historico = HistoricoBoletins(caminho_historico)
+    importados = falhas = 0
+    for url_pdf in links_boletim:
+        if historico.url_importada(url_pdf):
             continue
-
-        #isso aqui é para corrigir um caso em que vários status apareciam para uma única linha; 
-        #um único status para várias praias (ex: várias linhas de nomes, mas só um "P")
-        if len(status_tokens) == 1 and len(nomes) > 1:
-            for n in nomes:
-                if not is_noise_row(n, status_tokens[0]):
-                    linhas.append({"Nome": n, "Status": status_tokens[0]})
-        else:
-            #caso mais comum: cada nome tem um status correspondente
-            #verificar esse zip
-            for n, s in zip(nomes, status_tokens):
-                if not is_noise_row(n, s):
-                    linhas.append({"Nome": n, "Status": s})
-
-    #se encontrou linhas válidas nessa tabela, adiciona ao conjunto
-    if linhas:
-        dfs_norm.append(pd.DataFrame(linhas))
-
-#junta todos os dfs das tabelas em um só
-df = pd.concat(dfs_norm, ignore_index=True) if dfs_norm else pd.DataFrame(columns=["Nome","Status"])
-
-#teste
-print(df.head())
-
-
-# --- Limpeza do campo 'Nome'
-df["Nome"] = df["Nome"].apply(lambda x: " ".join(x.split()))
-df = df.drop_duplicates(subset=["Nome"]).reset_index(drop=True)
-
-#teste
-print(df)
-
-# --- Dados da amostragem
-
-df["Zona"] = df["Nome"].apply(classify_zona)
-df["Periodo"] = periodo
-df["Dias_Periodo"] = [", ".join(dias_periodo)] * len(df)
-df["Numero_Boletim"] = numero_boletim
-df["Tipos_Amostragem"] = tipos_amostragem
-df["Data_Extração"] = data_extracao
-
-#teste
-print("Metadados adicionados ao dataset:")
-print(df[["Nome", "Periodo", "Numero_Boletim", "Tipos_Amostragem"]].head())
-
-#traduz status para própria para banho ou imprópria para banho
-df["Status"] = df["Status"].map({
-    "P": "Própria para banho",
-    "I": "Imprópria para banho"
-})
-
-#teste
-print("Status traduzidos:")
-print(df[["Nome", "Status"]].head())
-
-#coluna com os ids para cada praia
-df.insert(0, "id", range(1, len(df) + 1))
-
-#teste
-print("Dataset com ID sequencial:")
-print(df.head())
-
-# --- Adicionar coordenadas geográficas ---
-df["Coordenadas"] = df["Nome"].apply(lambda n: COORDENADAS_POR_CODIGO.get(extract_point_code(n), None))
-
-#teste
-print("Amostra de dataset com coordenadas:")
-print(df[["Nome", "Coordenadas"]].head(10))
-
-miss = df["Coordenadas"].isna().sum()
-print(f"Total de pontos SEM coordenadas mapeadas: {miss}")
-
-
-
-# --- Salvar os dados em .csv ---
-
-#caminho para a pasta raiz do projeto (uma pasta acima da atual)
-pasta_raiz = os.path.dirname(os.path.abspath(__file__))
-caminho_csv = os.path.join(os.path.dirname(pasta_raiz), "boletim_fortaleza.csv")
-
-df.to_csv(caminho_csv, index=False, encoding="utf-8")
-print(f"CSV salvo em: {caminho_csv}")
-
-#teste
-print("Prévia do CSV exportado:")
-print(df.head(10))
\ No newline at end of file
+        try:
+            download_pdf(url_pdf, arquivo_pdf)
+            #o número vem da primeira página; boletim já no histórico não passa pela extração das tabelas
+            numero = extrair_metadados(arquivo_pdf)[0]
+            if not numero or historico.tem_boletim(numero):
+                continue
+            boletim = parse_bulletin(arquivo_pdf, motor, processos=processos)
+            novos = historico.registrar(build_dataset(boletim, mostrar=mostrar), url=url_pdf)
+            importados += 1
+            print(f"Boletim Nº {numero} importado para o histórico ({novos} registros diários).")
+        except Exception as erro:
+            #boletins antigos podem ter outro layout; segue para o próximo
+            falhas += 1
+            print(f"Falha ao importar {url_pdf}: {erro}")
+    relatorio.registrar(boletins_importados=importados, boletins_com_falha=falhas)
+
+# --- Coleta do boletim mais recente: da listagem à gravação do CSV ---
+def _coletar(manifesto, motor, caminho_csv, caminho_historico, relatorio, backfill, mostrar, processos=None):
+    base = os.path.splitext(caminho_csv)[0]
+    #requisição condicional: 304 significa que a página (e portanto o boletim) não mudou
+    with relatorio.etapa("listagem"):
+        res, links_boletim = fetch_listing(URL_LISTAGEM, {} if backfill else cabecalhos_condicionais(manifesto.get("listagem", {})))
+    if links_boletim is None:
+        raise SemAlteracoes("página de boletins não mudou")
+    manifesto["listagem"] = {"url": URL_LISTAGEM, **validadores(res)}
+
+    if backfill:
+        arquivo_historico = os.path.join(os.path.dirname(caminho_csv), "boletim_historico.pdf")
+        importar_historico(links_boletim, motor, caminho_historico, arquivo_historico, relatorio, mostrar, processos)
+        return
+
+    ultimo_boletim_url = links_boletim[0]
+
+    #--- Baixar o arquivo .pdf ---
+    registro_anterior = manifesto.get("boletim", {})
+    #só faz sentido mandar ETag/Last-Modified se o link ainda é o mesmo
+    mesmo_link = registro_anterior.get("url") == ultimo_boletim_url
+    arquivo_pdf = base + ".pdf"
+    with relatorio.etapa("download"):
+        res, sha256_pdf = download_pdf(ultimo_boletim_url, arquivo_pdf, cabecalhos_condicionais(registro_anterior) if mesmo_link else None)
+    if sha256_pdf is None:
+        raise SemAlteracoes("PDF não mudou")
+
+    print(f"PDF salvo em {arquivo_pdf}")
+
+    registro_boletim = {"url": ultimo_boletim_url, **validadores(res), "sha256": sha256_pdf, "numero_boletim": registro_anterior.get("numero_boletim")}
+    if registro_boletim["sha256"] == registro_anterior.get("sha256"):
+        manifesto["boletim"] = registro_boletim
+        raise SemAlteracoes("mesmo PDF já processado")
+
+    #--- Metadados, tabelas e montagem do dataset ---
+    boletim = parse_bulletin(arquivo_pdf, motor, relatorio, numero_processado=registro_anterior.get("numero_boletim"), processos=processos)
+    numero_boletim = boletim["numero_boletim"]
+    relatorio.registrar(numero_boletim=numero_boletim)
+    if boletim["linhas"] is None:
+        manifesto["boletim"] = registro_boletim
+        raise SemAlteracoes(f"boletim Nº {numero_boletim} já processado")
+    registro_boletim["numero_boletim"] = numero_boletim
+    registros = build_dataset(boletim, relatorio, mostrar)
+
+    with relatorio.etapa("gravacao"):
+        write_dataset(registros, caminho_csv)
+
+    #acrescenta o boletim ao histórico (nada é sobrescrito)
+    with relatorio.etapa("historico"):
+        HistoricoBoletins(caminho_historico).registrar(registros, url=ultimo_boletim_url)
+
+    #registra o boletim processado para as próximas execuções
+    manifesto["boletim"] = registro_boletim
+
+    #teste
+    if mostrar:
+        print("Prévia do CSV exportado:")
+        print(pd.DataFrame(registros).head(10))
+
+def run(caminho_csv=CAMINHO_CSV, caminho_historico=None, motor=None, forcar=False, backfill=False, mostrar=True, caminho_relatorio=None, processos=None):
+    """
+    Executa uma coleta completa e devolve o relatório da execução (dicionário). O manifesto
+    (boletim_fortaleza.manifest.json), o relatório (boletim_fortaleza.relatorio.json) e o PDF
+    baixado ficam ao lado de `caminho_csv`. Usada pela linha de comando e pela API, que
+    atualiza o boletim no próprio processo (com `processos=1`: a extração com o Camelot só
+    usa processos em paralelo, via fork, quando o processo não tem outras threads).
+    """
+    base = os.path.splitext(caminho_csv)[0]
+    caminho_manifesto = base + ".manifest.json"
+    caminho_relatorio = caminho_relatorio or base + ".relatorio.json"
+    caminho_historico = caminho_historico or os.environ.get("HISTORICO_DB", os.path.join(os.path.dirname(caminho_csv), "boletins_historico.sqlite3"))
+    motor = motor or os.environ.get("SCRAPER_MOTOR", "camelot")
+    if motor not in MOTORES:
+        raise ValueError(f"Motor de extração desconhecido: {motor} (use {' ou '.join(MOTORES)})")
+
+    # --- Manifesto da última coleta ---
+    #sem CSV salvo, ou com forcar, o boletim é processado mesmo que não tenha mudado
+    manifesto = {} if forcar or not os.path.exists(caminho_csv) else carregar_manifesto(caminho_manifesto)
+    relatorio = RelatorioExecucao(motor=motor, modo="historico_completo" if backfill else "ultimo_boletim")
+    try:
+        _coletar(manifesto, motor, caminho_csv, caminho_historico, relatorio, backfill, mostrar, processos)
+        relatorio.registrar(resultado="processado")
+    except SemAlteracoes as motivo:
+        print(f"Boletim sem alterações ({motivo}). Nada a processar.")
+        relatorio.registrar(resultado="sem_alteracoes", motivo=str(motivo))
+    except Exception as erro:
+        relatorio.registrar(resultado="erro", erro=f"{type(erro).__name__}: {erro}")
+        raise
+    finally:
+        relatorio.salvar(caminho_relatorio)
+    #o modo histórico completo não mexe no manifesto do boletim mais recente
+    if not backfill:
+        salvar_manifesto(caminho_manifesto, manifesto)
+    return relatorio.como_dict()
+
+# --- Linha de comando ---
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    run(
+        #--forcar ignora o manifesto e reprocessa o boletim
+        forcar="--forcar" in argv,
+        #--historico-completo importa para o histórico todos os boletins listados na página da SEMACE
+        backfill="--historico-completo" in argv,
+        #--quiet não imprime os DataFrames intermediários (só as mensagens de andamento)
+        mostrar="--quiet" not in argv,
+        #--motor=pdfplumber (ou SCRAPER_MOTOR) troca o motor de extração
+        motor=next((a.split("=", 1)[1] for a in argv if a.startswith("--motor=")), None),
+        #--relatorio=caminho troca o arquivo do relatório da execução
+        caminho_relatorio=next((a.split("=", 1)[1] for a in argv if a.startswith("--relatorio=")), None),
+    )
+
+if __name__ == "__main__":
+    main()
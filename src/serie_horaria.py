@@ -0,0 +1,111 @@
+# src/serie_horaria.py
+
+import math
+from array import array
+from datetime import datetime, timezone
+
+#variáveis em graus (direção): a interpolação segue o menor arco (350° -> 10° passa por 0°)
+VARIAVEIS_ANGULARES = {"winddirection_10m", "wave_direction"}
+
+# --- Conversão entre "YYYY-MM-DDTHH:MM" (hora local da Open-Meteo) e minutos desde 1970 ---
+#as horas da Open-Meteo já vêm no fuso pedido (America/Fortaleza); elas são tratadas como UTC só
+#para virar um número contínuo, então nenhuma conversão de fuso é feita
+def minuto_epoch(instante):
+    return int(datetime.strptime(instante, "%Y-%m-%dT%H:%M").replace(tzinfo=timezone.utc).timestamp()) // 60
+
+def instante_do_minuto(minuto):
+    return datetime.fromtimestamp(minuto * 60, timezone.utc).strftime("%Y-%m-%dT%H:%M")
+
+# --- Série horária já convertida em vetores numéricos ---
+class SerieHoraria:
+    """
+    Série horária de uma chamada à Open-Meteo guardada como vetores `array('d')`, um por
+    variável, indexados pela hora desde 1970 (posição = hora - `inicio`). Valores ausentes
+    viram NaN. Qualquer instante dentro da série é respondido pelos vetores, com interpolação
+    linear entre as horas cheias (ex.: 14:30 = média de 14:00 e 15:00).
+    """
+
+    def __init__(self, inicio, valores):
+        self.inicio = inicio  # hora desde 1970 da primeira posição
+        self.valores = valores  # variável -> array('d')
+
+    @classmethod
+    def de_hourly(cls, hourly):
+        #{"time": [...], "temperature_2m": [...], ...} -> SerieHoraria (vazia se não houver horas)
+        if not hourly or not hourly.get("time"):
+            return cls(0, {})
+        horas = [minuto_epoch(t) // 60 for t in hourly["time"]]
+        inicio = min(horas)
+        tamanho = max(horas) - inicio + 1
+        valores = {}
+        for variavel, lista in hourly.items():
+            if variavel == "time" or not isinstance(lista, list):
+                continue
+            vetor = array("d", [math.nan]) * tamanho
+            for hora, valor in zip(horas, lista):
+                if valor is not None:
+                    vetor[hora - inicio] = valor
+            valores[variavel] = vetor
+        return cls(inicio, valores)
+
+    def __len__(self):
+        return len(next(iter(self.valores.values()))) if self.valores else 0
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __eq__(self, outra):
+        #NaN != NaN, então a comparação é feita pelas listas com None no lugar de NaN
+        return isinstance(outra, SerieHoraria) and self.inicio == outra.inicio and self.como_hourly() == outra.como_hourly()
+
+    @property
+    def primeiro_minuto(self):
+        return self.inicio * 60
+
+    @property
+    def ultimo_minuto(self):
+        return (self.inicio + len(self) - 1) * 60
+
+    def dias(self):
+        #datas (YYYY-MM-DD) que têm pelo menos uma hora na série
+        if not self:
+            return []
+        return sorted({instante_do_minuto(h * 60)[:10] for h in range(self.inicio, self.inicio + len(self))})
+
+    def do_dia(self, dia):
+        #só as horas de `dia` (YYYY-MM-DD); vazia se a série não cobre o dia
+        primeira = max(self.inicio, minuto_epoch(f"{dia}T00:00") // 60)
+        ultima = min(self.inicio + len(self), minuto_epoch(f"{dia}T00:00") // 60 + 24)
+        if primeira >= ultima:
+            return SerieHoraria(0, {})
+        if primeira == self.inicio and ultima == self.inicio + len(self):
+            return self
+        inicio, fim = primeira - self.inicio, ultima - self.inicio
+        return SerieHoraria(primeira, {variavel: vetor[inicio:fim] for variavel, vetor in self.valores.items()})
+
+    def valor(self, variavel, minuto):
+        """Valor de `variavel` no instante (minutos desde 1970), interpolado entre as horas cheias."""
+        vetor = self.valores.get(variavel)
+        if vetor is None or not self.primeiro_minuto <= minuto <= self.ultimo_minuto:
+            return None
+        posicao, resto = divmod(minuto - self.primeiro_minuto, 60)
+        antes = vetor[posicao]
+        if resto == 0:
+            return None if math.isnan(antes) else antes
+        depois = vetor[posicao + 1]
+        if math.isnan(antes) or math.isnan(depois):
+            return None
+        fracao = resto / 60
+        if variavel in VARIAVEIS_ANGULARES:
+            diferenca = (depois - antes + 180) % 360 - 180
+            return round((antes + diferenca * fracao) % 360, 2)
+        return round(antes + (depois - antes) * fracao, 2)
+
+    def como_hourly(self):
+        #volta ao formato da Open-Meteo (usado em testes e para serializar)
+        if not self:
+            return {}
+        hourly = {"time": [instante_do_minuto(h * 60) for h in range(self.inicio, self.inicio + len(self))]}
+        for variavel, vetor in self.valores.items():
+            hourly[variavel] = [None if math.isnan(v) else v for v in vetor]
+        return hourly
@@ -0,0 +1,97 @@
+# src/snapshot_boletim.py
+
+import csv
+import math
+import os
+import pickle
+import sys
+from datetime import datetime
+
+from repositorio import dias_do_periodo
+
+# --- Snapshot binário do boletim ---
+#arquivo pickle com os registros já prontos para a API, gerado pelo scraper ao lado do CSV.
+#VERSAO_SNAPSHOT muda sempre que o formato muda; a API ignora snapshots de outra versão e lê o CSV
+VERSAO_SNAPSHOT = 2
+#colunas com poucos valores distintos: cada valor é guardado uma única vez (string internada),
+#tanto na memória quanto no arquivo (o pickle reaproveita objetos repetidos)
+COLUNAS_CATEGORICAS = ("Status", "Zona", "Periodo", "Dias_Periodo", "Numero_Boletim", "Tipos_Amostragem", "Data_Extração")
+
+class SnapshotIncompativel(ValueError):
+    pass
+
+# --- Caminho do snapshot a partir do CSV (boletim_fortaleza.csv -> boletim_fortaleza.pkl) ---
+def caminho_snapshot(caminho_csv):
+    return os.path.splitext(caminho_csv)[0] + ".pkl"
+
+#tamanho e mtime (ns) do CSV; o os.replace preserva os dois, então a assinatura do temporário
+#gravada no snapshot continua valendo para o CSV final
+def assinatura_csv(caminho_csv):
+    estado = os.stat(caminho_csv)
+    return [estado.st_size, estado.st_mtime_ns]
+
+#valores ausentes do pandas (NaN) viram None
+def _valor(valor):
+    return None if isinstance(valor, float) and math.isnan(valor) else valor
+
+# --- Registros tipados a partir do DataFrame do scraper ---
+def registros_do_dataframe(df):
+    registros = []
+    for registro in df.to_dict(orient="records"):
+        registro = {coluna: _valor(valor) for coluna, valor in registro.items()}
+        for coluna in COLUNAS_CATEGORICAS:
+            if isinstance(registro.get(coluna), str):
+                registro[coluna] = sys.intern(registro[coluna])
+        registros.append(registro)
+    return registros
+
+# --- Gravação (atômica) e leitura ---
+def salvar_snapshot(caminho, registros, caminho_csv):
+    """
+    Grava os registros e, para cada id, as datas do período já separadas (o que o
+    repositório usaria para montar o índice por data), com a assinatura do CSV gerado
+    junto (`caminho_csv`): o snapshot só é usado enquanto o CSV for esse mesmo arquivo.
+    """
+    conteudo = {
+        "versao": VERSAO_SNAPSHOT,
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "csv": assinatura_csv(caminho_csv),
+        "registros": registros,
+        "dias_por_id": {r["id"]: dias_do_periodo(r.get("Dias_Periodo")) for r in registros},
+    }
+    caminho_tmp = caminho + ".tmp"
+    with open(caminho_tmp, "wb") as f:
+        pickle.dump(conteudo, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(caminho_tmp, caminho)
+
+def carregar_snapshot(caminho, caminho_csv):
+    #retorna (registros, dias_por_id); o snapshot precisa ter sido gravado com o CSV atual
+    with open(caminho, "rb") as f:
+        conteudo = pickle.load(f)
+    if not isinstance(conteudo, dict) or conteudo.get("versao") != VERSAO_SNAPSHOT:
+        raise SnapshotIncompativel(f"Snapshot {caminho} com versão {conteudo.get('versao') if isinstance(conteudo, dict) else '?'}, esperada {VERSAO_SNAPSHOT}")
+    if conteudo.get("csv") != assinatura_csv(caminho_csv):
+        raise SnapshotIncompativel(f"Snapshot {caminho} não corresponde ao CSV atual ({caminho_csv})")
+    return conteudo["registros"], conteudo["dias_por_id"]
+
+# --- Leitura do CSV sem pandas ---
+#mesma inferência de tipos que o pd.read_csv faz para este arquivo: colunas em que todos os
+#valores são inteiros viram int, campos vazios viram None e o resto fica como texto
+def _converter_coluna(valores):
+    try:
+        return [None if v == "" else int(v) for v in valores]
+    except ValueError:
+        return [None if v == "" else v for v in valores]
+
+def carregar_csv(caminho):
+    with open(caminho, encoding="utf-8", newline="") as f:
+        leitor = csv.reader(f)
+        colunas = next(leitor)
+        linhas = list(leitor)
+    valores = [_converter_coluna([linha[i] if i < len(linha) else "" for linha in linhas]) for i in range(len(colunas))]
+    registros = [dict(zip(colunas, linha)) for linha in zip(*valores)]
+    for registro in registros:
+        for coluna in COLUNAS_CATEGORICAS:
+            if isinstance(registro.get(coluna), str):
+                registro[coluna] = sys.intern(registro[coluna])
+    return registros
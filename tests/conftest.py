@@ -1,8 +1,18 @@
-import sys, os
+import sys, os, tempfile
 import pytest
 from datetime import datetime
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
-from src.app import app
+
+#os testes usam um boletim de exemplo fixo e não rodam o scraper, a atualização nem a pré-busca em segundo plano
+os.environ.setdefault("BOLETIM_CSV", os.path.join(os.path.dirname(__file__), "fixtures", "boletim_fortaleza.csv"))
+os.environ.setdefault("ATUALIZACAO_BOLETIM_S", "0")
+os.environ.setdefault("PREVISAO_PREFETCH_S", "0")
+#histórico em um diretório temporário, começando vazio a cada execução
+os.environ.setdefault("HISTORICO_DB", os.path.join(tempfile.mkdtemp(), "historico.sqlite3"))
+#cache de previsões em disco também temporário (o fixture limpar_cache_previsao esvazia memória e disco)
+os.environ.setdefault("PREVISAO_CACHE_DB", os.path.join(tempfile.mkdtemp(), "previsoes_cache.sqlite3"))
+
+from src.app import app, CACHE_PREVISAO
 
 # --- Fixture ---
 
@@ -15,7 +25,7 @@ def client():
 
 # --- Mock ---
 
-#"mocka" todas as chamadas requests.get usadas dentro do app.py
+#"mocka" todas as chamadas HTTP feitas pelo app.py (requests.get e as sessões do cliente_http)
 #evita chamadas externas reais para a api Open-Meteo e site da SEMA
 @pytest.fixture(autouse=True)
 def mock_requests_get(mocker):
@@ -57,4 +67,12 @@ def mock_requests_get(mocker):
         return mock_weather
 
     mocker.patch("requests.get", side_effect=fake_requests_get)
+    mocker.patch("requests.Session.get", side_effect=fake_requests_get)
     return mock_weather
+
+#cada teste começa com o cache de previsões vazio
+@pytest.fixture(autouse=True)
+def limpar_cache_previsao():
+    CACHE_PREVISAO.limpar()
+    yield
+    CACHE_PREVISAO.limpar()
@@ -0,0 +1,121 @@
+# tests/servidor_stub.py
+
+import json
+import os
+import random
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# --- Séries horárias falsas no formato da Open-Meteo ---
+CAMPOS_WEATHER = {"temperature_2m": 28.0, "apparent_temperature": 30.0, "windspeed_10m": 15.0, "winddirection_10m": 120.0, "precipitation": 0.0, "cloudcover": 20.0}
+CAMPOS_MARINE = {"wave_height": 1.2, "wave_direction": 180.0, "wave_period": 6.5}
+
+def _horas(inicio, fim):
+    dia = datetime.strptime(inicio, "%Y-%m-%d")
+    ultimo = datetime.strptime(fim, "%Y-%m-%d")
+    horas = []
+    while dia <= ultimo:
+        horas.extend((dia + timedelta(hours=h)).strftime("%Y-%m-%dT%H:%M") for h in range(24))
+        dia += timedelta(days=1)
+    return horas
+
+def resposta_open_meteo(caminho, params):
+    campos = CAMPOS_MARINE if caminho.endswith("/marine") else CAMPOS_WEATHER
+    horas = _horas(params["start_date"], params["end_date"])
+    hourly = {"time": horas}
+    hourly.update({campo: [valor] * len(horas) for campo, valor in campos.items()})
+    lats = params["latitude"].split(",")
+    lons = params["longitude"].split(",")
+    pontos = [{"latitude": float(lat), "longitude": float(lon), "hourly": hourly} for lat, lon in zip(lats, lons)]
+    #como a Open-Meteo: objeto para uma coordenada, lista para várias
+    return pontos[0] if len(pontos) == 1 else pontos
+
+# --- Página de boletins e PDFs falsos da SEMACE ---
+PDF_AMOSTRA = os.path.join(os.path.dirname(__file__), "fixtures", "boletim_amostra.pdf")
+CAMINHO_LISTAGEM = "/boletim-de-balneabilidade/"
+
+def pagina_listagem(quantidade):
+    #do mais recente ao mais antigo, como na página real
+    links = "".join(f'<li><a href="/boletins/boletim-{n}.pdf">Boletim das Praias de Fortaleza</a></li>' for n in range(quantidade, 0, -1))
+    return f"<html><body><ul>{links}</ul></body></html>"
+
+#fila de conexões maior que o padrão (5) para não atrasar rajadas de requisições paralelas
+class _ServidorHTTP(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def handle_error(self, request, client_address):
+        pass  #cliente desistiu (timeout) antes da resposta: esperado nos testes
+
+# --- Servidor HTTP local que imita a Open-Meteo e a SEMACE com latência e erros configuráveis ---
+class ServidorStub:
+    """
+    Servidor local para testes e benchmarks. `atraso(caminho, params)` devolve quantos segundos
+    esperar antes de responder (padrão: `latencia` fixa para todas as requisições). Uma fração
+    `taxa_erro` das requisições (sorteada com `semente`) responde `status_erro`.
+    Além da Open-Meteo (qualquer caminho), serve a página de boletins da SEMACE
+    (CAMINHO_LISTAGEM) com um link por PDF de `boletins`, e os PDFs em /boletins/boletim-N.pdf.
+    Uso: `with ServidorStub(latencia=0.2) as stub: stub.url + "/v1/forecast"`.
+    """
+
+    def __init__(self, latencia=0.0, atraso=None, taxa_erro=0.0, status_erro=503, semente=None, boletins=(PDF_AMOSTRA,)):
+        self.atraso = atraso or (lambda caminho, params: latencia)
+        self.taxa_erro = taxa_erro
+        self.status_erro = status_erro
+        self.boletins = list(boletins)
+        self.requisicoes = []
+        self._sorteio = random.Random(semente)
+        self._lock = threading.Lock()
+        self._encerrando = threading.Event()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                with stub._lock:
+                    stub.requisicoes.append((url.path, params))
+                    erro = stub._sorteio.random() < stub.taxa_erro
+                #espera interrompível: ao sair do `with`, requisições pendentes respondem na hora
+                stub._encerrando.wait(stub.atraso(url.path, params))
+                if erro:
+                    return self._responder(stub.status_erro, b'{"error": true, "reason": "stub"}')
+                if url.path == CAMINHO_LISTAGEM:
+                    return self._responder(200, pagina_listagem(len(stub.boletins)).encode("utf-8"), "text/html; charset=utf-8")
+                if url.path.startswith("/boletins/"):
+                    return self._responder_pdf(url.path)
+                self._responder(200, json.dumps(resposta_open_meteo(url.path, params)).encode("utf-8"))
+
+            def _responder_pdf(self, caminho):
+                #/boletins/boletim-N.pdf: N = 1 é o último da lista (o mais antigo)
+                try:
+                    n = int(caminho.rsplit("-", 1)[1].split(".")[0])
+                    arquivo = stub.boletins[len(stub.boletins) - n]
+                except (IndexError, ValueError):
+                    return self._responder(404, b"")
+                with open(arquivo, "rb") as f:
+                    self._responder(200, f.read(), "application/pdf")
+
+            def _responder(self, status, corpo, tipo="application/json"):
+                self.send_response(status)
+                self.send_header("Content-Type", tipo)
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, *args):
+                pass  #silencia o log do servidor durante os testes
+
+        self._servidor = _ServidorHTTP(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._servidor.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self._servidor.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._encerrando.set()
+        self._servidor.shutdown()
+        self._servidor.server_close()
@@ -55,4 +55,80 @@ def test_filtrar_por_status_propria(client):
 def test_filtrar_por_zona_leste(client):
     hoje = datetime.today().strftime("%Y-%m-%d")
     response = client.get(f"/praias/zona/Leste?data={hoje}")
-    assert response.status_code in (200, 404)    
\ No newline at end of file
+    assert response.status_code in (200, 404)    
+
+#Testa se consultas repetidas para o mesmo ponto/data usam o cache de previsões
+def test_previsao_usa_cache(client):
+    import requests
+    hoje = datetime.today().strftime("%Y-%m-%d")
+    meio_dia = client.get(f"/praias/1/data?data={hoje}&hora=12:00")
+    tarde = client.get(f"/praias/1/data?data={hoje}&hora=15:00")
+    assert requests.Session.get.call_count == 2  #uma chamada de tempo e uma marinha
+    assert meio_dia.status_code == 200 and tarde.status_code == 200
+    assert json.loads(meio_dia.data)["previsao"]["temperatura_c"] == 28
+    #o mock só tem 12:00: às 15:00 a mesma série em cache não tem valor
+    assert json.loads(tarde.data)["previsao"]["mensagem"] == f"Previsão não disponível para {hoje} às 15:00"
+
+#Testa o filtro combinado de status e zona
+def test_filtro_combinado(client):
+    response = client.get("/praias/filtro?status=propria&zona=Leste")
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    #boletim de exemplo: 10 pontos próprios na zona Leste
+    assert [item["praia"]["id"] for item in data] == [1, 2, 3, 5, 6, 7, 9, 10, 11, 13]
+    assert all(item["praia"]["Zona"] == "Leste" and item["praia"]["Status"] == "Própria para banho" for item in data)
+    assert all(item["info"] == "Para obter previsão, informe ?data=YYYY-MM-DD." for item in data)
+
+#Testa status inválido no filtro combinado
+def test_filtro_combinado_status_invalido(client):
+    response = client.get("/praias/filtro?status=talvez")
+    assert response.status_code == 400
+
+#Testa se rotas estáticas enviam ETag e respondem 304 quando o conteúdo não mudou
+def test_etag_if_none_match(client):
+    response = client.get("/praias")
+    etag = response.headers["ETag"]
+    assert etag
+    response = client.get("/praias", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+    #comparação fraca: a mesma ETag marcada como fraca (W/) por um proxy também gera 304
+    assert client.get("/praias", headers={"If-None-Match": "W/" + etag}).status_code == 304
+    assert client.get("/praias", headers={"If-None-Match": "*"}).status_code == 304
+    assert client.get("/praias", headers={"If-None-Match": 'W/"outra"'}).status_code == 200
+
+#Testa o modo compacto (sem indentação) com o mesmo conteúdo
+def test_modo_compacto(client):
+    normal = client.get("/praias/1")
+    compacto = client.get("/praias/1?compacto=1")
+    assert b"\n" in normal.data and b"\n" not in compacto.data
+    assert json.loads(normal.data) == json.loads(compacto.data)
+    assert normal.headers["ETag"] != compacto.headers["ETag"]
+
+#Testa se a resposta pré-renderizada é igual à montada na hora
+def test_status_sem_data_pre_renderizado(client):
+    from src.app import DADOS, lista_sem_previsao
+    response = client.get("/praias/status/propria")
+    assert response.status_code == 200
+    assert json.loads(response.data) == json.loads(json.dumps(lista_sem_previsao(DADOS.repositorio.consultar(status="Própria para banho"))))
+
+#Testa se uma zona sem praias no boletim responde 404 sem data e lista vazia com data
+def test_zona_desconhecida(client):
+    assert client.get("/praias/zona/Norte").status_code == 404
+    response = client.get("/praias/zona/Norte?data=2025-01-01")
+    assert response.status_code == 200 and json.loads(response.data) == []
+
+#Testa se a troca do boletim em memória é refletida nas rotas (e nas respostas pré-renderizadas)
+def test_recarregar_dados_troca_boletim(client, tmp_path):
+    import src.app as app_module
+    original = app_module.DADOS
+    novo_csv = tmp_path / "boletim.csv"
+    linhas = open(app_module.CSV_FILE, encoding="utf-8").read().splitlines()
+    novo_csv.write_text("\n".join(linhas[:3]) + "\n", encoding="utf-8")  #cabeçalho + 2 praias
+    try:
+        app_module.recarregar_dados(str(novo_csv))
+        assert len(json.loads(client.get("/praias").data)) == 2
+        assert client.get("/praias/3").status_code == 404
+    finally:
+        app_module.DADOS = original
+    assert len(json.loads(client.get("/praias").data)) == len(original.praias)
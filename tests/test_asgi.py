@@ -0,0 +1,95 @@
+import asyncio
+import json
+import time
+import httpx
+import pytest
+from tests.servidor_stub import ServidorStub
+import asgi
+
+#o asgi.py usa o módulo app (src/ no sys.path), então os ajustes são feitos em asgi.api
+@pytest.fixture
+def stub_asgi(monkeypatch):
+    asgi.api.CACHE_PREVISAO.limpar()
+    with ServidorStub(latencia=0.3) as stub:
+        monkeypatch.setattr(asgi.api, "OPEN_METEO_WEATHER_URL", stub.url + "/v1/forecast")
+        monkeypatch.setattr(asgi.api, "OPEN_METEO_MARINE_URL", stub.url + "/v1/marine")
+        yield stub
+    asgi.api.CACHE_PREVISAO.limpar()
+
+#faz as requisições direto na aplicação ASGI, sem servidor
+def _get(*caminhos):
+    async def _todas():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=asgi.app), base_url="http://teste") as cliente:
+            respostas = await asyncio.gather(*(cliente.get(caminho) for caminho in caminhos))
+        await asgi.OPEN_METEO_WEATHER.fechar()
+        await asgi.OPEN_METEO_MARINE.fechar()
+        return respostas
+    return asyncio.run(_todas())
+
+def _data_do_boletim():
+    return str(asgi.api.DADOS.praias[0]["Dias_Periodo"]).split(", ")[0]
+
+#Testa se a rota assíncrona devolve o mesmo corpo da rota do Flask
+def test_asgi_data_igual_ao_flask(stub_asgi):
+    caminho = f"/praias/1/data?data={_data_do_boletim()}&hora=14:30"
+    (resposta,) = _get(caminho)
+    assert resposta.status_code == 200
+    assert "temperatura_c" in resposta.json()["previsao"]
+    assert resposta.content == asgi.api.app.test_client().get(caminho).data  #agora vem do cache
+
+#Testa os erros de validação, que seguem os do app.py
+def test_asgi_data_erros(stub_asgi):
+    sem_data, inexistente = _get("/praias/1/data", f"/praias/99999/data?data={_data_do_boletim()}")
+    assert sem_data.status_code == 400
+    assert inexistente.status_code == 404
+    assert "99999" in inexistente.json()["message"]
+    assert stub_asgi.requisicoes == []
+
+#Testa se as demais rotas e o Swagger continuam sendo servidos pelo Flask
+def test_asgi_rotas_do_flask(stub_asgi):
+    praias, spec, etag = _get("/praias?compacto=1", "/apispec_1.json", "/praias")
+    assert praias.status_code == 200
+    assert praias.content == asgi.api.app.test_client().get("/praias?compacto=1").data
+    assert "/praias/{id}/data" in spec.json()["paths"]
+    assert etag.headers["etag"]
+
+#Testa se muitas requisições esperam a Open-Meteo ao mesmo tempo, sem uma thread por requisição
+def test_asgi_requisicoes_simultaneas(stub_asgi):
+    #datas diferentes: cada requisição precisa da sua própria chamada à Open-Meteo
+    caminhos = [f"/praias/1/data?data=2030-01-{dia:02d}" for dia in range(1, 29)] * 3
+    inicio = time.monotonic()
+    respostas = _get(*caminhos)
+    duracao = time.monotonic() - inicio
+    assert all(r.status_code == 200 and "temperatura_c" in r.json()["previsao"] for r in respostas)
+    #requisições para a mesma data dividem uma única busca
+    assert len(stub_asgi.requisicoes) == 2 * 28
+    #em série (ou limitado a ASGI_THREADS threads) levaria vários segundos
+    assert duracao < 0.3 * 4
+
+#Testa se o NDJSON de /praias/lote sai aos poucos pela ponte WSGI, antes do fim da busca
+def test_asgi_lote_em_streaming(monkeypatch):
+    asgi.api.CACHE_PREVISAO.limpar()
+
+    def buscar_devagar(pontos, inicio, fim):
+        time.sleep(0.5)
+        return [{} for _ in pontos]
+    monkeypatch.setattr(asgi.api, "buscar_series_lote", buscar_devagar)
+    corpo = json.dumps({"praias": [99999, 1], "inicio": _data_do_boletim()}).encode()
+    recebidas = []
+
+    async def receive():
+        return {"type": "http.request", "body": corpo, "more_body": False}
+
+    async def send(mensagem):
+        recebidas.append((time.monotonic(), mensagem))
+
+    scope = {"type": "http", "method": "POST", "path": "/praias/lote", "query_string": b"", "headers": [(b"content-type", b"application/json")]}
+    inicio = time.monotonic()
+    asyncio.run(asgi.app(scope, receive, send))
+    corpos = [(instante - inicio, m) for instante, m in recebidas if m["type"] == "http.response.body"]
+    #a primeira linha (praia não encontrada) chega antes de a busca terminar
+    assert corpos[0][0] < 0.4 and corpos[0][1]["more_body"]
+    assert json.loads(corpos[0][1]["body"].splitlines()[0])["praia"] == 99999
+    assert corpos[-1][0] >= 0.5 and not corpos[-1][1].get("more_body")
+    linhas = b"".join(m["body"] for _, m in corpos).splitlines()
+    assert json.loads(linhas[-1])["resumo"]["linhas"] == 1
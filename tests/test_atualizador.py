@@ -0,0 +1,95 @@
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from atualizador import AtualizadorBoletim
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "src")
+CSV_AMOSTRA = os.path.join(os.path.dirname(__file__), "fixtures", "boletim_fortaleza.csv")
+
+def _envelhecer(caminho, segundos):
+    passado = time.time() - segundos
+    os.utime(caminho, (passado, passado))
+
+#Testa se o boletim velho é atualizado e os dados recarregados
+def test_atualizador_roda_scraper_e_recarrega(tmp_path):
+    csv = tmp_path / "boletim.csv"
+    csv.write_text("id\n1\n")
+    _envelhecer(csv, 100)
+    recargas = []
+    def scraper():
+        csv.write_text("id\n1\n2\n")
+    atualizador = AtualizadorBoletim(str(csv), scraper, lambda: recargas.append(1), intervalo=50)
+    atualizador.ciclo()
+    assert recargas == [1]
+    assert not atualizador.desatualizado()
+    atualizador.ciclo()  #já atualizado: nada muda
+    assert recargas == [1]
+
+#Testa se, com vários processos/workers, só um roda o scraper por vez
+def test_atualizador_um_scraper_por_vez(tmp_path):
+    csv = tmp_path / "boletim.csv"
+    csv.write_text("id\n1\n")
+    _envelhecer(csv, 100)
+    chamadas = []
+    def scraper():
+        chamadas.append(1)
+        time.sleep(0.2)
+        csv.write_text("id\n1\n2\n")
+    workers = [AtualizadorBoletim(str(csv), scraper, lambda: None, intervalo=50) for _ in range(4)]
+    threads = [threading.Thread(target=w.ciclo) for w in workers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert chamadas == [1]
+
+#Testa se uma falha do scraper mantém os dados atuais e espera antes de tentar de novo
+def test_atualizador_falha_mantem_dados(tmp_path):
+    csv = tmp_path / "boletim.csv"
+    csv.write_text("id\n1\n")
+    _envelhecer(csv, 100)
+    chamadas = []
+    def scraper():
+        chamadas.append(1)
+        raise RuntimeError("SEMACE fora do ar")
+    recargas = []
+    atualizador = AtualizadorBoletim(str(csv), scraper, lambda: recargas.append(1), intervalo=50)
+    atualizador.ciclo()
+    atualizador.ciclo()
+    assert chamadas == [1] and recargas == []
+
+#script executado em um processo separado: importa a API (como o gunicorn --preload), faz o fork
+#e, no filho, chama iniciar_atualizador() (o hook post_fork) e troca o CSV no disco
+SCRIPT_FORK = """
+import os, sys, time
+import app
+app.executar_scraper = lambda: None
+herdado = app.iniciar_atualizador()
+pid = os.fork()
+if pid == 0:
+    atualizador = app.iniciar_atualizador()
+    ok = atualizador is not herdado and atualizador.ativo() and not herdado.ativo()
+    linhas = open(app.CSV_FILE, encoding="utf-8").read().splitlines()
+    with open(app.CSV_FILE, "w", encoding="utf-8") as f:
+        f.write("\\n".join(linhas[:5]) + "\\n")
+    limite = time.time() + 10
+    while len(app.DADOS.praias) != 4 and time.time() < limite:
+        time.sleep(0.1)
+    os._exit(0 if ok and len(app.DADOS.praias) == 4 else 1)
+_, status = os.waitpid(pid, 0)
+print(os.waitstatus_to_exitcode(status))
+"""
+
+#Testa se, depois do fork (gunicorn --preload), o worker inicia o próprio atualizador e recarrega o boletim
+def test_atualizador_reinicia_no_processo_filho(tmp_path):
+    csv = tmp_path / "boletim.csv"
+    shutil.copy(CSV_AMOSTRA, csv)
+    env = {
+        **os.environ, "BOLETIM_CSV": str(csv), "ATUALIZACAO_BOLETIM_S": "1", "PREVISAO_PREFETCH_S": "0",
+        "HISTORICO_DB": str(tmp_path / "historico.sqlite3"), "PREVISAO_CACHE_DB": "",
+    }
+    saida = subprocess.run([sys.executable, "-c", SCRIPT_FORK], cwd=SRC_DIR, env=env, capture_output=True, text=True, timeout=60)
+    assert saida.stdout.strip().splitlines()[-1] == "0", saida.stderr
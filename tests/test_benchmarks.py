@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+import httpx
+import scraper
+from benchmarks import suite
+from tests.servidor_stub import CAMINHO_LISTAGEM, PDF_AMOSTRA, ServidorStub
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "src")
+PARAMS = {"latitude": "-3.7", "longitude": "-38.5", "start_date": "2025-09-10", "end_date": "2025-09-10"}
+
+#Testa a taxa de erro configurável da Open-Meteo falsa (sorteio reproduzível com a semente)
+def test_stub_taxa_erro():
+    with ServidorStub(taxa_erro=1.0, status_erro=502) as stub:
+        assert httpx.get(stub.url + "/v1/forecast", params=PARAMS).status_code == 502
+    status = []
+    for _ in range(2):
+        with ServidorStub(taxa_erro=0.5, semente=7) as stub:
+            status.append([httpx.get(stub.url + "/v1/forecast", params=PARAMS).status_code for _ in range(20)])
+    assert status[0] == status[1]
+    assert {200, 503} == set(status[0])
+
+#Testa a página de boletins e o PDF servidos pela SEMACE falsa
+def test_stub_semace():
+    with ServidorStub() as stub:
+        html = httpx.get(stub.url + CAMINHO_LISTAGEM).text
+        links = scraper.parse_listing(html, stub.url + CAMINHO_LISTAGEM)
+        assert links == [stub.url + "/boletins/boletim-1.pdf"]
+        with open(PDF_AMOSTRA, "rb") as f:
+            assert httpx.get(links[0]).content == f.read()
+        assert httpx.get(stub.url + "/boletins/boletim-9.pdf").status_code == 404
+
+#Testa se a url da página de boletins pode ser trocada por variável de ambiente
+def test_url_listagem_configuravel():
+    saida = subprocess.run([sys.executable, "-c", "import scraper; print(scraper.URL_LISTAGEM)"], cwd=SRC_DIR, env={**os.environ, "SEMACE_LISTAGEM_URL": "http://127.0.0.1:1/boletins/"}, capture_output=True, text=True, check=True)
+    assert saida.stdout.strip() == "http://127.0.0.1:1/boletins/"
+
+#Testa a comparação com a linha de base: só pioras acima da tolerância contam como regressão
+def test_comparar_com_linha_de_base():
+    base = {
+        "micro": {"extrair_codigo": {"us": 10.0}, "carga_csv": {"us": 4000.0}},
+        "carga": {"GET /praias": {"rps": 300.0, "p95_ms": 50.0, "erros": 0}},
+    }
+    parecido = {
+        "micro": {"extrair_codigo": {"us": 12.0}, "carga_csv": {"us": 3000.0}, "nova": {"us": 1.0}},
+        "carga": {"GET /praias": {"rps": 250.0, "p95_ms": 60.0, "erros": 0}},
+    }
+    assert suite.comparar(base, parecido, 0.25) == []
+    pior = {
+        "micro": {"extrair_codigo": {"us": 20.0}},
+        "carga": {"GET /praias": {"rps": 100.0, "p95_ms": 90.0, "erros": 3}},
+    }
+    regressoes = suite.comparar(base, pior, 0.25)
+    assert len(regressoes) == 4
+    assert regressoes[0].startswith("micro extrair_codigo")
+
+#Testa os percentis de latência do gerador de carga
+def test_percentis():
+    assert suite.percentis([i / 1000 for i in range(1, 101)]) == {"p50_ms": 50.5, "p95_ms": 96.0, "p99_ms": 100.0}
@@ -0,0 +1,116 @@
+import multiprocessing
+import sqlite3
+import threading
+from cache_persistente import CachePersistente
+from cache_previsao import CachePrevisao, chave_previsao
+from serie_horaria import SerieHoraria
+
+CHAVE = chave_previsao(-3.7225, -38.4813, "2025-09-10")
+
+def _series():
+    weather = SerieHoraria.de_hourly({"time": ["2025-09-10T00:00", "2025-09-10T01:00"], "temperature_2m": [27.5, None]})
+    marine = SerieHoraria.de_hourly({"time": ["2025-09-10T00:00", "2025-09-10T01:00"], "wave_height": [1.1, 1.3]})
+    return {"weather": weather, "marine": marine}
+
+#relógio de parede controlável
+class RelogioFalso:
+    def __init__(self):
+        self.agora = 1_000_000.0
+    def __call__(self):
+        return self.agora
+
+#Testa se um processo "reiniciado" (cache novo sobre o mesmo arquivo) já encontra as séries sem buscar de novo
+def test_cache_em_disco_sobrevive_ao_reinicio(tmp_path):
+    caminho = str(tmp_path / "cache.sqlite3")
+    antes = CachePrevisao(ttl=60, persistente=CachePersistente(caminho, ttl=60))
+    antes.obter_ou_buscar(CHAVE, _series)
+
+    depois = CachePrevisao(ttl=60, persistente=CachePersistente(caminho, ttl=60))
+    buscas = []
+    series = depois.obter_ou_buscar(CHAVE, lambda: buscas.append(1))
+    assert buscas == [] and depois.acertos_disco == 1
+    assert series["weather"] == _series()["weather"] and series["marine"] == _series()["marine"]
+    #a partir daí a chave está na memória
+    assert depois.obter(CHAVE, disco=False) is not None
+
+#Testa o TTL pelo relógio de parede, a reserva de séries vencidas e o descarte depois da reserva
+def test_cache_em_disco_expira_e_guarda_reserva(tmp_path):
+    relogio = RelogioFalso()
+    disco = CachePersistente(str(tmp_path / "cache.sqlite3"), ttl=10, reserva=100, relogio=relogio)
+    disco.guardar(CHAVE, "valor")
+    relogio.agora += 9
+    assert disco.obter(CHAVE) == ("valor", 1)
+    relogio.agora += 1
+    assert disco.obter(CHAVE) is None
+    assert disco.obter(CHAVE, aceitar_expirado=True)[0] == "valor"
+    relogio.agora += 101
+    assert disco.descartar() == 1 and len(disco) == 0
+
+#Testa se, acima do limite de bytes, as entradas usadas há mais tempo são apagadas
+def test_cache_em_disco_descarta_por_tamanho(tmp_path):
+    relogio = RelogioFalso()
+    disco = CachePersistente(str(tmp_path / "cache.sqlite3"), ttl=3600, max_bytes=10_000, relogio=relogio)
+    for dia in range(1, 21):
+        relogio.agora += 100
+        disco.guardar((-3.7, -38.5, f"2025-09-{dia:02d}"), "x" * 1000)
+    disco.descartar()
+    assert disco.tamanho_bytes() <= 10_000
+    assert disco.obter((-3.7, -38.5, "2025-09-20")) is not None
+    assert disco.obter((-3.7, -38.5, "2025-09-01")) is None
+
+def _gravar(disco, processo):
+    for i in range(50):
+        disco.guardar((float(processo), float(i), "2025-09-10"), {"processo": processo, "i": i})
+        assert disco.obter((float(processo), float(max(0, i - 1)), "2025-09-10")) is not None
+    assert disco.erros == 0
+
+#Testa se limpar e len com o arquivo travado ou ilegível contam como erro do cache, sem exceção
+def test_cache_em_disco_travado_ou_corrompido(tmp_path):
+    caminho = str(tmp_path / "cache.sqlite3")
+    disco = CachePersistente(caminho, timeout=0.05)
+    disco.guardar(CHAVE, _series())
+    trava = sqlite3.connect(caminho, isolation_level=None)
+    trava.execute("BEGIN EXCLUSIVE")
+    disco.limpar()
+    trava.execute("ROLLBACK")
+    trava.close()
+    assert disco.erros == 1 and len(disco) == 1
+
+    #arquivo trocado por lixo, lido por uma conexão nova (como a de um worker recém-criado)
+    with open(caminho, "wb") as f:
+        f.write(b"nao e um banco sqlite" * 100)
+    disco._local = threading.local()
+    assert len(disco) == 0
+    disco.limpar()
+    assert disco.erros == 3
+
+#Testa leituras e escritas simultâneas de vários processos no mesmo arquivo, com o cache aberto
+#antes do fork (como nos workers do gunicorn --preload)
+def test_cache_em_disco_entre_processos(tmp_path):
+    caminho = str(tmp_path / "cache.sqlite3")
+    disco = CachePersistente(caminho)
+    disco.guardar(CHAVE, "do processo pai")
+    contexto = multiprocessing.get_context("fork")
+    processos = [contexto.Process(target=_gravar, args=(disco, p)) for p in range(4)]
+    for processo in processos:
+        processo.start()
+    for processo in processos:
+        processo.join(30)
+    assert [processo.exitcode for processo in processos] == [0, 0, 0, 0]
+    novo = CachePersistente(caminho)
+    assert len(novo) == 201 and novo.obter((3.0, 49.0, "2025-09-10"))[0] == {"processo": 3, "i": 49}
+    assert disco.obter(CHAVE)[0] == "do processo pai"
+
+#Testa se um worker com a memória vazia responde com a previsão gravada no disco, sem chamar a Open-Meteo
+def test_api_usa_previsao_do_disco(client):
+    import requests
+    from datetime import datetime
+    from src.app import CACHE_PREVISAO
+    hoje = datetime.today().strftime("%Y-%m-%d")
+    primeira = client.get(f"/praias/1/data?data={hoje}")
+    assert requests.Session.get.call_count == 2
+    #só a memória é esvaziada, como em um processo recém-iniciado
+    CACHE_PREVISAO._entradas.clear()
+    segunda = client.get(f"/praias/1/data?data={hoje}")
+    assert requests.Session.get.call_count == 2 and CACHE_PREVISAO.acertos_disco == 1
+    assert segunda.get_json() == primeira.get_json()
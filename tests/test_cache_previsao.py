@@ -0,0 +1,62 @@
+import threading
+import time
+import pytest
+from cache_previsao import CachePrevisao, chave_previsao
+
+#relógio controlável para testar expiração sem esperar
+class RelogioFalso:
+    def __init__(self):
+        self.agora = 0.0
+    def __call__(self):
+        return self.agora
+
+#Testa se a entrada expira depois do TTL
+def test_cache_expira_apos_ttl():
+    relogio = RelogioFalso()
+    cache = CachePrevisao(ttl=10, relogio=relogio)
+    cache.guardar("a", 1)
+    relogio.agora = 9
+    assert cache.obter("a") == 1
+    relogio.agora = 10
+    assert cache.obter("a") is None
+
+#Testa se a entrada usada há mais tempo é descartada ao passar do limite
+def test_cache_descarta_lru():
+    cache = CachePrevisao(ttl=60, max_entradas=2)
+    cache.guardar("a", 1)
+    cache.guardar("b", 2)
+    cache.obter("a")  #"a" passa a ser a mais recente
+    cache.guardar("c", 3)
+    assert cache.obter("b") is None
+    assert cache.obter("a") == 1
+    assert cache.obter("c") == 3
+
+#Testa se chamadas simultâneas para a mesma chave fazem uma única busca
+def test_cache_coalesce_buscas_simultaneas():
+    cache = CachePrevisao(ttl=60)
+    chamadas = []
+    def buscar():
+        chamadas.append(1)
+        time.sleep(0.05)
+        return {"ok": True}
+    resultados = []
+    threads = [threading.Thread(target=lambda: resultados.append(cache.obter_ou_buscar("k", buscar))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(chamadas) == 1
+    assert resultados == [{"ok": True}] * 8
+
+#Testa se erros são repassados e não ficam guardados no cache
+def test_cache_nao_guarda_erro():
+    cache = CachePrevisao(ttl=60)
+    def falhar():
+        raise RuntimeError("upstream fora do ar")
+    with pytest.raises(RuntimeError):
+        cache.obter_ou_buscar("k", falhar)
+    assert cache.obter_ou_buscar("k", lambda: 42) == 42
+
+#Testa se a chave arredonda as coordenadas
+def test_chave_previsao_arredonda():
+    assert chave_previsao(-3.76751777, -38.43717202, "2025-09-10") == chave_previsao(-3.76752, -38.43717, "2025-09-10")
@@ -0,0 +1,52 @@
+import time
+import pytest
+import requests
+import src.app as app_module
+from cliente_http import ClienteUpstream, Disjuntor, CircuitoAberto
+from tests.servidor_stub import ServidorStub
+
+SESSION_GET_REAL = requests.Session.get
+
+#relógio controlável para testar o disjuntor sem esperar
+class RelogioFalso:
+    def __init__(self):
+        self.agora = 0.0
+    def __call__(self):
+        return self.agora
+
+#Testa se o disjuntor abre após falhas seguidas e libera uma chamada de teste depois do tempo
+def test_disjuntor_abre_e_fecha():
+    relogio = RelogioFalso()
+    disjuntor = Disjuntor(limite_falhas=2, tempo_aberto=30, relogio=relogio)
+    disjuntor.registrar_falha()
+    assert disjuntor.permitir()
+    disjuntor.registrar_falha()
+    assert disjuntor.aberto and not disjuntor.permitir()
+    relogio.agora = 30
+    assert disjuntor.permitir()  #chamada de teste (meio-aberto)
+    assert not disjuntor.permitir()  #só uma por vez
+    disjuntor.registrar_sucesso()
+    assert not disjuntor.aberto and disjuntor.permitir()
+
+#Testa se o cliente respeita o timeout de leitura e recusa chamadas com o disjuntor aberto
+def test_cliente_timeout_e_disjuntor(monkeypatch):
+    monkeypatch.setattr(requests.Session, "get", SESSION_GET_REAL)
+    cliente = ClienteUpstream("stub", timeout=(1, 0.2), tentativas=0, disjuntor=Disjuntor(limite_falhas=1))
+    with ServidorStub(latencia=2) as stub:
+        inicio = time.monotonic()
+        with pytest.raises(requests.RequestException):
+            cliente.get(stub.url + "/v1/forecast?latitude=0&longitude=0&start_date=2025-09-10&end_date=2025-09-10")
+        assert time.monotonic() - inicio < 1.5
+        with pytest.raises(CircuitoAberto):
+            cliente.get(stub.url + "/v1/forecast")
+
+#Testa se, com a Open-Meteo fora do ar, a última previsão conhecida (mesmo vencida) é usada
+def test_previsao_usa_cache_vencido_quando_open_meteo_falha(mocker, monkeypatch):
+    hoje = time.strftime("%Y-%m-%d")
+    lat, lon = app_module.coordenadas_da_praia(app_module.DADOS.praias[0])
+    assert app_module.get_forecast(lat, lon, hoje)["temperatura_c"] == 28
+    #avança o relógio do cache para além do TTL
+    monkeypatch.setattr(app_module.CACHE_PREVISAO, "_relogio", lambda: time.monotonic() + 10_000)
+    mocker.patch("requests.Session.get", side_effect=requests.ConnectionError("fora do ar"))
+    previsao = app_module.get_forecast(lat, lon, hoje)
+    assert previsao["temperatura_c"] == 28
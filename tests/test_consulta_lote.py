@@ -0,0 +1,91 @@
+import json
+import time
+from datetime import date, timedelta
+import src.app as app_module
+from tests.servidor_stub import ServidorStub
+from tests.test_previsoes_paralelas import usar_stub  # noqa: F401 (fixture)
+
+def _linhas(response):
+    return [json.loads(linha) for linha in response.data.decode("utf-8").splitlines()]
+
+def _data_do_boletim():
+    return str(app_module.DADOS.praias[0]["Dias_Periodo"]).split(", ")[0]
+
+#Testa se ids e códigos repetidos viram uma consulta só e se o período inteiro sai de uma chamada em lote
+def test_lote_deduplica_e_busca_periodo_de_uma_vez(client, usar_stub):
+    praia = app_module.DADOS.praias[0]
+    codigo = app_module.extrair_codigo(praia)
+    inicio = _data_do_boletim()
+    fim = (date.fromisoformat(inicio) + timedelta(days=1)).isoformat()
+    corpo = {"praias": [praia["id"], praia["id"], codigo.lower(), 2, 3], "inicio": inicio, "fim": fim, "horas": ["09:00", "12:00", "09:00"]}
+    with ServidorStub() as stub:
+        usar_stub(stub)
+        response = client.post("/praias/lote", json=corpo)
+        linhas = _linhas(response)
+        chamadas = len(stub.requisicoes)
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    resumo = linhas[-1]["resumo"]
+    assert resumo == {"linhas": 6, "praias": 3, "dias": 2, "horas": 2, "pontos_de_previsao": resumo["pontos_de_previsao"], "nao_encontradas": 0, "parcial": False}
+    assert sorted((l["id"], l["data"]) for l in linhas[:-1]) == sorted((i, d) for i in (praia["id"], 2, 3) for d in (inicio, fim))
+    assert all([p["hora_consulta"] for p in l["previsoes"]] == ["09:00", "12:00"] and "temperatura_c" in l["previsoes"][0] for l in linhas[:-1])
+    #uma chamada de tempo e uma de marinha para todos os pontos e os dois dias
+    assert chamadas == 2
+    assert {p["start_date"] for _, p in stub.requisicoes} == {inicio}
+
+    #de novo: tudo sai do cache
+    with ServidorStub() as stub:
+        usar_stub(stub)
+        assert _linhas(client.post("/praias/lote", json=corpo))[-1]["resumo"]["linhas"] == 6
+        assert stub.requisicoes == []
+    #cada dia fica no cache só com as suas horas
+    ponto = app_module.GRADE_PREVISAO.ponto(*app_module.coordenadas_da_praia(praia))
+    for dia in (inicio, fim):
+        assert app_module.CACHE_PREVISAO.obter(app_module.chave_previsao(*ponto, dia))["weather"].dias() == [dia]
+
+#Testa se uma falha ou o prazo estourado em um grupo ainda fecham a resposta com o resumo
+def test_lote_falha_e_prazo_mantem_resumo(client, usar_stub, monkeypatch):
+    inicio = _data_do_boletim()
+    corpo = {"praias": [1, 2], "inicio": inicio}
+
+    def falhar(pontos, inicio, fim):
+        raise RuntimeError("upstream fora do ar")
+    monkeypatch.setattr(app_module, "buscar_series_lote", falhar)
+    linhas = _linhas(client.post("/praias/lote", json=corpo))
+    assert linhas[-1]["resumo"]["parcial"] is True
+    assert linhas[-1]["resumo"]["linhas"] == 2
+    monkeypatch.undo()
+
+    monkeypatch.setattr(app_module, "PREVISAO_PRAZO_S", 0.2)
+    with ServidorStub(latencia=1.0) as stub:
+        usar_stub(stub)
+        comeco = time.monotonic()
+        linhas = _linhas(client.post("/praias/lote", json=corpo))
+        assert time.monotonic() - comeco < 0.9
+    assert linhas[-1]["resumo"]["parcial"] is True
+    assert linhas[-1]["resumo"]["linhas"] == 2
+
+#Testa a validação do corpo e as praias não encontradas
+def test_lote_validacao(client):
+    inicio = _data_do_boletim()
+    assert client.post("/praias/lote", data="não é json").status_code == 400
+    assert client.post("/praias/lote", json={"praias": [1]}).status_code == 400
+    assert client.post("/praias/lote", json={"praias": [1], "inicio": inicio, "fim": "2000-01-01"}).status_code == 400
+    assert client.post("/praias/lote", json={"praias": [1], "inicio": inicio, "horas": ["25:99"]}).status_code == 400
+    response = client.post("/praias/lote", json={"praias": [99999, "XYZ"], "inicio": inicio})
+    linhas = _linhas(response)
+    assert [l["praia"] for l in linhas[:-1]] == [99999, "XYZ"]
+    assert linhas[-1]["resumo"]["nao_encontradas"] == 2 and linhas[-1]["resumo"]["linhas"] == 0
+
+#Testa se os dias fora do boletim atual vêm do histórico com uma única conexão ao SQLite
+def test_lote_historico_em_uma_consulta(client, mocker, monkeypatch, tmp_path):
+    from historico import HistoricoBoletins
+    from tests.test_historico import IMPROPRIA, _boletim
+    monkeypatch.setattr(app_module, "HISTORICO", HistoricoBoletins(str(tmp_path / "h.sqlite3")))
+    praias = app_module.DADOS.praias[:3]
+    app_module.HISTORICO.registrar(_boletim("11/2024", ["2024-05-06", "2024-05-07"], {p["Nome"][:3]: IMPROPRIA for p in praias}))
+    conectar = mocker.spy(app_module.HISTORICO, "_conectar")
+    linhas = _linhas(client.post("/praias/lote", json={"praias": [p["id"] for p in praias], "inicio": "2024-05-06", "fim": "2024-05-07"}))
+    assert conectar.call_count == 1
+    assert len(linhas) == 7
+    assert all(l["boletim"]["Status"] == IMPROPRIA and l["boletim"]["fonte"] == "historico" for l in linhas[:-1])
@@ -0,0 +1,24 @@
+import os
+import pandas as pd
+import pytest
+from extracao_pdfplumber import extrair_boletim, extrair_metadados
+from extracao_tabelas import extrair_tabelas
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+BOLETIM_36 = ("36/2025", "08/09/2025 a 14/09/2025", "Água do mar")
+
+#Testa se o motor pdfplumber produz o mesmo DataFrame e os mesmos metadados que o Camelot
+#boletim_amostra_3.pdf: outro número e período, cabeçalho em três linhas, zonas na ordem Oeste/Centro/Leste
+#e a tabela dividida em três páginas, com a coluna Status em outra posição
+@pytest.mark.parametrize("arquivo, metadados_esperados, primeiro_ponto", [
+    ("boletim_amostra.pdf", BOLETIM_36, "01L"),
+    ("boletim_amostra_2.pdf", BOLETIM_36, "01L"),
+    ("boletim_amostra_3.pdf", ("41/2025", "13/10/2025 a 19/10/2025", "Água do mar"), "22O"),
+])
+def test_motor_pdfplumber_igual_ao_camelot(arquivo, metadados_esperados, primeiro_ponto):
+    caminho = os.path.join(FIXTURES, arquivo)
+    df, metadados = extrair_boletim(caminho)
+    pd.testing.assert_frame_equal(df, extrair_tabelas(caminho, processos=1))
+    assert metadados == extrair_metadados(caminho) == metadados_esperados
+    assert len(df) == 33 and set(df["Status"]) == {"P", "I"}
+    assert df["Nome"].iloc[0].startswith(primeiro_ponto)
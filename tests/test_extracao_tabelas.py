@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+import threading
+import pandas as pd
+import extracao_tabelas
+from extracao_tabelas import extrair_tabelas, normalizar_tabelas, normalizar_tabelas_linha_a_linha
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "src")
+
+PDF_AMOSTRA = os.path.join(os.path.dirname(__file__), "fixtures", "boletim_amostra.pdf")
+
+#Testa se a normalização vetorizada dá o mesmo resultado da versão linha a linha
+def test_normalizacao_vetorizada_equivale_a_linha_a_linha():
+    df_raw = pd.DataFrame([
+        ["Ponto / Trecho", "Status"],                               # cabeçalho (ruído)
+        ["01L - Praia do Futuro", " p "],                           # status com espaços/minúscula
+        ["02L - Praia A\n03L - Praia B\n04L - Praia C", "I"],      # um status para várias praias
+        ["05L - Praia D\n06L - Praia E", "P\nX\nI"],                # token inválido no meio
+        ["07L - Praia F\n08L - Praia G\n09L - Praia H", "P\nI"],    # sobra nome: zip corta
+        ["", "P"],                                                  # sem nome
+        ["10L - Praia I", ""],                                      # sem status
+        ["Boletim SEMACE", "P"],                                    # rodapé (ruído)
+    ], columns=[0, 1])
+    tabelas = [df_raw, pd.DataFrame([["11L - Praia J"]]), df_raw.iloc[1:3]]  # a do meio tem só 1 coluna
+    esperado = normalizar_tabelas_linha_a_linha([t.copy() for t in tabelas])
+    resultado = normalizar_tabelas([t.copy() for t in tabelas])
+    pd.testing.assert_frame_equal(resultado, esperado)
+    assert list(resultado["Nome"].str[:3]) == ["01L", "02L", "03L", "04L", "05L", "06L", "07L", "08L", "01L", "02L", "03L", "04L"]
+
+#Testa se a extração paralela por página devolve as mesmas linhas, na mesma ordem, da extração serial
+def test_extracao_paralela_igual_a_serial():
+    serial = extrair_tabelas(PDF_AMOSTRA, processos=1, normalizar=normalizar_tabelas_linha_a_linha)
+    paralela = extrair_tabelas(PDF_AMOSTRA, processos=4)
+    assert len(serial) == 33
+    pd.testing.assert_frame_equal(paralela, serial)
+
+#Testa se o pool com fork só é usado em processos com uma única thread (como a linha de comando do scraper)
+def test_pool_sem_fork_com_outras_threads(mocker):
+    saida = subprocess.run([sys.executable, "-c", "import extracao_tabelas; print(extracao_tabelas._contexto_pool().get_start_method())"], cwd=SRC_DIR, capture_output=True, text=True, check=True)
+    assert saida.stdout.strip() == "fork"
+    parar = threading.Event()
+    thread = threading.Thread(target=parar.wait)
+    thread.start()
+    try:
+        assert extracao_tabelas._contexto_pool() is None
+        #com outra thread viva, a extração fica no próprio processo, sem criar o pool
+        pool = mocker.patch.object(extracao_tabelas, "ProcessPoolExecutor")
+        assert len(extracao_tabelas.extrair_tabelas_brutas(PDF_AMOSTRA, processos=4)) > 0
+        pool.assert_not_called()
+    finally:
+        parar.set()
+        thread.join()
@@ -0,0 +1,30 @@
+from coordenadas import COORDENADAS_NUMERICAS
+from grade_previsao import GradePrevisao
+import src.app as app_module
+
+#Testa o agrupamento dos pontos em células e a escolha de um ponto real como representante
+def test_grade_agrupa_pontos_proximos():
+    pontos = list(COORDENADAS_NUMERICAS.values())
+    grade = GradePrevisao(pontos, 0.02)
+    representantes = grade.representantes()
+    assert len(representantes) == 13  #33 pontos monitorados viram 13 consultas
+    assert set(representantes) <= set(pontos)
+    assert all(grade.ponto(*p) in representantes for p in pontos)
+    assert grade.ponto(-23.5, -46.6) == (-23.5, -46.6)  #fora das células monitoradas
+    assert len(GradePrevisao(pontos, 0).representantes()) == len(pontos)
+
+#Testa se as praias de uma zona usam uma coordenada por célula na chamada à Open-Meteo
+def test_zona_consulta_um_ponto_por_celula(client):
+    from tests.servidor_stub import ServidorStub
+    from tests.test_previsoes_paralelas import SESSION_GET_REAL
+    import requests
+    from unittest import mock
+    data_boletim = str(app_module.DADOS.praias[0]["Dias_Periodo"]).split(", ")[0]
+    with ServidorStub() as stub, mock.patch.object(requests.Session, "get", SESSION_GET_REAL), \
+            mock.patch.object(app_module, "OPEN_METEO_WEATHER_URL", stub.url + "/v1/forecast"), \
+            mock.patch.object(app_module, "OPEN_METEO_MARINE_URL", stub.url + "/v1/marine"):
+        praias = app_module.DADOS.repositorio.consultar(zona="Leste", data=data_boletim)
+        client.get(f"/praias/zona/Leste?data={data_boletim}")
+        consultadas = stub.requisicoes[0][1]["latitude"].split(",")
+    celulas = {app_module.GRADE_PREVISAO.ponto(*app_module.coordenadas_da_praia(p)) for p in praias}
+    assert len(consultadas) == len(celulas) < len(praias)
@@ -0,0 +1,58 @@
+import json
+import sqlite3
+import time
+from historico import HistoricoBoletins
+
+def _boletim(numero, dias, status_por_codigo):
+    zonas = {"L": "Leste", "C": "Centro", "O": "Oeste"}
+    return [
+        {"Nome": f"{codigo} - Praia {codigo}", "Status": status, "Zona": zonas[codigo[-1]], "Periodo": "", "Dias_Periodo": ", ".join(dias), "Numero_Boletim": numero, "Tipos_Amostragem": "Água do mar"}
+        for codigo, status in status_por_codigo.items()
+    ]
+
+PROPRIA, IMPROPRIA = "Própria para banho", "Imprópria para banho"
+
+#Testa o registro somente-inclusão e as consultas por ponto e por zona
+def test_historico_registra_e_consulta(tmp_path):
+    historico = HistoricoBoletins(str(tmp_path / "h.sqlite3"))
+    assert historico.registrar(_boletim("01/2025", ["2025-01-06", "2025-01-07"], {"01L": PROPRIA, "12C": IMPROPRIA})) == 4
+    assert historico.registrar(_boletim("02/2025", ["2025-01-13"], {"01L": IMPROPRIA, "12C": IMPROPRIA})) == 2
+    #reimportar o mesmo boletim não duplica nem sobrescreve
+    assert historico.registrar(_boletim("01/2025", ["2025-01-06"], {"01L": IMPROPRIA})) == 0
+    assert historico.tem_boletim("02/2025")
+    assert [h["status"] for h in historico.historico_ponto("01L", "2025-01-01", "2025-01-31")] == [PROPRIA, PROPRIA, IMPROPRIA]
+    taxas = {z["zona"]: z for z in historico.impropriedade_por_zona("2025-01-01", "2025-01-31")}
+    assert taxas["Leste"]["taxa_impropriedade"] == round(1 / 3, 4)
+    assert taxas["Centro"]["improprias"] == 3
+
+#Testa se uma consulta de intervalo sobre muitos anos de boletins continua rápida
+def test_historico_consulta_rapida(tmp_path):
+    historico = HistoricoBoletins(str(tmp_path / "h.sqlite3"))
+    codigos = {f"{i:02d}{'LCO'[i % 3]}": PROPRIA if i % 4 else IMPROPRIA for i in range(1, 34)}
+    for semana in range(5 * 52):
+        dia = time.strftime("%Y-%m-%d", time.gmtime(1420070400 + semana * 7 * 86400))
+        historico.registrar(_boletim(f"{semana}/hist", [dia], codigos))
+    inicio = time.perf_counter()
+    historico.historico_ponto("05O", "2015-01-01", "2019-12-31")
+    historico.impropriedade_por_zona("2015-01-01", "2019-12-31")
+    assert time.perf_counter() - inicio < 0.05
+    #as consultas por intervalo usam a chave (codigo, data) e o índice por data, sem varrer a tabela
+    with sqlite3.connect(historico.caminho) as conexao:
+        plano_ponto = " ".join(l[-1] for l in conexao.execute("EXPLAIN QUERY PLAN SELECT data, status FROM status_diario WHERE codigo = ? AND data BETWEEN ? AND ?", ("05O", "2015-01-01", "2019-12-31")))
+        plano_zona = " ".join(l[-1] for l in conexao.execute("EXPLAIN QUERY PLAN SELECT zona, COUNT(*) FROM status_diario WHERE data BETWEEN ? AND ? GROUP BY zona", ("2015-01-01", "2019-12-31")))
+    assert "USING PRIMARY KEY (codigo=? AND data>? AND data<?)" in plano_ponto
+    assert "USING COVERING INDEX idx_status_data_zona (data>? AND data<?)" in plano_zona
+
+#Testa as rotas de histórico e o uso do histórico para datas fora do boletim atual
+def test_rotas_historico(client):
+    import src.app as app_module
+    praia = app_module.DADOS.praias[0]
+    codigo = praia["Nome"][:3]
+    app_module.HISTORICO.registrar(_boletim("10/2024", ["2024-03-04"], {codigo: IMPROPRIA}))
+    data = json.loads(client.get(f"/praias/{praia['id']}/historico?inicio=2024-01-01&fim=2024-12-31").data)
+    assert data["historico"] == [{"data": "2024-03-04", "status": IMPROPRIA, "numero_boletim": "10/2024"}]
+    data = json.loads(client.get(f"/praias/{praia['id']}/data?data=2024-03-04").data)
+    assert data["boletim"]["Status"] == IMPROPRIA and data["boletim"]["fonte"] == "historico"
+    data = json.loads(client.get("/historico/zonas?inicio=2024-01-01&fim=2024-12-31").data)
+    assert data["zonas"][0]["taxa_impropriedade"] == 1.0
+    assert client.get("/historico/zonas?inicio=ontem").status_code == 400
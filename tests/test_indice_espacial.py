@@ -0,0 +1,35 @@
+import json
+import random
+import src.app as app_module
+from coordenadas import COORDENADAS_NUMERICAS
+from indice_espacial import IndiceEspacial, haversine_km
+
+#Testa se a busca na grade dá o mesmo resultado que medir a distância até todos os pontos
+def test_indice_igual_a_busca_exaustiva():
+    indice = IndiceEspacial(COORDENADAS_NUMERICAS)
+    sorteio = random.Random(42)
+    for _ in range(300):
+        lat, lon = sorteio.uniform(-3.8, -3.65), sorteio.uniform(-38.65, -38.35)
+        k, raio = sorteio.randint(1, 6), sorteio.choice([None, 0.5, 2, 8])
+        distancias = sorted((haversine_km(lat, lon, *p), c) for c, p in COORDENADAS_NUMERICAS.items())
+        esperado = [(c, d) for d, c in distancias if raio is None or d <= raio][:k]
+        assert indice.proximos(lat, lon, k=k, raio_km=raio) == esperado
+    #consulta longe dos pontos (fora da grade) ainda encontra os mais próximos
+    assert len(indice.proximos(-23.5, -46.6, k=2)) == 2
+    assert round(haversine_km(0, 0, 0, 1), 1) == 111.2
+
+#Testa a rota de praias próximas com filtro de status, raio e previsão
+def test_rota_praias_proximas(client):
+    praia = app_module.DADOS.praias[0]
+    lat, lon = app_module.coordenadas_da_praia(praia)
+    data = json.loads(client.get(f"/praias/proximas?lat={lat}&lon={lon}&k=3").data)
+    assert data[0]["praia"]["id"] == praia["id"] and data[0]["distancia_km"] == 0
+    assert [item["distancia_km"] for item in data] == sorted(item["distancia_km"] for item in data)
+
+    data_boletim = str(praia["Dias_Periodo"]).split(", ")[0]
+    data = json.loads(client.get(f"/praias/proximas?lat={lat}&lon={lon}&k=4&status=impropria&data={data_boletim}&raio_km=30").data)
+    assert data and all(item["praia"]["Status"] == "Imprópria para banho" for item in data)
+    assert all(item["distancia_km"] <= 30 and "previsao" in item for item in data)
+
+    assert client.get("/praias/proximas?lat=abc&lon=1").status_code == 400
+    assert client.get(f"/praias/proximas?lat={lat}&lon={lon}&status=limpa").status_code == 400
@@ -0,0 +1,17 @@
+from manifesto_boletim import carregar_manifesto, salvar_manifesto, cabecalhos_condicionais, validadores
+
+#Testa se o manifesto é salvo e lido de volta (e se um arquivo ausente vira manifesto vazio)
+def test_manifesto_salvar_e_carregar(tmp_path):
+    caminho = str(tmp_path / "manifesto.json")
+    assert carregar_manifesto(caminho) == {}
+    salvar_manifesto(caminho, {"boletim": {"sha256": "abc", "numero_boletim": "36/2025"}})
+    manifesto = carregar_manifesto(caminho)
+    assert manifesto["boletim"]["numero_boletim"] == "36/2025"
+    assert "verificado_em" in manifesto
+
+#Testa a montagem dos cabeçalhos condicionais a partir dos validadores da última resposta
+def test_cabecalhos_condicionais(mocker):
+    response = mocker.Mock(headers={"ETag": '"v1"', "Last-Modified": "Mon, 08 Sep 2025 10:00:00 GMT"})
+    registro = validadores(response)
+    assert cabecalhos_condicionais(registro) == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 08 Sep 2025 10:00:00 GMT"}
+    assert cabecalhos_condicionais({}) == {}
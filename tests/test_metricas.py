@@ -0,0 +1,84 @@
+import re
+from metricas import RegistroMetricas, medir, iniciar_perfil, encerrar_perfil
+import src.app as app_module
+
+def _data_do_boletim():
+    return str(app_module.DADOS.praias[0]["Dias_Periodo"]).split(", ")[0]
+
+def _valor(texto, linha):
+    #valor de uma amostra (nome + rótulos exatos) na exposição do Prometheus
+    encontrada = re.search(rf"^{re.escape(linha)} (\S+)$", texto, re.MULTILINE)
+    return float(encontrada.group(1)) if encontrada else 0.0
+
+#Testa o formato de exposição dos histogramas (baldes cumulativos), contadores e medidores
+def test_exposicao_prometheus():
+    registro = RegistroMetricas()
+    histograma = registro.histograma("teste_segundos", "Teste.", ("rota",), limites=(0.1, 1.0))
+    contador = registro.contador("teste_total", "Teste.", ("servico",))
+    registro.medidor("teste_idade", "Teste.", lambda: 42)
+    histograma.observar(0.05, rota="/a")
+    histograma.observar(0.5, rota="/a")
+    histograma.observar(7, rota="/a")
+    contador.inc(servico='com "aspas"')
+    texto = registro.exposicao()
+    assert "# TYPE teste_segundos histogram" in texto
+    assert 'teste_segundos_bucket{rota="/a",le="0.1"} 1' in texto
+    assert 'teste_segundos_bucket{rota="/a",le="1"} 2' in texto
+    assert 'teste_segundos_bucket{rota="/a",le="+Inf"} 3' in texto
+    assert 'teste_segundos_count{rota="/a"} 3' in texto
+    assert 'teste_total{servico="com \\"aspas\\""} 1' in texto
+    assert "teste_idade 42" in texto
+    #registrar o mesmo nome de novo devolve a mesma métrica
+    assert registro.histograma("teste_segundos", "Teste.", ("rota",)) is histograma
+
+#Testa se o perfil acumula as etapas medidas durante a requisição
+def test_perfil_acumula_etapas():
+    registro = RegistroMetricas()
+    histograma = registro.histograma("etapa_segundos", "Teste.")
+    perfil = iniciar_perfil()
+    with medir(histograma, "upstream_teste"):
+        pass
+    with medir(histograma, "upstream_teste"):
+        pass
+    encerrar_perfil()
+    with medir(histograma, "upstream_teste"):
+        pass  #fora da requisição: só o histograma
+    assert perfil.vezes("upstream_") == 2
+    assert histograma.contagem() == 3
+    assert re.match(r'upstream_teste;dur=[\d.]+;desc="2x", total;dur=[\d.]+$', perfil.server_timing())
+
+#Testa se /metrics registra a latência da rota, as chamadas externas e a idade do boletim
+def test_metrics_registra_rotas_e_upstream(client):
+    antes = client.get("/metrics").data.decode("utf-8")
+    client.get(f"/praias/1/data?data={_data_do_boletim()}")
+    response = client.get("/metrics")
+    texto = response.data.decode("utf-8")
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    rota = 'api_requisicao_duracao_segundos_count{rota="/praias/<int:id>/data",metodo="GET",status="200"}'
+    assert _valor(texto, rota) == _valor(antes, rota) + 1
+    for servico in ("Open-Meteo", "Open-Meteo Marine"):
+        linha = f'api_upstream_duracao_segundos_count{{servico="{servico}"}}'
+        assert _valor(texto, linha) == _valor(antes, linha) + 1
+    #a requisição fez duas chamadas externas (tempo e marinha)
+    assert _valor(texto, 'api_requisicao_chamadas_upstream_bucket{rota="/praias/<int:id>/data",le="2"}') > _valor(antes, 'api_requisicao_chamadas_upstream_bucket{rota="/praias/<int:id>/data",le="2"}')
+    assert _valor(texto, "api_cache_previsao_falhas_total") >= 1
+    assert _valor(texto, "api_boletim_idade_segundos") > 0
+
+#Testa se respostas diferentes de 200 da Open-Meteo são contadas por serviço e status
+def test_metrics_conta_respostas_nao_200(client, mock_requests_get):
+    linha = 'api_upstream_respostas_nao_200_total{servico="Open-Meteo",status="503"}'
+    antes = _valor(client.get("/metrics").data.decode("utf-8"), linha)
+    mock_requests_get.status_code = 503
+    client.get(f"/praias/1/data?data={_data_do_boletim()}")
+    assert _valor(client.get("/metrics").data.decode("utf-8"), linha) == antes + 1
+
+#Testa o perfil opt-in: só com X-Perfil a resposta traz o Server-Timing com as etapas
+def test_cabecalho_de_perfil(client):
+    caminho = f"/praias/1/data?data={_data_do_boletim()}"
+    assert "Server-Timing" not in client.get(caminho).headers
+    app_module.CACHE_PREVISAO.limpar()
+    tempos = client.get(caminho, headers={"X-Perfil": "1"}).headers["Server-Timing"]
+    #a chamada marinha roda em outra thread e também entra no perfil
+    for etapa in ("get_forecast", "upstream_open-meteo", "upstream_open-meteo_marine", "total"):
+        assert re.search(rf"(^|, ){etapa};dur=", tempos)
@@ -0,0 +1,105 @@
+import json
+import os
+from datetime import date, datetime, timedelta, timezone
+import src.app as app_module
+from atualizador import TravaArquivo
+from cache_persistente import CachePersistente
+from cache_previsao import CachePrevisao
+from prefetch_previsao import PrefetchPrevisoes, hoje_fortaleza
+from serie_horaria import SerieHoraria
+from tests.servidor_stub import ServidorStub
+from tests.test_previsoes_paralelas import usar_stub  # noqa: F401 (fixture)
+
+#Testa se uma pré-busca que falha mantém as séries da anterior
+def test_prefetch_falha_mantem_series():
+    hourly = {"time": ["2025-09-10T23:00", "2025-09-11T00:00"], "temperature_2m": [28, 27]}
+    serie = {"weather": SerieHoraria.de_hourly(hourly), "marine": SerieHoraria.de_hourly({})}
+    respostas = [lambda pontos, inicio, fim: [serie] * len(pontos)]
+    def buscar(pontos, inicio, fim):
+        return respostas[0](pontos, inicio, fim)
+    prefetch = PrefetchPrevisoes([(-3.7, -38.5), (-3.7, -38.5)], buscar, intervalo=60, dias=2, hoje=lambda: date(2025, 9, 10))
+    assert prefetch.ciclo() == 1  #pontos repetidos são buscados uma vez
+    #cada dia fica só com as suas horas
+    assert prefetch.obter((-3.7, -38.5, "2025-09-10"))["weather"].dias() == ["2025-09-10"]
+    assert prefetch.obter((-3.7, -38.5, "2025-09-11"))["weather"].como_hourly() == {"time": ["2025-09-11T00:00"], "temperature_2m": [27.0]}
+
+    def falhar(pontos, inicio, fim):
+        raise ConnectionError("fora do ar")
+    respostas[0] = falhar
+    assert prefetch.ciclo() == 0
+    assert prefetch.obter((-3.7, -38.5, "2025-09-10")) is not None
+    assert prefetch.janela == ("2025-09-10", "2025-09-11")
+
+#Testa se, com a pré-busca feita, as rotas respondem sem chamar a Open-Meteo dentro da janela
+def test_rotas_respondem_da_prefetch_sem_chamada_externa(client, usar_stub, monkeypatch):  # noqa: F811
+    #janela de 3 dias a partir do primeiro dia do boletim de exemplo
+    inicio = date.fromisoformat(str(app_module.DADOS.praias[0]["Dias_Periodo"]).split(", ")[0])
+    prefetch = PrefetchPrevisoes(app_module.PREFETCH_PREVISOES.pontos, app_module.buscar_series_lote, intervalo=60, dias=3, hoje=lambda: inicio)
+    monkeypatch.setattr(app_module, "PREFETCH_PREVISOES", prefetch)
+    praia = app_module.DADOS.praias[0]
+    with ServidorStub() as stub:
+        usar_stub(stub)
+        assert prefetch.ciclo() == len(prefetch.pontos)
+        assert len(stub.requisicoes) == 2  #todos os pontos e dias em uma chamada de tempo e uma de marinha
+
+        dentro = (inicio + timedelta(days=1)).isoformat()
+        data = json.loads(client.get(f"/praias/zona/Leste?data={dentro}&hora=15:00").data)
+        assert data and all(item["previsao"]["temperatura_c"] == 28.0 for item in data)
+        data = json.loads(client.get(f"/praias/{praia['id']}/data?data={inicio.isoformat()}").data)
+        assert data["previsao"]["altura_ondas_m"] == 1.2
+        assert len(stub.requisicoes) == 2
+
+        #fora da janela, a busca volta a ser feita na hora
+        fora = (inicio + timedelta(days=5)).isoformat()
+        data = json.loads(client.get(f"/praias/zona/Leste?data={fora}").data)
+        assert data and all(item["previsao"]["temperatura_c"] == 28.0 for item in data)
+        assert len(stub.requisicoes) == 4
+
+def _series_da_janela(pontos, inicio, fim):
+    dias = [(date.fromisoformat(inicio) + timedelta(days=i)).isoformat() for i in range((date.fromisoformat(fim) - date.fromisoformat(inicio)).days + 1)]
+    hourly = {"time": [f"{dia}T{h:02d}:00" for dia in dias for h in range(24)]}
+    hourly["temperature_2m"] = [28.0] * len(hourly["time"])
+    return [{"weather": SerieHoraria.de_hourly(hourly), "marine": SerieHoraria.de_hourly({})} for _ in pontos]
+
+#Testa se a pré-busca grava no cache compartilhado e se outro worker a reaproveita sem buscar de novo
+def test_prefetch_grava_no_cache_e_outro_worker_reaproveita(tmp_path):
+    chamadas = []
+    def buscar(pontos, inicio, fim):
+        chamadas.append((inicio, fim))
+        return _series_da_janela(pontos, inicio, fim)
+    pontos = [(-3.7, -38.5), (-3.72, -38.47)]
+    def worker():
+        cache = CachePrevisao(persistente=CachePersistente(str(tmp_path / "cache.sqlite3")))
+        trava = TravaArquivo(str(tmp_path / "cache.sqlite3.prefetch.lock"))
+        return cache, PrefetchPrevisoes(pontos, buscar, intervalo=3600, dias=3, hoje=lambda: date(2025, 9, 10), cache=cache, trava=trava)
+
+    cache, primeiro = worker()
+    assert primeiro.ciclo() == 2
+    assert chamadas == [("2025-09-10", "2025-09-12")]
+    #no cache, cada chave guarda só o dia dela e vale pelo intervalo da pré-busca
+    assert cache.obter((-3.7, -38.5, "2025-09-11"))["weather"].dias() == ["2025-09-11"]
+    assert cache.persistente.obter((-3.7, -38.5, "2025-09-11"))[1] > 3000
+
+    #outro processo (outro cache em memória, mesmo arquivo): nenhuma chamada nova
+    _, segundo = worker()
+    assert segundo.ciclo() == 2
+    assert len(chamadas) == 1
+    assert segundo.obter((-3.72, -38.47, "2025-09-12"))["weather"].dias() == ["2025-09-12"]
+
+#Testa se a janela da pré-busca começa no dia de hoje em Fortaleza (UTC-3), e não no fuso do servidor
+def test_prefetch_usa_data_de_fortaleza():
+    assert hoje_fortaleza() == datetime.now(timezone(timedelta(hours=-3))).date()
+    assert PrefetchPrevisoes([], None, intervalo=60)._hoje is hoje_fortaleza
+
+#Testa se, depois do fork (gunicorn --preload), a pré-busca é iniciada de novo no processo filho
+def test_prefetch_reinicia_no_processo_filho():
+    prefetch = PrefetchPrevisoes([(-3.7, -38.5)], _series_da_janela, intervalo=3600, dias=1).iniciar()
+    assert prefetch.ativo() and prefetch.iniciar()._thread is prefetch._thread
+    pid = os.fork()
+    if pid == 0:
+        herdada = prefetch._thread
+        ok = not prefetch.ativo() and prefetch.iniciar().ativo() and prefetch._thread is not herdada
+        os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+    prefetch.parar()
+    assert os.waitstatus_to_exitcode(status) == 0
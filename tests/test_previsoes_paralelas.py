@@ -0,0 +1,65 @@
+import json
+import time
+import pytest
+import requests
+import src.app as app_module
+from tests.servidor_stub import ServidorStub
+
+#guardado antes do mock do conftest ser aplicado
+SESSION_GET_REAL = requests.Session.get
+
+#aponta o app para o servidor local e usa as sessões HTTP reais (sem o mock do conftest)
+@pytest.fixture
+def usar_stub(monkeypatch):
+    def _usar(stub):
+        monkeypatch.setattr(requests.Session, "get", SESSION_GET_REAL)
+        monkeypatch.setattr(app_module, "OPEN_METEO_WEATHER_URL", stub.url + "/v1/forecast")
+        monkeypatch.setattr(app_module, "OPEN_METEO_MARINE_URL", stub.url + "/v1/marine")
+    return _usar
+
+def _data_do_boletim():
+    return str(app_module.DADOS.praias[0]["Dias_Periodo"]).split(", ")[0]
+
+#Testa se as previsões da zona são buscadas em paralelo e não uma após a outra
+def test_zona_busca_previsoes_em_paralelo(client, usar_stub):
+    with ServidorStub(latencia=0.3) as stub:
+        usar_stub(stub)
+        inicio = time.monotonic()
+        response = client.get(f"/praias/zona/Leste?data={_data_do_boletim()}")
+        duracao = time.monotonic() - inicio
+    data = json.loads(response.data)
+    assert response.status_code == 200
+    assert response.headers["X-Previsao-Parcial"] == "false"
+    assert all("temperatura_c" in item["previsao"] for item in data)
+    #em série seriam 2 chamadas de 0,3s por praia
+    assert duracao < 0.3 * 2 * len(data) / 2
+
+#Testa se, com a Open-Meteo lenta, o que já está no cache é devolvido dentro do prazo
+def test_zona_retorna_resultado_parcial_no_prazo(client, usar_stub, monkeypatch):
+    praia = app_module.DADOS.praias[0]
+    data_boletim = _data_do_boletim()
+    monkeypatch.setattr(app_module, "PREVISAO_PRAZO_S", 0.5)
+    with ServidorStub() as stub:
+        usar_stub(stub)
+        client.get(f"/praias/{praia['id']}/data?data={data_boletim}")  #aquece o cache para uma praia
+        stub.atraso = lambda caminho, params: 3.0
+        response = client.get(f"/praias/zona/{praia['Zona']}?data={data_boletim}")
+    data = json.loads(response.data)
+    assert response.headers["X-Previsao-Parcial"] == "true"
+    #praias na mesma célula da grade de previsão compartilham a entrada aquecida
+    celula = app_module.GRADE_PREVISAO.ponto(*app_module.coordenadas_da_praia(praia))
+    mesma_celula = [item["praia"]["id"] for item in data if app_module.GRADE_PREVISAO.ponto(*app_module.coordenadas_da_praia(item["praia"])) == celula]
+    prontas = [item["praia"]["id"] for item in data if "temperatura_c" in item["previsao"]]
+    assert praia["id"] in prontas and prontas == mesma_celula and len(prontas) < len(data)
+    assert all("tempo limite" in item["previsao"]["mensagem"] for item in data if item["praia"]["id"] not in prontas)
+
+#Testa se todas as praias da zona são resolvidas com uma chamada de tempo e uma marinha
+def test_zona_usa_uma_chamada_em_lote(client, usar_stub):
+    with ServidorStub() as stub:
+        usar_stub(stub)
+        response = client.get(f"/praias/zona/Leste?data={_data_do_boletim()}")
+        caminhos = sorted(caminho for caminho, _ in stub.requisicoes)
+    data = json.loads(response.data)
+    assert len(data) > 1
+    assert all("altura_ondas_m" in item["previsao"] for item in data)
+    assert caminhos == ["/v1/forecast", "/v1/marine"]
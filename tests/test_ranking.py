@@ -0,0 +1,40 @@
+import json
+import src.app as app_module
+from ranking import PESOS_PADRAO, ranquear
+
+def _previsao(ondas, vento, chuva, nuvens):
+    return {"altura_ondas_m": ondas, "velocidade_vento_kmh": vento, "chuva_mm": chuva, "cobertura_nuvens_pct": nuvens}
+
+#Testa a pontuação vetorizada: ordem, top-k, pesos e notas de cada fator
+def test_ranquear_pontua_e_detalha():
+    praias = [{"id": i, "Nome": f"0{i}L - Praia {i}", "Zona": "Leste", "Status": "Própria para banho"} for i in range(1, 5)]
+    previsoes = [
+        _previsao(2.5, 40, 5, 100),   # pior possível em tudo
+        _previsao(0.5, 10, 0, 20),
+        _previsao(0.0, 0, 0, 0),      # ideal
+        {"mensagem": "Previsão não disponível"},
+    ]
+    ranking = ranquear(praias, previsoes, PESOS_PADRAO, k=3)
+    assert [item["id"] for item in ranking] == [3, 2, 4]
+    assert ranking[0]["pontuacao"] == 100.0
+    assert ranking[1]["fatores"]["ondas"] == {"valor": 0.5, "nota": 0.8, "peso": 3.0}
+    assert ranking[2]["fatores"]["chuva"]["valor"] is None and ranking[2]["fatores"]["chuva"]["nota"] == 0.5
+    #só o status conta: a praia sem previsão empata com as outras e o boletim decide a ordem
+    so_status = dict.fromkeys(PESOS_PADRAO, 0.0) | {"status": 1.0}
+    assert [item["id"] for item in ranquear(praias, previsoes, so_status, k=4)] == [1, 2, 3, 4]
+
+#Testa a rota de ranking com as previsões de exemplo e a validação dos parâmetros
+def test_rota_ranking(client):
+    data_boletim = str(app_module.DADOS.praias[0]["Dias_Periodo"]).split(", ")[0]
+    response = client.get(f"/praias/ranking?data={data_boletim}&k=3&peso_nuvens=0")
+    data = json.loads(response.data)
+    assert response.status_code == 200
+    assert len(data["ranking"]) == 3 and data["pesos"]["nuvens"] == 0
+    assert all(item["fatores"]["status"]["valor"] == "Própria para banho" for item in data["ranking"])
+    assert data["avaliadas"] == len(app_module.DADOS.repositorio.consultar(status="Própria para banho", data=data_boletim))
+    assert client.get(f"/praias/ranking?data={data_boletim}&peso_vento=-1").status_code == 400
+    assert client.get("/praias/ranking").status_code == 400
+    assert client.get(f"/praias/ranking?data={data_boletim}&hora=99:99").status_code == 400
+    #incluir_improprias aceita os mesmos valores das outras opções (1, true, sim)
+    todas = json.loads(client.get(f"/praias/ranking?data={data_boletim}&incluir_improprias=sim").data)
+    assert todas["avaliadas"] == len(app_module.DADOS.repositorio.consultar(data=data_boletim))
@@ -0,0 +1,31 @@
+from repositorio import RepositorioPraias, dias_do_periodo
+
+REGISTROS = [
+    {"id": 1, "Nome": "01L - A", "Status": "Própria para banho", "Zona": "Leste", "Dias_Periodo": "2025-09-08, 2025-09-09"},
+    {"id": 2, "Nome": "12C - B", "Status": "Imprópria para banho", "Zona": "Centro", "Dias_Periodo": "2025-09-08, 2025-09-09"},
+    {"id": 3, "Nome": "02L - C", "Status": "Própria para banho", "Zona": "Leste", "Dias_Periodo": "2025-09-09, 2025-09-10"},
+    {"id": 4, "Nome": "22O - D", "Status": "Própria para banho", "Zona": "Oeste", "Dias_Periodo": float("nan")},
+]
+
+#Testa a busca por id
+def test_repositorio_busca_por_id():
+    repo = RepositorioPraias(REGISTROS)
+    assert repo.buscar(3)["Nome"] == "02L - C"
+    assert repo.buscar(99) is None
+
+#Testa os filtros isolados e combinados, mantendo a ordem do boletim
+def test_repositorio_consulta_combinada():
+    repo = RepositorioPraias(REGISTROS)
+    assert [p["id"] for p in repo.consultar(status="Própria para banho")] == [1, 3, 4]
+    assert [p["id"] for p in repo.consultar(zona="Leste", data="2025-09-08")] == [1]
+    assert [p["id"] for p in repo.consultar(status="Própria para banho", zona="Leste", data="2025-09-10")] == [3]
+    assert repo.consultar(zona="Desconhecida") == []
+    assert len(repo.consultar()) == 4
+
+#Testa o índice de datas, inclusive com Dias_Periodo vazio
+def test_repositorio_tem_boletim():
+    repo = RepositorioPraias(REGISTROS)
+    assert repo.tem_boletim(1, "2025-09-09")
+    assert not repo.tem_boletim(1, "2025-09-10")
+    assert not repo.tem_boletim(4, "2025-09-08")
+    assert dias_do_periodo(None) == ()
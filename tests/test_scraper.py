@@ -0,0 +1,104 @@
+import json
+import os
+import subprocess
+import sys
+import pandas as pd
+import pytest
+import scraper
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+PDF_AMOSTRA = os.path.join(FIXTURES, "boletim_amostra.pdf")
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "src")
+
+#página da SEMACE e PDF do boletim servidos sem rede
+def _semace_falsa(mocker):
+    with open(PDF_AMOSTRA, "rb") as f:
+        pdf = f.read()
+    listagem = mocker.Mock(status_code=200, headers={}, text='<a href="/boletim-36.pdf">Boletim das Praias de Fortaleza</a>')
+    boletim = mocker.Mock(status_code=200, headers={})
+    boletim.iter_content.return_value = [pdf]
+    return mocker.patch.object(scraper.SEMACE, "get", side_effect=lambda url, **kwargs: boletim if url.endswith(".pdf") else listagem)
+
+#Testa se importar o scraper não imprime nada, não acessa a rede nem grava arquivos
+def test_importar_scraper_nao_tem_efeitos(tmp_path):
+    saida = subprocess.run([sys.executable, "-c", "import scraper"], cwd=tmp_path, env={**os.environ, "PYTHONPATH": SRC_DIR}, capture_output=True, text=True, check=True)
+    assert saida.stdout == "" and list(tmp_path.iterdir()) == []
+
+#Testa a leitura das urls dos boletins de Fortaleza na página da SEMACE
+def test_parse_listing():
+    html = b'<a href="/b/37.pdf">Boletim das Praias de Fortaleza</a><a href="/b/x.pdf">Boletim de Caucaia</a><a href="https://outro/36.pdf">Boletim das Praias de Fortaleza</a>'
+    assert scraper.parse_listing(html, "https://www.semace.ce.gov.br/boletim/") == ["https://www.semace.ce.gov.br/b/37.pdf", "https://outro/36.pdf"]
+
+#Testa se os PDFs de amostra são lidos (de bytes ou do caminho) e viram registros do dataset, sem rede
+@pytest.mark.parametrize("motor", scraper.MOTORES)
+def test_parse_bulletin_e_build_dataset(motor):
+    with open(PDF_AMOSTRA, "rb") as f:
+        boletim = scraper.parse_bulletin(f.read(), motor)
+    assert (boletim["numero_boletim"], boletim["periodo"]) == ("36/2025", "08/09/2025 a 14/09/2025")
+    assert len(boletim["linhas"]) == 33 and {linha["Status"] for linha in boletim["linhas"]} == {"P", "I"}
+    assert scraper.parse_bulletin(PDF_AMOSTRA, motor)["linhas"] == boletim["linhas"]
+
+    registros = scraper.build_dataset(boletim, mostrar=False)
+    assert [r["id"] for r in registros] == list(range(1, 34))
+    assert registros[0]["Numero_Boletim"] == "36/2025" and registros[0]["Status"] in ("Própria para banho", "Imprópria para banho")
+    assert all(r["Coordenadas"] for r in registros)
+
+#Testa se o mesmo número de boletim já processado pula a extração das tabelas
+def test_parse_bulletin_pula_boletim_processado():
+    boletim = scraper.parse_bulletin(PDF_AMOSTRA, numero_processado="36/2025")
+    assert boletim["numero_boletim"] == "36/2025" and boletim["linhas"] is None
+
+#Testa se uma execução completa grava o CSV e o relatório com as etapas, as contagens e o número do boletim
+def test_execucao_gera_relatorio(mocker, tmp_path, monkeypatch, capsys):
+    _semace_falsa(mocker)
+    monkeypatch.setenv("SCRAPER_PROCESSOS", "1")
+    csv = tmp_path / "boletim.csv"
+
+    scraper.run(caminho_csv=str(csv), caminho_historico=str(tmp_path / "historico.sqlite3"), mostrar=False)
+
+    dados = json.loads((tmp_path / "boletim.relatorio.json").read_text(encoding="utf-8"))
+    assert dados["resultado"] == "processado" and dados["numero_boletim"] == "36/2025"
+    assert list(dados["etapas"]) == ["listagem", "download", "metadados", "extracao", "normalizacao", "montagem", "gravacao", "historico"]
+    assert all(etapa["segundos"] >= 0 for etapa in dados["etapas"].values())
+    linhas = dados["linhas"]
+    assert linhas["linhas_extraidas"] == 33 and linhas["linhas_tabelas"] >= 33 and linhas["linhas_ruido"] >= 0
+    assert linhas["linhas_dataset"] == linhas["linhas_extraidas"] - linhas["linhas_duplicadas"]
+    assert linhas["linhas_sem_coordenadas"] == 0
+    assert dados["pico_memoria_mb"] > 0
+    assert len(pd.read_csv(csv)) == linhas["linhas_dataset"]
+    assert (tmp_path / "boletim.pdf").exists()
+    #mostrar=False (--quiet): nenhum DataFrame impresso
+    assert "Prévia do CSV exportado" not in capsys.readouterr().out
+
+#Testa se uma segunda execução com o mesmo PDF para antes da extração e registra o motivo no relatório
+def test_execucao_sem_alteracoes(mocker, tmp_path):
+    _semace_falsa(mocker)
+    csv = str(tmp_path / "boletim.csv")
+    relatorio = tmp_path / "relatorio.json"
+
+    scraper.run(caminho_csv=csv, motor="pdfplumber", mostrar=False, caminho_relatorio=str(relatorio))
+    resultado = scraper.run(caminho_csv=csv, motor="pdfplumber", mostrar=False, caminho_relatorio=str(relatorio))
+
+    assert resultado["resultado"] == "sem_alteracoes" and resultado["motivo"] == "mesmo PDF já processado"
+    assert json.loads(relatorio.read_text(encoding="utf-8"))["etapas"].keys() == {"listagem", "download"}
+
+#Testa se a API atualiza o boletim no próprio processo, com os seus caminhos de CSV e histórico
+def test_api_executa_scraper_no_processo(mocker):
+    import app
+    run = mocker.patch.object(scraper, "run")
+    app.executar_scraper()
+    #a API tem outras threads: a extração roda sem fork (processos=1)
+    run.assert_called_once_with(caminho_csv=app.CSV_FILE, caminho_historico=app.HISTORICO_DB, mostrar=False, processos=1)
+
+#Testa se o histórico pula, antes da extração das tabelas, um boletim cujo número já foi importado
+def test_importar_historico_pula_boletim_conhecido(mocker, tmp_path):
+    _semace_falsa(mocker)
+    from historico import HistoricoBoletins
+    from relatorio_execucao import RelatorioExecucao
+    caminho = str(tmp_path / "historico.sqlite3")
+    HistoricoBoletins(caminho).registrar([{"Nome": "01L - Praia", "Status": "P", "Dias_Periodo": "2025-09-10", "Numero_Boletim": "36/2025"}])
+    parse = mocker.spy(scraper, "parse_bulletin")
+    relatorio = RelatorioExecucao()
+    scraper.importar_historico(["https://semace.exemplo/boletim-36.pdf"], "camelot", caminho, str(tmp_path / "b.pdf"), relatorio, mostrar=False)
+    assert parse.call_count == 0
+    assert relatorio.dados["boletins_importados"] == 0 and relatorio.dados["boletins_com_falha"] == 0
@@ -0,0 +1,55 @@
+import json
+import pickle
+from serie_horaria import SerieHoraria, minuto_epoch
+from tests.test_previsoes_paralelas import usar_stub  # noqa: F401 (fixture)
+
+HOURLY = {
+    "time": ["2025-09-10T13:00", "2025-09-10T14:00", "2025-09-10T15:00", "2025-09-11T00:00"],
+    "temperature_2m": [27.0, 28.0, 30.0, 25.0],
+    "winddirection_10m": [340.0, 350.0, 10.0, None],
+}
+
+#Testa a leitura por hora cheia, a interpolação de horas quebradas e os limites da série
+def test_serie_horaria_interpolacao():
+    serie = SerieHoraria.de_hourly(HOURLY)
+    assert len(serie) == 12  #horas faltantes no meio viram NaN
+    assert serie.valor("temperature_2m", minuto_epoch("2025-09-10T14:00")) == 28.0
+    assert serie.valor("temperature_2m", minuto_epoch("2025-09-10T14:30")) == 29.0
+    assert serie.valor("temperature_2m", minuto_epoch("2025-09-10T14:45")) == 29.5
+    #direção passa por 0° em vez de voltar 340°
+    assert serie.valor("winddirection_10m", minuto_epoch("2025-09-10T14:30")) == 0.0
+    assert serie.valor("temperature_2m", minuto_epoch("2025-09-10T15:30")) is None  #vizinho ausente
+    assert serie.valor("winddirection_10m", minuto_epoch("2025-09-11T00:00")) is None
+    assert serie.valor("temperature_2m", minuto_epoch("2025-09-10T12:59")) is None  #fora da série
+    assert serie.dias() == ["2025-09-10", "2025-09-11"]
+    assert pickle.loads(pickle.dumps(serie)) == serie
+
+#Testa o recorte de uma série de vários dias em um único dia
+def test_serie_horaria_do_dia():
+    serie = SerieHoraria.de_hourly(HOURLY)
+    dia = serie.do_dia("2025-09-10")
+    assert dia.dias() == ["2025-09-10"] and len(dia) == 11
+    assert dia.valor("temperature_2m", minuto_epoch("2025-09-10T14:30")) == 29.0
+    assert serie.do_dia("2025-09-11").como_hourly() == {"time": ["2025-09-11T00:00"], "temperature_2m": [25.0], "winddirection_10m": [None]}
+    assert not serie.do_dia("2025-09-12")
+    assert dia.do_dia("2025-09-10") is dia  #já é de um único dia
+    assert not SerieHoraria.de_hourly({})
+
+#Testa a rota de previsão hora a hora: dia inteiro, intervalo com passo de 30 min e uma única busca
+def test_rota_previsao_dia_e_intervalo(client, usar_stub):
+    import src.app as app_module
+    from tests.servidor_stub import ServidorStub
+    praia = app_module.DADOS.praias[0]
+    with ServidorStub() as stub:
+        usar_stub(stub)
+        data = json.loads(client.get(f"/praias/{praia['id']}/previsao?data=2025-09-10").data)
+        assert [p["hora"] for p in data["previsoes"]] == [f"{h:02d}:00" for h in range(24)]
+        data = json.loads(client.get(f"/praias/{praia['id']}/previsao?data=2025-09-10&inicio=14:00&fim=16:00&passo=30").data)
+        assert [p["hora"] for p in data["previsoes"]] == ["14:00", "14:30", "15:00", "15:30", "16:00"]
+        assert data["previsoes"][1]["altura_ondas_m"] == 1.2
+        #outra hora (quebrada) da mesma data na rota /data também sai da série já buscada
+        data = json.loads(client.get(f"/praias/{praia['id']}/data?data=2025-09-10&hora=14:30").data)
+        assert data["previsao"]["temperatura_c"] == 28.0
+        assert len(stub.requisicoes) == 2
+    assert client.get(f"/praias/{praia['id']}/previsao?data=ontem").status_code == 400
+    assert client.get(f"/praias/{praia['id']}/previsao?data=2025-09-10&passo=5").status_code == 400
@@ -0,0 +1,58 @@
+import os
+import pickle
+import subprocess
+import sys
+import pandas as pd
+import scraper
+from snapshot_boletim import caminho_snapshot, carregar_csv, carregar_snapshot, registros_do_dataframe, salvar_snapshot
+
+#CSV e snapshot gravados como o scraper grava (write_dataset)
+def _csv_com_snapshot(tmp_path):
+    import src.app as app_module
+    csv = str(tmp_path / "boletim.csv")
+    scraper.write_dataset(registros_do_dataframe(pd.read_csv(app_module.CSV_FILE)), csv)
+    return app_module, csv
+
+#Testa se o snapshot gera os mesmos registros, índices e respostas que o CSV
+def test_snapshot_equivale_ao_csv(tmp_path):
+    app_module, csv = _csv_com_snapshot(tmp_path)
+    registros, dias_por_id = carregar_snapshot(caminho_snapshot(csv), csv)
+    #valores categóricos repetidos são o mesmo objeto
+    assert registros[0]["Zona"] is registros[1]["Zona"]
+    assert dias_por_id[1][0] == "2025-09-08"
+    dados = app_module.carregar_dados(csv)
+    assert dados.praias == app_module.DADOS.praias
+    assert dados.repositorio.ids_por_data == app_module.DADOS.repositorio.ids_por_data
+    assert dados.respostas.obter("praias").corpo == app_module.DADOS.respostas.obter("praias").corpo
+
+#Testa se a API carrega o snapshot logo depois de uma gravação do scraper, sem ler o CSV
+def test_api_usa_snapshot_do_scraper(tmp_path, mocker):
+    app_module, csv = _csv_com_snapshot(tmp_path)
+    ler_csv = mocker.patch.object(app_module, "carregar_csv", side_effect=AssertionError("leu o CSV"))
+    assert len(app_module.carregar_dados(csv).praias) == len(app_module.DADOS.praias)
+    ler_csv.assert_not_called()
+
+#Testa se snapshots de outra versão ou de outro CSV são ignorados
+def test_snapshot_incompativel_ou_antigo_usa_csv(tmp_path):
+    app_module, csv = _csv_com_snapshot(tmp_path)
+    with open(caminho_snapshot(csv), "wb") as f:
+        pickle.dump({"versao": 0, "registros": []}, f)
+    assert len(app_module.carregar_dados(csv).praias) == len(app_module.DADOS.praias)
+
+    salvar_snapshot(caminho_snapshot(csv), [], csv)
+    #CSV regravado depois do snapshot (ex.: editado à mão): a assinatura não bate mais
+    os.utime(csv, ns=(0, os.stat(csv).st_mtime_ns + 1))
+    assert len(app_module.carregar_dados(csv).praias) == len(app_module.DADOS.praias)
+
+#Testa se a leitura do CSV sem pandas produz os mesmos registros que o pd.read_csv
+def test_carregar_csv_igual_ao_pandas():
+    import src.app as app_module
+    assert carregar_csv(app_module.CSV_FILE) == pd.read_csv(app_module.CSV_FILE).to_dict(orient="records")
+
+#Testa se a API sobe sem importar o pandas
+def test_app_nao_importa_pandas(tmp_path):
+    import src.app as app_module
+    env = dict(os.environ, HISTORICO_DB=str(tmp_path / "h.sqlite3"))
+    codigo = "import sys, app; print('pandas' in sys.modules)"
+    saida = subprocess.run([sys.executable, "-c", codigo], cwd=app_module.SRC_DIR, env=env, capture_output=True, text=True, check=True).stdout
+    assert saida.strip().splitlines()[-1] == "False"